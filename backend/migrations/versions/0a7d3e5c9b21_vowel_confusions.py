@@ -0,0 +1,54 @@
+"""vowel confusion counts and quiz option vowels
+
+Revision ID: 0a7d3e5c9b21
+Revises: f2c6a4b8e017
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0a7d3e5c9b21'
+down_revision = 'f2c6a4b8e017'
+branch_labels = None
+depends_on = None
+
+
+def _has_vowel_id():
+    return 'vowel_id' in {column['name'] for column in sa.inspect(op.get_bind()).get_columns('quiz_options')}
+
+
+def upgrade():
+    op.create_table(
+        'vowel_confusions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('correct_vowel', sa.String(), nullable=False),
+        sa.Column('selected_vowel', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id', 'correct_vowel', 'selected_vowel', name='uq_vowel_confusions_cell'),
+        if_not_exists=True,
+    )
+    # create_all may have added the column already
+    if not _has_vowel_id():
+        op.add_column('quiz_options', sa.Column('vowel_id', sa.String(), nullable=True))
+    # Existing options: a correct one has its quiz's vowel, a wrong one that of the word example
+    # recorded with the same audio
+    op.execute(
+        "UPDATE quiz_options SET vowel_id = (SELECT vowel_id FROM quiz_items WHERE quiz_items.id = quiz_item_id) "
+        "WHERE vowel_id IS NULL AND is_correct"
+    )
+    op.execute(
+        "UPDATE quiz_options SET vowel_id = (SELECT MIN(vowel_id) FROM word_examples "
+        "WHERE word_examples.audio_url = quiz_options.audio_url) "
+        "WHERE vowel_id IS NULL AND NOT is_correct"
+    )
+
+
+def downgrade():
+    if _has_vowel_id():
+        with op.batch_alter_table('quiz_options') as batch_op:
+            batch_op.drop_column('vowel_id')
+    op.drop_table('vowel_confusions', if_exists=True)
@@ -0,0 +1,34 @@
+"""quiz item calibrations
+
+Revision ID: 1c8e5f2a7d94
+Revises: 0a7d3e5c9b21
+Create Date: 2026-10-19 19:10:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '1c8e5f2a7d94'
+down_revision = '0a7d3e5c9b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'quiz_calibrations',
+        sa.Column('quiz_item_id', sa.Integer(), nullable=False),
+        sa.Column('model', sa.String(), nullable=False),
+        sa.Column('difficulty', sa.Float(), nullable=False),
+        sa.Column('discrimination', sa.Float(), nullable=False),
+        sa.Column('answers', sa.Integer(), nullable=False),
+        sa.Column('calibrated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['quiz_item_id'], ['quiz_items.id']),
+        sa.PrimaryKeyConstraint('quiz_item_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('quiz_calibrations', if_exists=True)
@@ -0,0 +1,64 @@
+"""quiz attempt indexes and latest quiz scores
+
+Revision ID: 2b9f6e3d1a57
+Revises: 1c8e5f2a7d94
+Create Date: 2026-10-19 19:40:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '2b9f6e3d1a57'
+down_revision = '1c8e5f2a7d94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_quiz_attempts_session_quiz_time', 'quiz_attempts', ['session_id', 'quiz_id', 'attempted_at'], unique=False, if_not_exists=True)
+    op.create_index('ix_quiz_attempts_session_time', 'quiz_attempts', ['session_id', 'attempted_at'], unique=False, if_not_exists=True)
+    op.create_table(
+        'latest_quiz_scores',
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('quiz_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('attempted_at', sa.DateTime(), nullable=False),
+        sa.Column('best_score', sa.Integer(), nullable=False),
+        sa.Column('best_total', sa.Integer(), nullable=False),
+        sa.Column('best_at', sa.DateTime(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('session_id', 'quiz_id'),
+        if_not_exists=True,
+    )
+    # Backfill from the attempt history; each correlated subquery seeks the new index
+    op.execute("""
+        INSERT OR IGNORE INTO latest_quiz_scores
+            (session_id, quiz_id, score, total, attempted_at, best_score, best_total, best_at, attempts)
+        SELECT a.session_id, a.quiz_id, latest.score, latest.total, latest.attempted_at,
+               best.score, best.total, best.attempted_at, a.attempts
+        FROM (
+            SELECT session_id, quiz_id, COUNT(*) AS attempts
+            FROM quiz_attempts
+            WHERE session_id IS NOT NULL
+            GROUP BY session_id, quiz_id
+        ) AS a
+        JOIN quiz_attempts AS latest ON latest.id = (
+            SELECT id FROM quiz_attempts
+            WHERE session_id = a.session_id AND quiz_id = a.quiz_id
+            ORDER BY attempted_at DESC, id DESC LIMIT 1
+        )
+        JOIN quiz_attempts AS best ON best.id = (
+            SELECT id FROM quiz_attempts
+            WHERE session_id = a.session_id AND quiz_id = a.quiz_id
+            ORDER BY score * 1.0 / total DESC, attempted_at DESC LIMIT 1
+        )
+    """)
+
+
+def downgrade():
+    op.drop_table('latest_quiz_scores', if_exists=True)
+    op.drop_index('ix_quiz_attempts_session_time', table_name='quiz_attempts', if_exists=True)
+    op.drop_index('ix_quiz_attempts_session_quiz_time', table_name='quiz_attempts', if_exists=True)
@@ -0,0 +1,55 @@
+"""cohorts and cohort reports
+
+Revision ID: 3d4a7c9e2f68
+Revises: 2b9f6e3d1a57
+Create Date: 2026-10-19 20:10:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3d4a7c9e2f68'
+down_revision = '2b9f6e3d1a57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cohorts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'cohort_members',
+        sa.Column('cohort_id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('joined_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['cohort_id'], ['cohorts.id']),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('cohort_id', 'session_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_cohort_members_session_id', 'cohort_members', ['session_id'], unique=False, if_not_exists=True)
+    op.create_table(
+        'cohort_reports',
+        sa.Column('cohort_id', sa.Integer(), nullable=False),
+        sa.Column('report', sa.Text(), nullable=False),
+        sa.Column('generated_at', sa.DateTime(), nullable=False),
+        sa.Column('duration', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['cohort_id'], ['cohorts.id']),
+        sa.PrimaryKeyConstraint('cohort_id'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('cohort_reports', if_exists=True)
+    op.drop_index('ix_cohort_members_session_id', table_name='cohort_members', if_exists=True)
+    op.drop_table('cohort_members', if_exists=True)
+    op.drop_table('cohorts', if_exists=True)
@@ -0,0 +1,22 @@
+"""index word_examples.word
+
+Revision ID: 3f1c2a9b7d10
+Revises: 7a3d5e9c1b42
+Create Date: 2026-10-19 13:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = '7a3d5e9c1b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_word_examples_word', 'word_examples', ['word'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_word_examples_word', table_name='word_examples', if_exists=True)
@@ -0,0 +1,45 @@
+"""daily rollups and completed lesson session index
+
+Revision ID: 4e1b8d6a3c75
+Revises: 3d4a7c9e2f68
+Create Date: 2026-10-19 20:40:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '4e1b8d6a3c75'
+down_revision = '3d4a7c9e2f68'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'daily_quiz_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('quiz_id', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'quiz_id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'daily_vowel_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('vowel_id', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'vowel_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_completed_lessons_session_id', 'completed_lessons', ['session_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_completed_lessons_session_id', table_name='completed_lessons', if_exists=True)
+    op.drop_table('daily_vowel_stats', if_exists=True)
+    op.drop_table('daily_quiz_stats', if_exists=True)
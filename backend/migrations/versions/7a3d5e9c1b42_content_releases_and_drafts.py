@@ -0,0 +1,43 @@
+"""content releases and drafts
+
+Revision ID: 7a3d5e9c1b42
+Revises:
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7a3d5e9c1b42'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'content_releases',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('note', sa.String(), nullable=True),
+        sa.Column('change_count', sa.Integer(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'content_drafts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('target_id', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('staged_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'target_id', name='uq_content_drafts_target'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('content_drafts', if_exists=True)
+    op.drop_table('content_releases', if_exists=True)
@@ -0,0 +1,62 @@
+"""word skeletons and comparison pairs
+
+Revision ID: 8b2e4d6f1a35
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4d6f1a35'
+down_revision = '3f1c2a9b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'word_skeletons',
+        sa.Column('word_example_id', sa.Integer(), nullable=False),
+        sa.Column('skeleton', sa.String(), nullable=True),
+        sa.Column('slot', sa.Integer(), nullable=True),
+        sa.Column('word', sa.String(), nullable=False),
+        sa.Column('vowel_id', sa.String(), nullable=False),
+        sa.Column('audio_url', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['word_example_id'], ['word_examples.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('word_example_id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_word_skeletons_skeleton', 'word_skeletons', ['skeleton'], unique=False, if_not_exists=True)
+
+    op.create_table(
+        'comparison_pairs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('contrast_with', sa.String(), nullable=False),
+        sa.Column('word_a', sa.String(), nullable=False),
+        sa.Column('word_b', sa.String(), nullable=False),
+        sa.Column('audio_url_a', sa.String(), nullable=False),
+        sa.Column('audio_url_b', sa.String(), nullable=False),
+        sa.Column('note', sa.String(), nullable=True),
+        sa.Column('vowel_id', sa.String(), nullable=True),
+        sa.Column('word_example_a_id', sa.Integer(), nullable=False),
+        sa.Column('word_example_b_id', sa.Integer(), nullable=False),
+        sa.Column('skeleton', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['vowel_id'], ['vowels.id']),
+        sa.ForeignKeyConstraint(['word_example_a_id'], ['word_examples.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['word_example_b_id'], ['word_examples.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('word_example_a_id', 'word_example_b_id', name='uq_comparison_pairs_examples'),
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_comparison_pairs_vowels', 'comparison_pairs', ['vowel_id', 'contrast_with'], unique=False, if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_comparison_pairs_vowels', table_name='comparison_pairs', if_exists=True)
+    op.drop_table('comparison_pairs', if_exists=True)
+    op.drop_index('ix_word_skeletons_skeleton', table_name='word_skeletons', if_exists=True)
+    op.drop_table('word_skeletons', if_exists=True)
@@ -0,0 +1,39 @@
+"""spaced-repetition review states
+
+Revision ID: c47d91e25b08
+Revises: 8b2e4d6f1a35
+Create Date: 2026-10-19 16:05:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c47d91e25b08'
+down_revision = '8b2e4d6f1a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'review_states',
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('quiz_id', sa.Integer(), nullable=False),
+        sa.Column('repetitions', sa.Integer(), nullable=False),
+        sa.Column('ease', sa.Float(), nullable=False),
+        sa.Column('interval', sa.Float(), nullable=False),
+        sa.Column('due_at', sa.DateTime(), nullable=False),
+        sa.Column('reviewed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('session_id', 'quiz_id'),
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_review_states_session_due', 'review_states', ['session_id', 'due_at'], unique=False, if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index('ix_review_states_session_due', table_name='review_states', if_exists=True)
+    op.drop_table('review_states', if_exists=True)
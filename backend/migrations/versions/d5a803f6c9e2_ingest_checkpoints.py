@@ -0,0 +1,29 @@
+"""write-behind ingest checkpoints
+
+Revision ID: d5a803f6c9e2
+Revises: c47d91e25b08
+Create Date: 2026-10-19 16:40:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd5a803f6c9e2'
+down_revision = 'c47d91e25b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ingest_checkpoints',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('ingest_checkpoints', if_exists=True)
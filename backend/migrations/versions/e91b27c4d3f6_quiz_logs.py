@@ -0,0 +1,39 @@
+"""per-answer quiz logs
+
+Revision ID: e91b27c4d3f6
+Revises: d5a803f6c9e2
+Create Date: 2026-10-19 17:20:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'e91b27c4d3f6'
+down_revision = 'd5a803f6c9e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'quiz_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=True),
+        sa.Column('quiz_id', sa.Integer(), nullable=False),
+        sa.Column('question_index', sa.Integer(), nullable=False),
+        sa.Column('question_text', sa.String(), nullable=True),
+        sa.Column('selected_option', sa.Integer(), nullable=True),
+        sa.Column('correct_option', sa.Integer(), nullable=True),
+        sa.Column('is_correct', sa.Boolean(), nullable=True),
+        sa.Column('answered_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_quiz_logs_answered_at', 'quiz_logs', ['answered_at'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_quiz_logs_answered_at', table_name='quiz_logs', if_exists=True)
+    op.drop_table('quiz_logs', if_exists=True)
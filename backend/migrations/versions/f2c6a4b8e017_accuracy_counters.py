@@ -0,0 +1,48 @@
+"""vowel and word accuracy counters
+
+Revision ID: f2c6a4b8e017
+Revises: e91b27c4d3f6
+Create Date: 2026-10-19 17:55:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a4b8e017'
+down_revision = 'e91b27c4d3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'vowel_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('vowel', sa.String(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('incorrect', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id', 'vowel', name='uq_vowel_stats_session_vowel'),
+        if_not_exists=True,
+    )
+    op.create_table(
+        'word_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(), nullable=False),
+        sa.Column('word', sa.String(), nullable=False),
+        sa.Column('vowel', sa.String(), nullable=True),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('incorrect', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['session_id'], ['user_sessions.session_id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id', 'word', name='uq_word_stats_session_word'),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table('word_stats', if_exists=True)
+    op.drop_table('vowel_stats', if_exists=True)
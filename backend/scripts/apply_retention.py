@@ -0,0 +1,27 @@
+# scripts/apply_retention.py
+import argparse
+
+from src.app import create_app
+from src.services.retention import apply_retention
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll up and delete old tracking data, then compact the database.")
+    parser.add_argument("--days", type=int, help="Keep raw attempts and answers this many days (default: RETENTION_DAYS)")
+    parser.add_argument("--session-days", type=int, help="Delete sessions idle this many days (default: SESSION_TTL_DAYS)")
+    parser.add_argument("--batch-size", type=int, help="Rows or sessions per transaction (default: RETENTION_BATCH_SIZE)")
+    parser.add_argument("--vacuum", action="store_true", help="Full VACUUM (blocks writers); enables incremental vacuum")
+    args = parser.parse_args()
+
+    with app.app_context():
+        summary = apply_retention(args.days, args.session_days, args.batch_size, vacuum=args.vacuum)
+    print(f"-> {summary['attempts_rolled_up']} attempts rolled up into daily stats")
+    print(f"-> {summary['answers_deleted']} answers and {summary['sessions_deleted']} expired sessions deleted")
+    print(f"-> {summary['idempotency_keys_deleted']} expired idempotency keys deleted")
+    print(f"-> Compacted (auto_vacuum: {summary['auto_vacuum']})")
+
+
+if __name__ == "__main__":
+    main()
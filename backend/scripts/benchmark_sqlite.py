@@ -0,0 +1,106 @@
+# scripts/benchmark_sqlite.py
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+READ_ROUTES = ("/user/quiz-scores?session_id={}", "/user/progress?session_id={}", "/user/accuracy?session_id={}")
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def _report(name, latencies, errors, seconds):
+    latencies.sort()
+    ms = [value * 1000 for value in latencies]
+    print(
+        f"-> {name}: {len(ms)} requests ({len(ms) / seconds:.0f}/s), {errors} errors; "
+        f"p50 {statistics.median(ms) if ms else 0:.1f} ms, p99 {_percentile(ms, 0.99):.1f} ms, "
+        f"max {ms[-1] if ms else 0:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent reads and quiz submissions against a scratch copy of the database.")
+    parser.add_argument("--profile", choices=("production", "default"), default="production", help="SQLITE_PROFILE to run with")
+    parser.add_argument("--source", help="Database to copy (default: the configured SQLALCHEMY_DATABASE_URI)")
+    parser.add_argument("--readers", type=int, default=8, help="Threads sending GET requests")
+    parser.add_argument("--writers", type=int, default=4, help="Threads submitting quiz scores")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of the run")
+    parser.add_argument("--sessions", type=int, default=200, help="Distinct session ids used")
+    args = parser.parse_args()
+
+    # Configured before the app is imported: Config reads the environment once, at import
+    source = args.source
+    if source is None:
+        from src.config import Config
+        uri, prefix = Config.SQLALCHEMY_DATABASE_URI, "sqlite:///"
+        source = uri[len(prefix):] if uri.startswith(prefix) else uri
+    scratch = tempfile.mkdtemp(prefix="phonolab-bench-")
+    path = os.path.join(scratch, "bench.db")
+    with sqlite3.connect(source) as src, sqlite3.connect(path) as dst:
+        src.backup(dst)
+    os.environ.update({
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}",
+        "SQLITE_PROFILE": args.profile,
+        "ATTEMPT_WRITE_BEHIND": "false",     # each submission commits in its request
+        "ADMISSION_CONTROL": "false",
+    })
+
+    from src.app import create_app
+    from src.services.content_cache import get_snapshot
+
+    app = create_app()
+    with app.app_context():
+        quizzes = [(quiz["id"], [option["id"] for option in quiz["options"]][:1])
+                   for quiz in get_snapshot()["quizzes"].values() if quiz["options"]]
+    if not quizzes:
+        shutil.rmtree(scratch)
+        parser.error("the source database has no quizzes with options")
+
+    stop = threading.Event()
+    results = {"reads": ([], [0]), "writes": ([], [0])}
+    lock = threading.Lock()
+
+    def run(kind, worker):
+        client = app.test_client()
+        latencies, errors, i = [], 0, worker
+        while not stop.is_set():
+            session_id = f"bench-{i % args.sessions}"
+            started = time.perf_counter()
+            if kind == "reads":
+                response = client.get(READ_ROUTES[i % len(READ_ROUTES)].format(session_id))
+            else:
+                quiz_id, option_ids = quizzes[i % len(quizzes)]
+                response = client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": option_ids})
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 500
+            i += 1
+        with lock:
+            results[kind][0].extend(latencies)
+            results[kind][1][0] += errors
+
+    threads = [threading.Thread(target=run, args=("reads", n)) for n in range(args.readers)]
+    threads += [threading.Thread(target=run, args=("writes", n)) for n in range(args.writers)]
+    print(f"-> {args.profile} profile: {args.readers} readers, {args.writers} writers for {args.seconds:g}s on a copy of {source}")
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    for kind, (latencies, errors) in results.items():
+        _report(kind, latencies, errors[0], elapsed)
+    shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
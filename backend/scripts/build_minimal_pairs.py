@@ -0,0 +1,21 @@
+# scripts/build_minimal_pairs.py
+import argparse
+
+from src.app import create_app
+from src.services.minimal_pairs import refresh_pairs
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index word examples by skeleton and store their minimal pairs.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every skeleton and pair")
+    args = parser.parse_args()
+
+    with app.app_context():
+        result = refresh_pairs(rebuild=args.rebuild)
+    print(f"-> Re-indexed {result['examples']} word examples, created {result['pairs']} pairs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# scripts/build_pronunciations.py
+import argparse
+
+from src.app import create_app
+from src.services.g2p import compile_dictionary
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the pronouncing dictionary into its binary index.")
+    parser.add_argument("--source", default=app.config["G2P_DICTIONARY"], help="CMUdict-style text file")
+    parser.add_argument("--output", default=app.config["G2P_INDEX"], help="compiled index path")
+    args = parser.parse_args()
+
+    count = compile_dictionary(args.source, args.output)
+    print(f"-> Compiled {count} words into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
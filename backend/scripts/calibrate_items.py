@@ -0,0 +1,27 @@
+# scripts/calibrate_items.py
+import argparse
+
+from src.app import create_app
+from src.services.calibration import MODELS, calibrate
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit quiz difficulty (and discrimination) from the answer log.")
+    parser.add_argument("--model", choices=MODELS, default="2pl", help="Item-response model (default: 2pl)")
+    parser.add_argument("--full", action="store_true", help="Ignore the checkpoint and refit from all answers")
+    parser.add_argument("--iterations", type=int, default=50, help="Maximum fitting iterations (default: 50)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: IRT_CHECKPOINT)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        summary = calibrate(args.model, full=args.full, iterations=args.iterations, checkpoint=args.checkpoint)
+    mode = "incremental" if summary["incremental"] else "full"
+    print(f"-> {mode} {summary['model']} fit: {summary['new_answers']} new answers, "
+          f"{summary['sessions']} sessions, up to answer {summary['last_id']}")
+    print(f"-> {summary['iterations']} iterations, {summary['quizzes']} quizzes calibrated")
+
+
+if __name__ == "__main__":
+    main()
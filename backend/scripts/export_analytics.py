@@ -0,0 +1,30 @@
+# scripts/export_analytics.py
+import argparse
+from datetime import date
+
+from src.app import create_app
+from src.services.export import EXPORT_TABLES, FORMATS, export_table
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export attempts, completed lessons and answers, partitioned by day.")
+    parser.add_argument("--table", action="append", choices=sorted(EXPORT_TABLES), help="Table to export, repeatable (default: all)")
+    parser.add_argument("--format", choices=FORMATS, default="csv", help="gzip CSV or Parquet (needs pyarrow)")
+    parser.add_argument("--out", help="Output directory (default: Config.EXPORT_DIR)")
+    parser.add_argument("--start", type=date.fromisoformat, help="First day included, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="First day excluded, YYYY-MM-DD")
+    parser.add_argument("--chunk-size", type=int, help="Rows per read (default: Config.EXPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        out = args.out or app.config["EXPORT_DIR"]
+        chunk_size = args.chunk_size or app.config["EXPORT_CHUNK_SIZE"]
+        for table in args.table or sorted(EXPORT_TABLES):
+            counts = export_table(table, out, args.format, chunk_size, args.start, args.end)
+            print(f"-> {table}: {sum(counts.values())} rows in {len(counts)} daily partitions under {out}")
+
+
+if __name__ == "__main__":
+    main()
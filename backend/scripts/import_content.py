@@ -0,0 +1,30 @@
+# scripts/import_content.py
+import argparse
+
+from src.app import create_app
+from src.services.importer import KINDS, import_file
+from src.services.minimal_pairs import refresh_pairs
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import vowels, word examples, lessons and quizzes from xlsx/CSV.")
+    parser.add_argument("path", nargs="?", default=app.config["EXCEL_INPUT"], help="xlsx workbook or CSV file")
+    parser.add_argument("--kind", choices=KINDS, help="content kind (required for CSV, optional sheet for xlsx)")
+    parser.add_argument("--batch-size", type=int, default=app.config["IMPORT_BATCH_SIZE"])
+    args = parser.parse_args()
+
+    with app.app_context():
+        reports = import_file(args.path, kind=args.kind, batch_size=args.batch_size)
+        if any(report["kind"] == "word_examples" and report["imported"] for report in reports):
+            refresh_pairs()
+
+    for report in reports:
+        print(f"-> {report['kind']}: imported {report['imported']}, {len(report['errors'])} errors")
+        for error in report["errors"]:
+            print(f"  - row {error['row']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
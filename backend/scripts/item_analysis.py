@@ -0,0 +1,24 @@
+# scripts/item_analysis.py
+import argparse
+from datetime import date, datetime
+
+from src.app import create_app
+from src.services.answer_analytics import item_statistics, load_answers
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Proportion of correct answers per quiz for one day.")
+    parser.add_argument("--day", type=date.fromisoformat, default=datetime.utcnow().date(), help="YYYY-MM-DD, UTC (default: today)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        answers = load_answers(args.day)
+    print(f"-> {len(answers['quiz_id'])} answers from {len(answers['sessions'])} sessions on {args.day}")
+    for quiz_id, stats in sorted(item_statistics(answers).items()):
+        print(f"   quiz {quiz_id}: {stats['answers']} answers, p = {stats['p_value']}")
+
+
+if __name__ == "__main__":
+    main()
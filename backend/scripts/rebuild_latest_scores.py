@@ -0,0 +1,15 @@
+# scripts/rebuild_latest_scores.py
+from src.app import create_app
+from src.services.scores import rebuild_latest_scores
+
+app = create_app()
+
+
+def main():
+    with app.app_context():
+        count = rebuild_latest_scores()
+    print(f"-> Rebuilt {count} latest quiz scores from quiz_attempts")
+
+
+if __name__ == "__main__":
+    main()
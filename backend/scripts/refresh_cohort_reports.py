@@ -0,0 +1,33 @@
+# scripts/refresh_cohort_reports.py
+import argparse
+import time
+
+from src.app import create_app
+from src.services.cohorts import refresh_report, refresh_stale_reports
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild precomputed cohort reports.")
+    parser.add_argument("--cohort", type=int, help="Rebuild this cohort only, whatever its age")
+    parser.add_argument("--max-age", type=float, help="Rebuild reports older than this many seconds (default: COHORT_REPORT_MAX_AGE)")
+    parser.add_argument("--every", type=float, help="Keep running, checking for stale reports every this many seconds")
+    args = parser.parse_args()
+
+    workers = app.config["COHORT_REPORT_WORKERS"]
+    with app.app_context():
+        if args.cohort:
+            report = refresh_report(args.cohort, workers)
+            print(f"-> Cohort {args.cohort}: " + (f"rebuilt in {report.duration}s" if report else "not found"))
+            return
+        while True:
+            refreshed = refresh_stale_reports(args.max_age, workers)
+            print(f"-> Rebuilt {len(refreshed)} cohort reports {refreshed}")
+            if not args.every:
+                break
+            time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
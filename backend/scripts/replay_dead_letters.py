@@ -0,0 +1,16 @@
+# scripts/replay_dead_letters.py
+from src.app import create_app
+from src.services.attempt_ingest import replay_dead_letters
+
+app = create_app()
+
+
+def main():
+    path = app.config["ATTEMPT_DEAD_LETTER_FILE"]
+    with app.app_context():
+        stored, remaining = replay_dead_letters(path)
+    print(f"-> Stored {stored} dead-lettered quiz attempts, {remaining} left in {path}")
+
+
+if __name__ == "__main__":
+    main()
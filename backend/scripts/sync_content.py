@@ -0,0 +1,43 @@
+# scripts/sync_content.py
+import argparse
+
+from src.app import create_app
+from src.services.content import sync_content
+from src.services.minimal_pairs import refresh_pairs
+
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vowels, word examples and lessons with the content catalog.")
+    parser.add_argument("--content", default=app.config["CONTENT_FILE"], help="declarative content file (JSON)")
+    parser.add_argument("--audio-dir", default=app.config["WORD_AUDIO_DIR"], help="word example audio directory")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing them")
+    parser.add_argument("--no-prune", action="store_true", help="never delete rows missing from the catalog")
+    args = parser.parse_args()
+
+    with app.app_context():
+        report = sync_content(args.content, args.audio_dir, dry_run=args.dry_run, prune=not args.no_prune)
+        if report["changed"] and not report["dry_run"]:
+            refresh_pairs()
+
+    for section, changes in report["changes"].items():
+        counts = ", ".join(f"{action} {entry['count']}" for action, entry in changes.items())
+        print(f"-> {section}: {counts}")
+        for action, entry in changes.items():
+            for key in entry["keys"]:
+                print(f"  {action}: {key}")
+
+    for warning in report["warnings"]:
+        print(f" ! {warning}")
+
+    if report["dry_run"]:
+        print("-> Dry run, nothing written.")
+    elif not report["changed"]:
+        print("-> Already in sync.")
+    else:
+        print("-> Sync applied.")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,9 @@ setup(
     install_requires=requirements,
     extras_require={
         # 'dev': dev_requirements
+        'xlsx': ['openpyxl'],
+        'analytics': ['numpy'],
+        'parquet': ['pyarrow'],
     },
     entry_points={
         'console_scripts': [
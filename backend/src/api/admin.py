@@ -0,0 +1,63 @@
+# src/api/admin.py
+import hmac
+from datetime import date
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
+
+from src.services.admission import get_admission_control
+from src.services.export import EXPORT_TABLES, stream_csv_gzip
+from src.utils.format import error_response, success_response
+
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@admin_bp.before_request
+def require_admin_token():
+    """
+    Admin routes need the X-Admin-Token header to match Config.ADMIN_TOKEN; they are
+    disabled when no token is configured.
+    """
+    token = current_app.config.get("ADMIN_TOKEN")
+    if not token:
+        return error_response("Admin routes are disabled (ADMIN_TOKEN is not set)", 403)
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), token):
+        return error_response("Invalid admin token", 401)
+
+
+@admin_bp.route("/export/<string:table>", methods=["GET"])
+def export_table_route(table):
+    """
+    Streams a table as gzip-compressed CSV, read in chunks.
+    Query params:
+    - start (YYYY-MM-DD, optional) - first day included
+    - end (YYYY-MM-DD, optional) - first day excluded
+    """
+    if table not in EXPORT_TABLES:
+        return error_response(f"Unknown table, expected one of {sorted(EXPORT_TABLES)}", 404)
+    try:
+        start, end = (date.fromisoformat(request.args[key]) if request.args.get(key) else None
+                      for key in ("start", "end"))
+    except ValueError:
+        return error_response("start and end must be dates (YYYY-MM-DD)", 400)
+
+    chunks = stream_csv_gzip(table, current_app.config["EXPORT_CHUNK_SIZE"], start, end)
+    return Response(
+        stream_with_context(chunks),
+        mimetype="application/gzip",
+        headers={"Content-Disposition": f"attachment; filename={table}.csv.gz"},
+    )
+
+
+@admin_bp.route("/admission", methods=["GET"])
+def admission_stats():
+    """
+    Returns the admission control counters (admitted and rejected write requests since start,
+    writes in flight) and the configured limits, for tuning.
+    """
+    config = current_app.config
+    return success_response("Admission stats retrieved", {
+        "enabled": config["ADMISSION_CONTROL"],
+        "limits": {key[len("ADMISSION_"):].lower(): value
+                   for key, value in config.items() if key.startswith("ADMISSION_") and key != "ADMISSION_CONTROL"},
+        "counters": get_admission_control().stats(),
+    })
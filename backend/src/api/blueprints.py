@@ -1,9 +1,13 @@
 # backend/src/api/blueprints.py
 
+from .admin import admin_bp
 from .audio import audio_bp
+from .cohort import cohort_bp
+from .content import content_bp
 from .lesson import lesson_bp
 from .phoneme import phoneme_bp
 from .quiz import quiz_bp
+from .search import search_bp
 from .user import user_bp
 
 # from .user import track_bp
@@ -13,5 +17,9 @@ all_blueprints = [
     phoneme_bp,
     quiz_bp,
     audio_bp,
-    user_bp
+    user_bp,
+    content_bp,
+    search_bp,
+    cohort_bp,
+    admin_bp
 ]
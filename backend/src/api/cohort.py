@@ -0,0 +1,97 @@
+# src/api/cohort.py
+from flask import Blueprint, request
+
+from src.db import db
+from src.models.user import Cohort
+from src.services.admission import admission_controlled
+from src.services.cohorts import add_members, create_cohort, get_report, is_refreshing, request_refresh
+from src.utils.format import error_response, success_response
+
+cohort_bp = Blueprint("cohort", __name__, url_prefix="/cohorts")
+
+
+def _session_ids(data):
+    session_ids = data.get("session_ids", [])
+    if not isinstance(session_ids, list) or not all(isinstance(s, str) and s for s in session_ids):
+        return None
+    return session_ids
+
+
+@cohort_bp.route("/", methods=["GET"])
+def list_cohorts():
+    """
+    Lists cohorts with their member counts.
+    """
+    cohorts = Cohort.query.order_by(Cohort.id).all()
+    return success_response("Cohorts retrieved", {"cohorts": [cohort.to_dict() for cohort in cohorts]})
+
+
+@cohort_bp.route("/", methods=["POST"])
+@admission_controlled
+def create_cohort_route():
+    """
+    Creates a cohort.
+    **Expected JSON:**
+    - name (str)
+    - session_ids (list of str, optional)
+    """
+    data = request.get_json()
+    name = data.get("name")
+    session_ids = _session_ids(data)
+    if not name:
+        return error_response("Missing name", 400)
+    if session_ids is None:
+        return error_response("session_ids must be a list of session ids", 400)
+
+    cohort = create_cohort(name, session_ids)
+    if not cohort:
+        return error_response("A cohort with this name already exists", 409)
+    return success_response("Cohort created", {"cohort": cohort.to_dict()}, 201)
+
+
+@cohort_bp.route("/<int:cohort_id>/members", methods=["POST"])
+@admission_controlled
+def add_members_route(cohort_id):
+    """
+    Adds sessions to a cohort.
+    **Expected JSON:**
+    - session_ids (list of str)
+    """
+    if not db.session.get(Cohort, cohort_id):
+        return error_response("Cohort not found", 404)
+    session_ids = _session_ids(request.get_json())
+    if not session_ids:
+        return error_response("session_ids must be a non-empty list of session ids", 400)
+
+    added = add_members(cohort_id, session_ids)
+    return success_response("Members added", {"added": added})
+
+
+@cohort_bp.route("/<int:cohort_id>/report", methods=["GET"])
+def get_report_route(cohort_id):
+    """
+    The cohort's precomputed report: per-student mastery, item difficulty and class-wide
+    vowel confusion. When no report was built yet, one is started and 202 is returned.
+    """
+    if not db.session.get(Cohort, cohort_id):
+        return error_response("Cohort not found", 404)
+
+    report = get_report(cohort_id)
+    if report is None:
+        request_refresh(cohort_id)
+        return success_response("Report is being generated", {"refreshing": True}, 202)
+    return success_response("Report retrieved", {**report, "refreshing": is_refreshing(cohort_id)})
+
+
+@cohort_bp.route("/<int:cohort_id>/report", methods=["POST"])
+@admission_controlled
+def refresh_report_route(cohort_id):
+    """
+    Rebuilds the cohort's report in the background.
+    """
+    if not db.session.get(Cohort, cohort_id):
+        return error_response("Cohort not found", 404)
+
+    started = request_refresh(cohort_id)
+    return success_response("Report refresh started" if started else "Report refresh already running",
+                            {"refreshing": True}, 202)
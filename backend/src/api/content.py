@@ -0,0 +1,54 @@
+# src/api/content.py
+
+from flask import Blueprint, request
+
+from src.services.admission import admission_controlled
+from src.services.content_cache import live_version
+from src.services.publishing import discard_drafts, get_drafts, publish
+from src.utils.format import error_response, success_response
+
+content_bp = Blueprint("content", __name__, url_prefix="/content")
+
+
+@content_bp.route("/version", methods=["GET"])
+def get_content_version():
+    """
+    Returns the live content version.
+    """
+    return success_response("Content version retrieved", {"version": live_version()})
+
+
+@content_bp.route("/drafts", methods=["GET"])
+def list_drafts():
+    """
+    Lists the staged edits waiting to be published.
+    """
+    drafts = get_drafts()
+    return success_response("Drafts retrieved", {"drafts": [draft.to_dict() for draft in drafts]})
+
+
+@content_bp.route("/drafts", methods=["DELETE"])
+@admission_controlled
+def discard_drafts_route():
+    """
+    Discards every staged edit.
+    """
+    discarded = discard_drafts()
+    return success_response("Drafts discarded", {"discarded": discarded})
+
+
+@content_bp.route("/publish", methods=["POST"])
+@admission_controlled
+def publish_route():
+    """
+    Publishes all staged edits as a new live content version.
+    **Body (optional):**
+    - note: str
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        result = publish(note=data.get("note"))
+    except Exception as e:
+        return error_response(f"Error publishing content: {str(e)}", 500)
+
+    return success_response("Content published", result)
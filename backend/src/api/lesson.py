@@ -2,14 +2,9 @@
 
 from flask import Blueprint, request
 
-from ..services.lesson import (
-    create_lesson,
-    delete_lesson,
-    get_all_lessons,
-    get_lesson_by_id,
-    get_lesson_by_vowel,
-    update_lesson_instructions,
-)
+from ..services.admission import admission_controlled
+from ..services.content_cache import get_snapshot
+from ..services.publishing import stage_lesson_deletion, stage_lesson_instructions, stage_lessons
 from ..utils.format import error_response, success_response
 
 lesson_bp = Blueprint("lesson", __name__, url_prefix="/lessons")
@@ -21,8 +16,8 @@ def list_lessons():
     Retrieves all lessons.
     """
     try:
-        lessons = get_all_lessons()
-        return success_response("Lessons retrieved", {"lessons": [lesson.to_dict() for lesson in lessons]})
+        lessons = get_snapshot()["lessons"]
+        return success_response("Lessons retrieved", {"lessons": list(lessons.values())})
     except Exception as e:
         return error_response(f"Error retrieving lessons: {str(e)}")
 
@@ -32,10 +27,10 @@ def get_lesson(lesson_id):
     """
     Gets a lesson by its ID.
     """
-    lesson = get_lesson_by_id(lesson_id)
+    lesson = get_snapshot()["lessons"].get(lesson_id)
     if not lesson:
         return error_response("Lesson not found", 404)
-    return success_response("Lesson retrieved", {"lesson": lesson.to_dict()})
+    return success_response("Lesson retrieved", {"lesson": lesson})
 
 
 @lesson_bp.route("/vowel/<string:vowel_id>", methods=["GET"])
@@ -43,18 +38,19 @@ def get_lesson_by_vowel_id(vowel_id):
     """
     Gets the lesson by vowel ID.
     """
-    lesson = get_lesson_by_vowel(vowel_id)
+    lesson = get_snapshot()["lessons_by_vowel"].get(vowel_id)
     if not lesson:
         return error_response("No lesson found for this vowel", 404)
-    return success_response("Lesson retrieved", {"lesson": lesson.to_dict()})
+    return success_response("Lesson retrieved", {"lesson": lesson})
 
 
 @lesson_bp.route("/", methods=["POST"])
+@admission_controlled
 def create_lesson_route():
     """
-    Creates a new lesson.
+    Stages a new lesson; it goes live on the next POST /content/publish.
     **Body:**
-    - vowel_id: str
+    - vowel_id: str (a live or staged vowel)
     - instructions: list[str]
     """
     data = request.get_json()
@@ -65,18 +61,47 @@ def create_lesson_route():
         return error_response("vowel_id and instructions are required", 400)
 
     try:
-        lesson = create_lesson(vowel_id, instructions)
-        return success_response("Lesson created", {"lesson": lesson.to_dict()}, 201)
-    except ValueError as e:
-        return error_response(str(e), 404)
+        staged, errors = stage_lessons([data])
     except Exception as e:
         return error_response(f"Unexpected error: {str(e)}")
 
+    if errors:
+        return error_response(errors[0]["error"], 404 if errors[0]["error"] == "Vowel not found" else 400)
+    return success_response("Lesson creation staged", {"draft": staged[0]["draft"]}, 202)
+
+
+@lesson_bp.route("/bulk", methods=["POST"])
+@admission_controlled
+def create_lessons_bulk_route():
+    """
+    Stages many new lessons in one transaction; they go live on the next POST /content/publish,
+    whose response lists the created lesson ids per draft ("created_ids").
+    **Body:**
+    - lessons: list[{vowel_id: str, instructions: list[str]}]
+    - atomic: bool (optional, default true) - reject the whole batch if any lesson is invalid
+    """
+    data = request.get_json() or {}
+    lessons = data.get("lessons")
+    if not isinstance(lessons, list) or not lessons:
+        return error_response("lessons must be a non-empty list", 400)
+
+    try:
+        staged, errors = stage_lessons(lessons, atomic=data.get("atomic", True))
+    except Exception as e:
+        return error_response(f"Unexpected error: {str(e)}")
+
+    item_errors = {str(error["index"]): error["error"] for error in errors}
+    if not staged:
+        return error_response("No lessons staged", 400, item_errors)
+
+    return success_response("Lesson creations staged", {"staged": staged, "errors": item_errors}, 202)
+
 
 @lesson_bp.route("/<int:lesson_id>", methods=["PUT"])
+@admission_controlled
 def update_lesson(lesson_id):
     """
-    Updates lesson instructions.
+    Stages new lesson instructions; they go live on the next POST /content/publish.
     **Body:**
     - instructions: list[str]
     """
@@ -86,20 +111,21 @@ def update_lesson(lesson_id):
     if not instructions:
         return error_response("instructions field is required", 400)
 
-    updated = update_lesson_instructions(lesson_id, instructions)
-    if not updated:
+    draft = stage_lesson_instructions(lesson_id, instructions)
+    if not draft:
         return error_response("Lesson not found", 404)
 
-    return success_response("Lesson updated", {"lesson": updated.to_dict()})
+    return success_response("Lesson update staged", {"draft": draft.to_dict()}, 202)
 
 
 @lesson_bp.route("/<int:lesson_id>", methods=["DELETE"])
+@admission_controlled
 def delete_lesson_route(lesson_id):
     """
-    Deletes a lesson and its instructions.
+    Stages the deletion of a lesson and its instructions; it goes on the next POST /content/publish.
     """
-    deleted = delete_lesson(lesson_id)
-    if not deleted:
+    draft = stage_lesson_deletion(lesson_id)
+    if not draft:
         return error_response("Lesson not found", 404)
 
-    return success_response("Lesson deleted")
+    return success_response("Lesson deletion staged", {"draft": draft.to_dict()}, 202)
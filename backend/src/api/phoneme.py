@@ -1,10 +1,17 @@
 # src/api/phoneme.py
 
-from flask import Blueprint, request
-
-from src.db import db
-from src.models.phoneme import Vowel
-from src.services.phoneme import get_word_example_by_id, get_word_example_by_name
+from flask import Blueprint, current_app, request
+
+from src.services.admission import admission_controlled
+from src.services.content_cache import get_snapshot
+from src.services.minimal_pairs import get_contrast
+from src.services.phoneme import (
+    get_word_example_by_id,
+    get_word_example_by_name,
+    search_word_examples,
+    transcribe_words,
+)
+from src.services.publishing import stage_vowel, stage_word_examples
 from src.utils.format import error_response, success_response
 
 phoneme_bp = Blueprint("phoneme", __name__, url_prefix="/vowels")
@@ -13,7 +20,11 @@ phoneme_bp = Blueprint("phoneme", __name__, url_prefix="/vowels")
 # --- Vowel Routes ---
 
 @phoneme_bp.route("/", methods=["POST"])
+@admission_controlled
 def add_vowel():
+    """
+    Stages a new vowel; it goes live on the next POST /content/publish.
+    """
     data = request.get_json()
 
     required_fields = ["id", "phoneme", "name", "ipa_example", "color_code", "audio_url", "description"]
@@ -21,25 +32,58 @@ def add_vowel():
         if field not in data:
             return error_response(f"Missing required field: {field}", 400)
 
-    if Vowel.query.get(data["id"]):
-        return error_response("Vowel with this ID already exists", 400)
-
-    vowel = Vowel(**data)
-    db.session.add(vowel)
-    db.session.commit()
+    try:
+        draft = stage_vowel(data)
+    except ValueError as e:
+        return error_response(str(e), 400)
 
-    return success_response("Vowel created", {"vowel": vowel.to_dict()}, 201)
+    return success_response("Vowel staged", {"draft": draft.to_dict()}, 202)
 
 
 @phoneme_bp.route("/", methods=["GET"])
 def get_all_vowels():
     try:
-        vowels = Vowel.query.all()
-        return success_response("Vowels retrieved", {"vowels": [v.to_dict() for v in vowels]})
+        vowels = get_snapshot()["vowels"]
+        return success_response("Vowels retrieved", {"vowels": vowels})
     except Exception as e:
         return error_response(f"Error retrieving vowels: {str(e)}")
 
 
+@phoneme_bp.route("/<vowel_a>/contrast/<vowel_b>", methods=["GET"])
+def get_vowel_contrast(vowel_a, vowel_b):
+    """
+    Minimal pairs (bit/bet) contrasting two vowels, with audio for both words.
+    """
+    vowel_ids = {vowel["id"] for vowel in get_snapshot()["vowels"]}
+    for vowel_id in (vowel_a, vowel_b):
+        if vowel_id not in vowel_ids:
+            return error_response(f"Vowel not found: {vowel_id}", 404)
+    if vowel_a == vowel_b:
+        return error_response("Choose two different vowels", 400)
+
+    pairs = get_contrast(vowel_a, vowel_b)
+    return success_response("Minimal pairs retrieved", {"vowel_id": vowel_a, "contrast_with": vowel_b, "pairs": pairs})
+
+
+@phoneme_bp.route("/g2p", methods=["POST"])
+def transcribe_words_route():
+    """
+    Maps words to IPA and vowel ids.
+    **Body:**
+    - words: list[str]
+    """
+    data = request.get_json() or {}
+    words = data.get("words")
+    if not isinstance(words, list) or not words or not all(isinstance(w, str) for w in words):
+        return error_response("words must be a non-empty list of strings", 400)
+
+    max_batch = current_app.config["G2P_MAX_BATCH"]
+    if len(words) > max_batch:
+        return error_response(f"At most {max_batch} words per request", 400)
+
+    return success_response("Words transcribed", {"words": transcribe_words(words)})
+
+
 # --- Word Example Routes ---
 
 @phoneme_bp.route("/word-example/<int:example_id>", methods=["GET"])
@@ -50,6 +94,23 @@ def fetch_word_example_by_id(example_id):
     return success_response("Word example retrieved", {"example": example.to_dict()})
 
 
+@phoneme_bp.route("/word-example/search", methods=["GET"])
+def search_word_examples_route():
+    """
+    Searches word examples and vowels by word, IPA, name or description.
+    Query params:
+    - q (str)
+    - limit (int, optional, default 10, max 50)
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return error_response("Missing 'q' query parameter", 400)
+
+    limit = min(request.args.get("limit", 10, type=int), 50)
+    results = search_word_examples(query, limit=limit)
+    return success_response("Search results retrieved", {"query": query, "results": results})
+
+
 @phoneme_bp.route("/word-example", methods=["GET"])
 def fetch_word_example_by_name():
     word = request.args.get("word")
@@ -61,3 +122,30 @@ def fetch_word_example_by_name():
         return error_response("Word example not found", 404)
 
     return success_response("Word example retrieved", {"example": example.to_dict()})
+
+
+@phoneme_bp.route("/word-example/bulk", methods=["POST"])
+@admission_controlled
+def add_word_examples_bulk():
+    """
+    Stages many word examples as one draft; they go live (and into the search index) on the
+    next POST /content/publish, whose response lists their ids, in order ("created_ids").
+    **Body:**
+    - word_examples: list[{word, audio_url, vowel_id?, ipa?, example_sentence?}]
+    - atomic: bool (optional, default true) - reject the whole batch if any item is invalid
+    """
+    data = request.get_json() or {}
+    examples = data.get("word_examples")
+    if not isinstance(examples, list) or not examples:
+        return error_response("word_examples must be a non-empty list", 400)
+
+    try:
+        draft, errors = stage_word_examples(examples, atomic=data.get("atomic", True))
+    except Exception as e:
+        return error_response(f"Error creating word examples: {str(e)}", 500)
+
+    item_errors = {str(error["index"]): error["error"] for error in errors}
+    if not draft:
+        return error_response("No word examples staged", 400, item_errors)
+
+    return success_response("Word examples staged", {"draft": draft.to_dict(), "errors": item_errors}, 202)
@@ -1,7 +1,11 @@
 # # src/api/quiz.py
 from flask import Blueprint, request
 
-from src.services.quiz import create_quiz, delete_quiz, get_all_quizzes, get_quiz_by_id, update_quiz_options
+from src.services.admission import admission_controlled
+from src.services.content_cache import get_snapshot
+from src.services.grading import InvalidAnswers
+from src.services.publishing import stage_quiz_deletion, stage_quiz_options, stage_quizzes
+from src.services.quiz_generator import InvalidQuizToken, generate_quizzes, generate_session_quiz, grade_session_quiz
 from src.utils.format import error_response, success_response
 
 quiz_bp = Blueprint("quiz", __name__, url_prefix="/quiz")
@@ -12,8 +16,8 @@ def list_quizzes():
     """
     Retrieves all quizzes.
     """
-    quizzes = get_all_quizzes()
-    return success_response("Quizzes retrieved", {"quizzes": [q.to_dict() for q in quizzes]})
+    quizzes = get_snapshot()["quizzes"]
+    return success_response("Quizzes retrieved", {"quizzes": list(quizzes.values())})
 
 
 @quiz_bp.route("/<int:quiz_id>", methods=["GET"])
@@ -21,16 +25,17 @@ def get_quiz(quiz_id):
     """
     Retrieves a quiz by its ID.
     """
-    quiz = get_quiz_by_id(quiz_id)
+    quiz = get_snapshot()["quizzes"].get(quiz_id)
     if not quiz:
         return error_response("Quiz not found", 404)
-    return success_response("Quiz retrieved", {"quiz": quiz.to_dict()})
+    return success_response("Quiz retrieved", {"quiz": quiz})
 
 
 @quiz_bp.route("/", methods=["POST"])
+@admission_controlled
 def create_quiz_route():
     """
-    Creates a new quiz.
+    Stages a new quiz; it goes live on the next POST /content/publish.
     Expects:
     - prompt_word: str
     - prompt_ipa: str
@@ -38,48 +43,143 @@ def create_quiz_route():
     - question_audio_url: str
     - correct_options: list of audio URLs
     - wrong_option: str
-    - vowel_id: str (optional)
+    - vowel_id: str (optional, a live or staged vowel)
     """
+    data = request.get_json()
+    try:
+        staged, errors = stage_quizzes([data])
+    except Exception as e:  # fallback for unexpected issues
+        return error_response(f"Error creating quiz: {str(e)}", 500)
+
+    if errors:
+        return error_response(errors[0]["error"], 400)
+    return success_response("Quiz creation staged", {"draft": staged[0]["draft"]}, 202)
+
+
+@quiz_bp.route("/bulk", methods=["POST"])
+@admission_controlled
+def create_quizzes_bulk_route():
+    """
+    Stages many new quizzes in one transaction; they go live on the next POST /content/publish,
+    whose response lists the created quiz ids per draft ("created_ids").
+
+    **Expected JSON Body:**
+    - quizzes: list of quiz objects, each shaped like the POST /quiz/ body
+    - atomic: bool (optional, default true) - reject the whole batch if any quiz is invalid
+    """
+    data = request.get_json() or {}
+    quizzes = data.get("quizzes")
+    if not isinstance(quizzes, list) or not quizzes:
+        return error_response("quizzes must be a non-empty list", 400)
+
+    atomic = data.get("atomic", True)
+    try:
+        staged, errors = stage_quizzes(quizzes, atomic=atomic)
+    except Exception as e:
+        return error_response(f"Error creating quizzes: {str(e)}", 500)
+
+    item_errors = {str(error["index"]): error["error"] for error in errors}
+    if not staged:
+        return error_response("No quizzes staged", 400, item_errors)
+
+    return success_response("Quiz creations staged", {"staged": staged, "errors": item_errors}, 202)
+
+
+@quiz_bp.route("/generate", methods=["POST"])
+@admission_controlled
+def generate_quizzes_route():
+    """
+    Generates quizzes from the word examples and stages them for the next POST /content/publish:
+    for each prompt word the learner picks the word(s) sharing its vowel, against distractors
+    from neighbouring vowels.
+
+    **Expected JSON Body (all optional):**
+    - vowel_ids: list[str] - restrict to these vowels
+    - seed: int (default 0) - same seed, same quizzes
+    - correct_count: int (default 1)
+    - distractor_count: int (default 2)
+    - skip_existing: bool (default true) - leave out words that already have a quiz, live or staged
+    - limit: int
+    """
+    data = request.get_json(silent=True) or {}
     try:
-        data = request.get_json()
-        prompt_word = data["prompt_word"]
-        prompt_ipa = data["prompt_ipa"]
-        prompt_audio_url = data["prompt_audio_url"]
-        correct_options = data["correct_options"]
-        wrong_option = data["wrong_option"]
-        vowel_id = data.get("vowel_id")
-
-        # Create answer options list
-        options = [{"word": prompt_word, "ipa": prompt_ipa, "audio_url": url, "is_correct": True}
-                   for url in correct_options]
-
-        options.append({
-            "word": prompt_word,
-            "ipa": prompt_ipa,
-            "audio_url": wrong_option,
-            "is_correct": False
-        })
-
-        quiz = create_quiz(
-            prompt_word=prompt_word,
-            prompt_ipa=prompt_ipa,
-            prompt_audio_url=prompt_audio_url,
-            options=options,
-            vowel_id=vowel_id
+        drafts = generate_quizzes(
+            vowel_ids=data.get("vowel_ids"),
+            seed=data.get("seed", 0),
+            correct_count=int(data.get("correct_count", 1)),
+            distractor_count=int(data.get("distractor_count", 2)),
+            skip_existing=data.get("skip_existing", True),
+            limit=data.get("limit"),
         )
+    except (TypeError, ValueError) as e:
+        return error_response(f"Invalid parameters: {str(e)}", 400)
+    except Exception as e:
+        return error_response(f"Error generating quizzes: {str(e)}", 500)
 
-        return success_response("Quiz created", {"quiz": quiz.to_dict()}, 201)
+    return success_response("Quizzes generated and staged", {"staged": [draft.to_dict() for draft in drafts]}, 202)
 
-    except KeyError as e:
-        return error_response(f"Missing field: {str(e)}", 400)
-    except Exception as e:  # fallback for unexpected issues
-        return error_response(f"Error creating quiz: {str(e)}", 500)
+
+@quiz_bp.route("/generate", methods=["GET"])
+def generate_session_quiz_route():
+    """
+    Hands out a quiz for the session, generated from the word examples without storing anything.
+    Options are identified by word example id; the returned token is sent back with the answers
+    to POST /quiz/generate/score.
+    Query params:
+    - session_id (str)
+    - vowel_id (str, optional)
+    - seed (int, optional) - replays a previously returned quiz
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    quiz = generate_session_quiz(
+        session_id,
+        seed=request.args.get("seed", type=int),
+        vowel_id=request.args.get("vowel_id"),
+    )
+    if not quiz:
+        return error_response("Not enough word examples to build a quiz", 404)
+    return success_response("Quiz generated", {"quiz": quiz})
+
+
+@quiz_bp.route("/generate/score", methods=["POST"])
+def score_session_quiz():
+    """
+    Grades the answers to a session quiz from GET /quiz/generate. Practice only: the attempt
+    is not logged.
+    **Expected JSON:**
+    - session_id (str)
+    - token (str) - the quiz's token
+    - answers (list) - the selected option ids, each once
+    """
+    data = request.get_json()
+    session_id = data.get("session_id")
+    token = data.get("token")
+    answers = data.get("answers")
+
+    if not session_id or not isinstance(token, str) or not isinstance(answers, list) or not answers:
+        return error_response("Missing one or more required fields", 400)
+
+    if not all(isinstance(option_id, int) for option_id in answers):
+        return error_response("Each answer must be an integer option id", 400)
+
+    try:
+        score, total = grade_session_quiz(session_id, token, answers)
+    except (InvalidQuizToken, InvalidAnswers) as e:
+        return error_response(str(e), 400)
+
+    return success_response("Quiz graded", {
+        "score": score, "total": total, "percentage": round(score / total * 100) if total else 0
+    })
 
 
 @quiz_bp.route("/<int:quiz_id>", methods=["PUT"])
+@admission_controlled
 def update_quiz(quiz_id):
     """
-    Updates quiz options.
+    Stages replacement quiz options; they go live on the next POST /content/publish.
 
     **Expected JSON Body:**
     - options: list of new answer options
@@ -89,20 +189,25 @@ def update_quiz(quiz_id):
     if not new_options:
         return error_response("Missing options", 400)
 
-    updated_quiz = update_quiz_options(quiz_id, new_options)
-    if not updated_quiz:
+    invalid = [option for option in new_options if not all(option.get(f) for f in ("word", "ipa", "audio_url"))]
+    if invalid:
+        return error_response("Each option needs word, ipa and audio_url", 400)
+
+    draft = stage_quiz_options(quiz_id, new_options)
+    if not draft:
         return error_response("Quiz not found", 404)
 
-    return success_response("Quiz updated", {"quiz": updated_quiz.to_dict()})
+    return success_response("Quiz update staged", {"draft": draft.to_dict()}, 202)
 
 
 @quiz_bp.route("/<int:quiz_id>", methods=["DELETE"])
+@admission_controlled
 def delete_quiz_route(quiz_id):
     """
-    Deletes a quiz and its options.
+    Stages the deletion of a quiz and its options; it goes on the next POST /content/publish.
     """
-    success = delete_quiz(quiz_id)
-    if not success:
+    draft = stage_quiz_deletion(quiz_id)
+    if not draft:
         return error_response("Quiz not found", 404)
 
-    return success_response("Quiz deleted")
+    return success_response("Quiz deletion staged", {"draft": draft.to_dict()}, 202)
@@ -0,0 +1,45 @@
+# src/api/search.py
+
+from flask import Blueprint, request
+
+from src.services.fulltext import FullTextUnavailable, search_content
+from src.utils.format import error_response, success_response
+
+search_bp = Blueprint("search", __name__, url_prefix="/search")
+
+SEARCH_TYPES = ("lesson", "vowel")
+
+
+@search_bp.route("/", methods=["GET"])
+def search():
+    """
+    Full-text search over lesson instructions and vowel descriptions.
+    Query params:
+    - q (str): words must all match; "quoted text" is matched as a phrase
+    - type (str, optional): lesson or vowel
+    - page (int, optional, default 1)
+    - per_page (int, optional, default 10, max 50)
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        return error_response("Missing 'q' query parameter", 400)
+
+    kind = request.args.get("type")
+    if kind and kind not in SEARCH_TYPES:
+        return error_response(f"type must be one of: {', '.join(SEARCH_TYPES)}", 400)
+
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", 10, type=int), 1), 50)
+
+    try:
+        results, total = search_content(query, page=page, per_page=per_page, kinds=(kind,) if kind else SEARCH_TYPES)
+    except FullTextUnavailable as e:
+        return error_response(str(e), 501)
+
+    return success_response("Search results retrieved", {
+        "query": query,
+        "results": results,
+        "page": page,
+        "per_page": per_page,
+        "total": total
+    })
@@ -1,50 +1,137 @@
 # src/api/user.py
 
 from flask import Blueprint, request
-from src.services.user import log_quiz_attempt
-from src.models.user import QuizAttempt
+from src.services.admission import admission_controlled
+from src.services.confusion import get_matrix, recommend_lesson
+from src.services.content_cache import get_snapshot
+from src.services.grading import InvalidAnswers
+from src.services.idempotency import IdempotencyConflict, IdempotencyMismatch, fingerprint, get_idempotency_store
+from src.services.progress import get_progress
+from src.services.review import next_quizzes
+from src.services.stats import get_vowel_accuracy, get_word_accuracy
+from src.services.attempt_ingest import IngestQueueFull
+from src.services.user import get_latest_attempt, get_session_scores, log_quiz_attempt, mark_lesson_complete
 from src.utils.format import success_response, error_response
 
 user_bp = Blueprint("user", __name__, url_prefix="/user")
 
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+@user_bp.route("/lesson-complete", methods=["POST"])
+@admission_controlled
+def complete_lesson():
+    """
+    Marks a lesson as completed for a session.
+    **Expected JSON:**
+    - session_id (str)
+    - lesson_id (int)
+    """
+    data = request.get_json()
+    session_id = data.get("session_id")
+    lesson_id = data.get("lesson_id")
+
+    if not session_id or lesson_id is None:
+        return error_response("Missing session_id or lesson_id", 400)
+
+    if not isinstance(lesson_id, int):
+        return error_response("lesson_id must be an integer", 400)
+
+    if lesson_id not in get_snapshot()["lessons"]:
+        return error_response("Lesson not found", 404)
+
+    created = mark_lesson_complete(session_id, lesson_id)
+    return success_response(
+        "Lesson marked as complete" if created else "Lesson already completed",
+        {"session_id": session_id, "lesson_id": lesson_id},
+        201 if created else 200
+    )
+
 
 @user_bp.route("/quiz-score", methods=["POST"])
+@admission_controlled
 def submit_quiz_score():
     """
-    Logs a quiz attempt.
+    Grades and logs a quiz attempt.
     **Expected JSON:**
     - session_id (str)
     - quiz_id (int)
-    - score (int)
-    - total (int)
+    - answers (list) - the selected options, as {"option_id": int} or bare option ids, each once;
+      scored against all of the quiz's correct options
+    **Optional header:**
+    - Idempotency-Key (str) - a retry with the same key gets the first response back
+      (with Idempotent-Replayed: true) and logs nothing
     """
     data = request.get_json()
     session_id = data.get("session_id")
     quiz_id = data.get("quiz_id")
     answers = data.get("answers")
 
-    if not all([session_id, quiz_id]) or not isinstance(answers, list):
+    if not all([session_id, quiz_id]) or not isinstance(answers, list) or not answers:
         return error_response("Missing one or more required fields", 400)
 
-    attempt = log_quiz_attempt(session_id, quiz_id, answers)
+    if not isinstance(quiz_id, int):
+        return error_response("quiz_id must be an integer", 400)
+
+    option_ids = [answer.get("option_id") if isinstance(answer, dict) else answer for answer in answers]
+    if not all(isinstance(option_id, int) for option_id in option_ids):
+        return error_response("Each answer needs an integer option_id", 400)
+
+    key = request.headers.get("Idempotency-Key")
+    if key is not None and not 0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH:
+        return error_response(f"Idempotency-Key must be 1 to {MAX_IDEMPOTENCY_KEY_LENGTH} characters", 400)
 
-    percentage = round((attempt.score / attempt.total) * 100)
+    store, scoped_key, request_fingerprint = None, None, None
+    if key:
+        store = get_idempotency_store()
+        scoped_key, request_fingerprint = f"{session_id}:{key}", fingerprint(quiz_id, option_ids)
+        try:
+            entry = store.begin(scoped_key, request_fingerprint)
+        except IdempotencyMismatch as e:
+            return error_response(str(e), 422)
+        except IdempotencyConflict as e:
+            response, status = error_response(str(e), 409)
+            response.headers["Retry-After"] = "1"
+            return response, status
+        if entry:
+            response, status = _attempt_response(entry)
+            response.headers["Idempotent-Replayed"] = "true"
+            return response, status
 
+    try:
+        attempt = log_quiz_attempt(session_id, quiz_id, option_ids, scoped_key, request_fingerprint)
+    except Exception as e:
+        # Nothing was logged: release the key so a retry is processed normally
+        if store:
+            store.abort(scoped_key)
+        if isinstance(e, InvalidAnswers):
+            return error_response(str(e), 400)
+        if isinstance(e, IngestQueueFull):
+            response, status = error_response(str(e), 503)
+            response.headers["Retry-After"] = "1"
+            return response, status
+        raise
+    if not attempt:
+        if store:
+            store.abort(scoped_key)
+        return error_response("Quiz not found", 404)
+
+    entry = {"session_id": attempt.session_id, "quiz_id": attempt.quiz_id, "score": attempt.score, "total": attempt.total}
+    if store:
+        store.complete(scoped_key, request_fingerprint, entry)
+    return _attempt_response(entry)
+
+
+def _attempt_response(entry):
     return success_response("Quiz attempt logged", {
-        "attempt": {
-            "session_id": attempt.session_id,
-            "quiz_id": attempt.quiz_id,
-            "score": attempt.score,
-            "total": attempt.total,
-            "percentage": percentage
-        }
+        "attempt": {**entry, "percentage": round((entry["score"] / entry["total"]) * 100)}
     })
 
 
 @user_bp.route("/quiz-score", methods=["GET"])
 def get_quiz_score():
     """
-    Gets the most recent quiz score for a session.
+    Gets the most recent quiz score for a session, with its best score at the quiz.
     Query params:
     - session_id (str)
     - quiz_id (int)
@@ -55,16 +142,132 @@ def get_quiz_score():
     if not session_id or not quiz_id:
         return error_response("Missing session_id or quiz_id", 400)
 
-    attempt = QuizAttempt.query.filter_by(session_id=session_id, quiz_id=quiz_id).order_by(QuizAttempt.attempted_at.desc()).first()
+    if not quiz_id.isdigit():
+        return error_response("quiz_id must be an integer", 400)
 
-    if not attempt:
+    latest = get_latest_attempt(session_id, int(quiz_id))
+
+    if not latest:
         return error_response("No attempt found", 404)
 
-    percentage = round((attempt.score / attempt.total) * 100)
+    score = latest.to_dict()
+    del score["quiz_id"]
+    return success_response("Quiz score retrieved", score)
+
+
+@user_bp.route("/quiz-scores", methods=["GET"])
+def get_quiz_scores():
+    """
+    Gets the latest and best score of a session for every quiz it has attempted.
+    Query params:
+    - session_id (str)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
 
-    return success_response("Quiz score retrieved", {
-        "score": attempt.score,
-        "total": attempt.total,
-        "percentage": percentage,
-        "timestamp": attempt.attempted_at.isoformat()
+    return success_response("Quiz scores retrieved", {
+        "scores": [latest.to_dict() for latest in get_session_scores(session_id)]
     })
+
+
+@user_bp.route("/next-quizzes", methods=["GET"])
+def get_next_quizzes():
+    """
+    Quizzes a session should do next: spaced-repetition reviews that are due, then new quizzes,
+    easiest first by calibrated difficulty (uncalibrated quizzes count as average).
+    Query params:
+    - session_id (str)
+    - limit (int, optional, default 10, max 50)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    limit = min(max(request.args.get("limit", 10, type=int), 1), 50)
+    quizzes = get_snapshot()["quizzes"]
+    by_difficulty = sorted(quizzes, key=lambda quiz_id: quizzes[quiz_id]["difficulty"] or 0.0)
+    quiz_ids, next_review_at = next_quizzes(session_id, by_difficulty, limit=limit)
+
+    return success_response("Next quizzes retrieved", {
+        "quizzes": [quizzes[quiz_id] for quiz_id in quiz_ids],
+        "next_review_at": next_review_at.isoformat() if next_review_at else None
+    })
+
+
+@user_bp.route("/accuracy", methods=["GET"])
+def get_accuracy():
+    """
+    A session's answer accuracy per vowel.
+    Query params:
+    - session_id (str)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    return success_response("Accuracy retrieved", {"vowels": get_vowel_accuracy(session_id)})
+
+
+@user_bp.route("/accuracy/words", methods=["GET"])
+def get_word_accuracy_route():
+    """
+    A session's answer accuracy per prompt word, least accurate first.
+    Query params:
+    - session_id (str)
+    - vowel_id (str, optional)
+    - limit (int, optional, default 50, max 500)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    limit = min(max(request.args.get("limit", 50, type=int), 1), 500)
+    words = get_word_accuracy(session_id, vowel_id=request.args.get("vowel_id"), limit=limit)
+    return success_response("Word accuracy retrieved", {"words": words})
+
+
+@user_bp.route("/confusion", methods=["GET"])
+def get_confusion_matrix():
+    """
+    Vowel confusion matrix: rows are the correct vowel, columns the vowel picked.
+    Query params:
+    - session_id (str, optional) - omit for the totals over all sessions
+    """
+    session_id = request.args.get("session_id")
+    return success_response("Confusion matrix retrieved", {
+        "session_id": session_id,
+        **get_matrix(session_id).to_dict()
+    })
+
+
+@user_bp.route("/recommendation", methods=["GET"])
+def get_lesson_recommendation():
+    """
+    The lesson a session should study next, based on the vowels it confuses most.
+    Query params:
+    - session_id (str)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    lesson, reason = recommend_lesson(session_id)
+    if not lesson:
+        return error_response("No lesson to recommend", 404)
+    return success_response("Lesson recommended", {"lesson": lesson, "reason": reason})
+
+
+@user_bp.route("/progress", methods=["GET"])
+def get_session_progress():
+    """
+    A session's progress dashboard: completed lessons, per-vowel mastery, streaks and
+    a daily learning curve.
+    Query params:
+    - session_id (str)
+    """
+    session_id = request.args.get("session_id")
+    if not session_id:
+        return error_response("Missing session_id", 400)
+
+    return success_response("Progress retrieved", get_progress(session_id))
@@ -4,21 +4,29 @@ from flask_migrate import Migrate
 
 from .api.blueprints import all_blueprints
 from .config import Config
-from .db import db
+from .db import db, init_db
+from .services.attempt_ingest import init_attempt_writer
+from .services.fulltext import ensure_fulltext_index
 # from src.models import lesson, phoneme
 
 migrate = Migrate()
 
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
 
-    db.init_app(app)
+    init_db(app)
     migrate.init_app(app, db)
 
     with app.app_context():
-        db.create_all()
+        # Every table lives on the default bind; the reader bind only reads the same database
+        db.create_all(bind_key=None)
+        ensure_fulltext_index()
+
+    init_attempt_writer(app)
 
     for bp in all_blueprints:
         app.register_blueprint(bp)
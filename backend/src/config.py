@@ -20,11 +20,112 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite profile: "production" runs a file database in WAL mode with these pragmas, one serialized
+    # writer connection (waited for up to SQLITE_WRITE_TIMEOUT seconds) and a read-only pool for GET
+    # requests; "default" (the default) keeps SQLite's stock settings and a single engine
+    SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "default")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))    # negative: KiB per connection
+    SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # milliseconds
+    SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+    SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", "10"))
+
+    # Content catalog: declarative content file plus the audio directories it is synced against
+    DATA_DIR = os.path.join(BASE_DIR, "data")
+    STATIC_DIR = os.path.join(BASE_DIR, "static")
+    CONTENT_FILE = os.getenv("CONTENT_FILE", os.path.join(DATA_DIR, "content.json"))
+    VOWEL_AUDIO_DIR = os.path.join(STATIC_DIR, "audio", "vowels")
+    WORD_AUDIO_DIR = os.path.join(STATIC_DIR, "audio", "word_examples")
+
+    # Spreadsheet importer (xlsx needs the optional openpyxl dependency)
+    EXCEL_INPUT = os.getenv("EXCEL_INPUT", os.path.join(DATA_DIR, "vowels.xlsx"))
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+    # Grapheme-to-phoneme: CMUdict-style source and its compiled, memory-mapped index
+    G2P_DICTIONARY = os.getenv("G2P_DICTIONARY", os.path.join(DATA_DIR, "pronunciations.dict"))
+    G2P_INDEX = os.getenv("G2P_INDEX", os.path.join(INSTANCE_DIR, "pronunciations.idx"))
+    G2P_MAX_BATCH = int(os.getenv("G2P_MAX_BATCH", "5000"))
+
+    # Admin routes (exports) require this token in X-Admin-Token; disabled when unset
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+    # Analytics exports: rows per read, output directory of scripts/export_analytics
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+    EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(INSTANCE_DIR, "exports"))
+
+    # Seconds between checks for content published by other processes
+    CONTENT_VERSION_CHECK_INTERVAL = float(os.getenv("CONTENT_VERSION_CHECK_INTERVAL", "1.0"))
+
+    # Write-behind ingestion of quiz attempts: appended to a log of each serving process's own in
+    # ATTEMPT_LOG_DIR, stored in batches; batches that keep failing go to ATTEMPT_DEAD_LETTER_FILE.
+    # Off by default: each attempt is committed in its request
+    ATTEMPT_WRITE_BEHIND = os.getenv("ATTEMPT_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+    ATTEMPT_LOG_DIR = os.getenv("ATTEMPT_LOG_DIR", os.path.join(INSTANCE_DIR, "attempt_logs"))
+    ATTEMPT_QUEUE_SIZE = int(os.getenv("ATTEMPT_QUEUE_SIZE", "10000"))
+    ATTEMPT_BATCH_SIZE = int(os.getenv("ATTEMPT_BATCH_SIZE", "500"))
+    ATTEMPT_FLUSH_INTERVAL = float(os.getenv("ATTEMPT_FLUSH_INTERVAL", "0.2"))
+    ATTEMPT_MAX_RETRIES = int(os.getenv("ATTEMPT_MAX_RETRIES", "5"))
+    ATTEMPT_DEAD_LETTER_FILE = os.getenv("ATTEMPT_DEAD_LETTER_FILE",
+                                         os.path.join(INSTANCE_DIR, "attempt_dead_letter.jsonl"))
+
+    # Item-response calibration job: answers read per chunk, fit state kept for incremental refits
+    IRT_CHUNK_SIZE = int(os.getenv("IRT_CHUNK_SIZE", "200000"))
+    IRT_CHECKPOINT = os.getenv("IRT_CHECKPOINT", os.path.join(INSTANCE_DIR, "irt_checkpoint.npz"))
+
+    # Session ids known to exist, kept in memory so returning sessions cost no database round trip
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "100000"))
+    # Seconds a known session id is trusted before its row is confirmed again; keep it well under
+    # SESSION_TTL_DAYS, so sessions deleted by the retention job are registered again when they return
+    SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "3600"))
+
+    # Idempotency-Key support on POST /user/quiz-score: keys kept IDEMPOTENCY_TTL seconds, the latest
+    # IDEMPOTENCY_CACHE_SIZE in memory. The Bloom filter (off by default) spares the lookup for keys this
+    # process never saw; only safe with a single worker process
+    IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "100000"))
+    IDEMPOTENCY_BLOOM = os.getenv("IDEMPOTENCY_BLOOM", "false").lower() in ("1", "true", "yes")
+    IDEMPOTENCY_BLOOM_BITS = int(os.getenv("IDEMPOTENCY_BLOOM_BITS", str(8 * 1024 * 1024)))
+    IDEMPOTENCY_BLOOM_HASHES = int(os.getenv("IDEMPOTENCY_BLOOM_HASHES", "7"))
+
+    # Admission control on write routes: token buckets per session id and per client address (tokens per
+    # second, burst size), at most ADMISSION_MAX_CONCURRENT_WRITES handlers at once, each request waiting
+    # up to ADMISSION_WRITE_WAIT seconds for a slot; rejected with 429/503 and Retry-After. Off by default
+    ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "false").lower() in ("1", "true", "yes")
+    ADMISSION_SESSION_RATE = float(os.getenv("ADMISSION_SESSION_RATE", "5"))
+    ADMISSION_SESSION_BURST = float(os.getenv("ADMISSION_SESSION_BURST", "20"))
+    ADMISSION_IP_RATE = float(os.getenv("ADMISSION_IP_RATE", "50"))
+    ADMISSION_IP_BURST = float(os.getenv("ADMISSION_IP_BURST", "200"))
+    ADMISSION_MAX_BUCKETS = int(os.getenv("ADMISSION_MAX_BUCKETS", "100000"))
+    ADMISSION_MAX_CONCURRENT_WRITES = int(os.getenv("ADMISSION_MAX_CONCURRENT_WRITES", "8"))
+    ADMISSION_WRITE_WAIT = float(os.getenv("ADMISSION_WRITE_WAIT", "0.05"))
+
+    # Spaced repetition: per-session review queues kept in memory, reloaded after REVIEW_QUEUE_TTL seconds
+    REVIEW_QUEUE_CACHE_SIZE = int(os.getenv("REVIEW_QUEUE_CACHE_SIZE", "10000"))
+    REVIEW_QUEUE_TTL = float(os.getenv("REVIEW_QUEUE_TTL", "30"))
+
+    # Retention: raw attempts and answers older than RETENTION_DAYS are rolled up into daily stats and
+    # deleted; sessions idle for SESSION_TTL_DAYS (and in no cohort) are deleted, in small batches
+    RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "90"))
+    SESSION_TTL_DAYS = int(os.getenv("SESSION_TTL_DAYS", "180"))
+    RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+    RETENTION_PAUSE = float(os.getenv("RETENTION_PAUSE", "0.05"))
+
+    # Progress dashboards cached per session; recomputed once the session writes (via any worker) or after PROGRESS_TTL
+    PROGRESS_CACHE_SIZE = int(os.getenv("PROGRESS_CACHE_SIZE", "10000"))
+    PROGRESS_TTL = float(os.getenv("PROGRESS_TTL", "300"))
+
+    # Cohort reports: members split into partitions of COHORT_PARTITION_SIZE, which
+    # scripts/refresh_cohort_reports.py builds on a pool of COHORT_REPORT_WORKERS processes
+    COHORT_REPORT_WORKERS = int(os.getenv("COHORT_REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    COHORT_PARTITION_SIZE = int(os.getenv("COHORT_PARTITION_SIZE", "500"))
+    COHORT_REPORT_MAX_AGE = float(os.getenv("COHORT_REPORT_MAX_AGE", "3600"))
+
+    # Vowel confusion matrices kept in memory; reloaded from the database after CONFUSION_RELOAD_INTERVAL
+    CONFUSION_CACHE_SIZE = int(os.getenv("CONFUSION_CACHE_SIZE", "10000"))
+    CONFUSION_RELOAD_INTERVAL = float(os.getenv("CONFUSION_RELOAD_INTERVAL", "60"))
+
 
 # BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# DATA_DIR = os.path.join(BASE_DIR, "data")
-# AUDIO_DIR = os.path.join(DATA_DIR, "audio")
-# EXCEL_INPUT = os.path.join(DATA_DIR, "vowels.xlsx")
 # JSON_OUTPUT = os.path.join(DATA_DIR, "vowels.json")
 # DEFAULT_LANGUAGE = "en"
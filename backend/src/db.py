@@ -1,4 +1,158 @@
 # src/db.py
+from contextlib import contextmanager
+
+from flask import has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.sql.elements import TextClause
+
+READER = "reader"
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+WRITE_VERBS = frozenset({"INSERT", "UPDATE", "DELETE", "REPLACE", "CREATE", "DROP", "ALTER"})
+
+
+def _is_write(statement):
+    if getattr(statement, "is_dml", False):
+        return True
+    if isinstance(statement, TextClause):
+        words = statement.text.split(None, 1)
+        return bool(words) and words[0].upper() in WRITE_VERBS
+    return False
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to the read-only pool (the "reader" bind) during GET requests and inside
+    reading(). Flushes and insert/update/delete statements, however they are executed, go to
+    the default bind, the writer; so does everything after them in the same transaction, so
+    a transaction reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_routed() and not self._writes_pending(clause):
+            reader = self._db.engines.get(READER)
+            if reader is not None:
+                return reader
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_routed(self):
+        if self.info.get("reading"):
+            return True
+        return has_request_context() and request.method in READ_METHODS
+
+    def _writes_pending(self, clause):
+        if self._flushing or _is_write(clause):
+            self.info["writes"] = True
+        return self.info.get("writes", False)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_write(orm_execute_state):
+    # Runs before the bind is chosen, including for ORM bulk inserts, which only pass a mapper
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete \
+            or _is_write(orm_execute_state.statement):
+        orm_execute_state.session.info["writes"] = True
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _mark_flush(session, flush_context, instances):
+    session.info["writes"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _clear_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writes", None)
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+
+@contextmanager
+def reading():
+    """
+    Routes the session's reads to the read-only pool for the duration, e.g. for a long
+    read in a background job, or the cache loads and lookups a POST request makes before it
+    writes, which should not hold the writer connection. Once the transaction has written,
+    reads stay on the writer.
+    """
+    previous = db.session.info.get("reading", False)
+    db.session.info["reading"] = True
+    try:
+        yield
+    finally:
+        db.session.info["reading"] = previous
+
+
+def read_engine():
+    """
+    The read-only engine when the production profile is on, else the default engine.
+    """
+    return db.engines.get(READER, db.engine)
+
+
+def _sqlite_file(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _pragmas(config, read_only):
+    pragmas = [
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA mmap_size = {config['SQLITE_MMAP_SIZE']}",
+        f"PRAGMA cache_size = {config['SQLITE_CACHE_SIZE']}",
+        f"PRAGMA busy_timeout = {config['SQLITE_BUSY_TIMEOUT']}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        # Persistent in the database file; the writer sets it so readers never open it first
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+
+def _on_connect(pragmas):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+    return set_pragmas
+
+
+def init_db(app):
+    """
+    Sets up Flask-SQLAlchemy. With SQLITE_PROFILE=production and a file database, the
+    default engine becomes a single writer connection (a pool of one, so writes queue up
+    in the pool instead of contending for the database lock) and a "reader" bind is added:
+    a pool of read-only connections for GET requests. WAL mode lets those readers run
+    alongside the writer without waiting on it.
+    """
+    config = app.config
+    production = config.get("SQLITE_PROFILE") == "production" and _sqlite_file(config["SQLALCHEMY_DATABASE_URI"])
+    if production:
+        config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+            "pool_size": 1,
+            "max_overflow": 0,
+            "pool_timeout": config["SQLITE_WRITE_TIMEOUT"],
+            **config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        }
+        config["SQLALCHEMY_BINDS"] = {
+            READER: {
+                "url": config["SQLALCHEMY_DATABASE_URI"],
+                "pool_size": config["SQLITE_READ_POOL_SIZE"],
+                "max_overflow": config["SQLITE_READ_POOL_SIZE"],
+            },
+            **config.get("SQLALCHEMY_BINDS", {}),
+        }
+
+    db.init_app(app)
 
-db = SQLAlchemy()
+    if production:
+        with app.app_context():
+            for key, engine in db.engines.items():
+                event.listen(engine, "connect", _on_connect(_pragmas(config, read_only=key == READER)))
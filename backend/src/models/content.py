@@ -0,0 +1,54 @@
+# src/models/content.py
+
+from datetime import datetime
+
+from src.db import db
+
+
+class ContentRelease(db.Model):
+    """
+    One row per live content version. The highest id is the version readers are served.
+    """
+    __tablename__ = "content_releases"
+
+    id = db.Column(db.Integer, primary_key=True)
+    note = db.Column(db.String, nullable=True)
+    change_count = db.Column(db.Integer, nullable=False, default=0)
+    published_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "version": self.id,
+            "note": self.note,
+            "change_count": self.change_count,
+            "published_at": self.published_at.isoformat() if self.published_at else None
+        }
+
+    def __repr__(self):
+        return f"<ContentRelease version={self.id} changes={self.change_count}>"
+
+
+class ContentDraft(db.Model):
+    """
+    A staged edit waiting for the next publish. Later edits of the same target replace earlier ones.
+    """
+    __tablename__ = "content_drafts"
+    __table_args__ = (db.UniqueConstraint("kind", "target_id", name="uq_content_drafts_target"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String, nullable=False)
+    target_id = db.Column(db.String, nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    staged_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "target_id": self.target_id,
+            "payload": self.payload,
+            "staged_at": self.staged_at.isoformat() if self.staged_at else None
+        }
+
+    def __repr__(self):
+        return f"<ContentDraft kind='{self.kind}' target_id='{self.target_id}'>"
@@ -40,7 +40,7 @@ class WordExample(db.Model):
     __tablename__ = "word_examples"
 
     id = db.Column(db.Integer, primary_key=True)
-    word = db.Column(db.String, nullable=False)
+    word = db.Column(db.String, nullable=False, index=True)
     audio_url = db.Column(db.String, nullable=False)
     ipa = db.Column(db.String, nullable=True)
     example_sentence = db.Column(db.String, nullable=True)
@@ -72,20 +72,61 @@ class WordExample(db.Model):
 # #         return f"<ColorMapPosition x={self.x}, y={self.y}, region='{self.region}'>"
 
 
-# # class ComparisonPair(db.Model):
-# #     __tablename__ = "comparison_pairs"
-# #
-# #     id = db.Column(db.Integer, primary_key=True)
-# #     contrast_with = db.Column(db.String, nullable=False)
-# #     word_a = db.Column(db.String, nullable=False)
-# #     word_b = db.Column(db.String, nullable=False)
-# #     audio_url_a = db.Column(db.String, nullable=False)
-# #     audio_url_b = db.Column(db.String, nullable=False)
-# #     note = db.Column(db.String, nullable=True)
-# #     vowel_id = db.Column(db.String, db.ForeignKey("vowels.id"))
-# #
-# #     def __repr__(self):
-# #         return (
-# #             f"<ComparisonPair contrast_with='{self.contrast_with}', "
-# #             f"word_a='{self.word_a}', word_b='{self.word_b}'>"
-# #         )
+class WordSkeleton(db.Model):
+    """
+    A word example's phonemes with the vowel slot masked ("b _ t" for bit, bet, bat...).
+    Word examples sharing a skeleton but not a vowel are minimal pairs. word, vowel_id and
+    audio_url are copied from the example so stale rows can be found with a single join.
+    """
+    __tablename__ = "word_skeletons"
+
+    word_example_id = db.Column(db.Integer, db.ForeignKey("word_examples.id", ondelete="CASCADE"), primary_key=True)
+    skeleton = db.Column(db.String, nullable=True, index=True)
+    slot = db.Column(db.Integer, nullable=True)
+    word = db.Column(db.String, nullable=False)
+    vowel_id = db.Column(db.String, nullable=False)
+    audio_url = db.Column(db.String, nullable=False)
+
+    def __repr__(self):
+        return f"<WordSkeleton word='{self.word}' skeleton='{self.skeleton}'>"
+
+
+class ComparisonPair(db.Model):
+    """
+    A minimal pair of word examples. Stored once per pair, with vowel_id < contrast_with.
+    """
+    __tablename__ = "comparison_pairs"
+    __table_args__ = (
+        db.UniqueConstraint("word_example_a_id", "word_example_b_id", name="uq_comparison_pairs_examples"),
+        db.Index("ix_comparison_pairs_vowels", "vowel_id", "contrast_with"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    contrast_with = db.Column(db.String, nullable=False)
+    word_a = db.Column(db.String, nullable=False)
+    word_b = db.Column(db.String, nullable=False)
+    audio_url_a = db.Column(db.String, nullable=False)
+    audio_url_b = db.Column(db.String, nullable=False)
+    note = db.Column(db.String, nullable=True)
+    vowel_id = db.Column(db.String, db.ForeignKey("vowels.id"))
+    word_example_a_id = db.Column(db.Integer, db.ForeignKey("word_examples.id", ondelete="CASCADE"), nullable=False)
+    word_example_b_id = db.Column(db.Integer, db.ForeignKey("word_examples.id", ondelete="CASCADE"), nullable=False)
+    skeleton = db.Column(db.String, nullable=False)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "vowel_id": self.vowel_id,
+            "contrast_with": self.contrast_with,
+            "word_a": self.word_a,
+            "word_b": self.word_b,
+            "audio_url_a": self.audio_url_a,
+            "audio_url_b": self.audio_url_b,
+            "note": self.note
+        }
+
+    def __repr__(self):
+        return (
+            f"<ComparisonPair contrast_with='{self.contrast_with}', "
+            f"word_a='{self.word_a}', word_b='{self.word_b}'>"
+        )
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from src.db import db
 
 
@@ -15,14 +17,20 @@ class QuizItem(db.Model):
 
     # Relationships
     options = db.relationship("QuizOption", backref="quiz_item", cascade="all, delete-orphan", lazy=True)
+    calibration = db.relationship("QuizCalibration", uselist=False, cascade="all, delete-orphan", lazy=True)
 
-    def to_dict(self):
+    def to_dict(self, include_answers=False):
+        """
+        Answer flags are left out unless asked for; learners' answers are graded server-side.
+        """
         return {
             "id": self.id,
             "prompt_word": self.prompt_word,
             "prompt_ipa": self.prompt_ipa,
             "prompt_audio_url": self.prompt_audio_url,
-            "options": [opt.to_dict() for opt in self.options],
+            "options": [opt.to_dict(include_answers) for opt in self.options],
+            "difficulty": self.calibration.difficulty if self.calibration else None,
+            "discrimination": self.calibration.discrimination if self.calibration else None,
         }
 
     def __repr__(self):
@@ -37,17 +45,38 @@ class QuizOption(db.Model):
     ipa = db.Column(db.String, nullable=False)
     audio_url = db.Column(db.String, nullable=False)
     is_correct = db.Column(db.Boolean, default=False)
+    # The vowel of the option's own word, for the confusion matrix; never shown to learners
+    vowel_id = db.Column(db.String, nullable=True)
 
     quiz_item_id = db.Column(db.Integer, db.ForeignKey("quiz_items.id"), nullable=False)
 
-    def to_dict(self):
-        return {
+    def to_dict(self, include_answers=False):
+        data = {
             "id": self.id,
             "word": self.word,
             "ipa": self.ipa,
-            "audio_url": self.audio_url,
-            "is_correct": self.is_correct
+            "audio_url": self.audio_url
         }
+        if include_answers:
+            data["is_correct"] = self.is_correct
+        return data
 
     def __repr__(self):
         return f"<QuizOption word='{self.word}' ipa='{self.ipa}' correct={self.is_correct}>"
+
+
+class QuizCalibration(db.Model):
+    """
+    Item-response parameters of a quiz, written by the calibration job.
+    """
+    __tablename__ = "quiz_calibrations"
+
+    quiz_item_id = db.Column(db.Integer, db.ForeignKey("quiz_items.id"), primary_key=True)
+    model = db.Column(db.String, nullable=False)
+    difficulty = db.Column(db.Float, nullable=False)
+    discrimination = db.Column(db.Float, nullable=False)
+    answers = db.Column(db.Integer, nullable=False)
+    calibrated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<QuizCalibration quiz={self.quiz_item_id} b={self.difficulty:.2f} a={self.discrimination:.2f}>"
@@ -19,13 +19,17 @@ class CompletedLesson(db.Model):
     __tablename__ = "completed_lessons"
 
     id = db.Column(db.Integer, primary_key=True)
-    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"))
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), index=True)
     lesson_id = db.Column(db.Integer, nullable=False)
     completed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
 class QuizAttempt(db.Model):
     __tablename__ = "quiz_attempts"
+    __table_args__ = (
+        db.Index("ix_quiz_attempts_session_quiz_time", "session_id", "quiz_id", "attempted_at"),
+        db.Index("ix_quiz_attempts_session_time", "session_id", "attempted_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"))
@@ -35,29 +39,230 @@ class QuizAttempt(db.Model):
     attempted_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
-# class QuizLog(Base):
-#     __tablename__ = "quiz_logs"
+class LatestQuizScore(db.Model):
+    """
+    The latest and the best attempt of one session at one quiz, kept up to date as attempts
+    are stored so score lookups never read the attempt history.
+    """
+    __tablename__ = "latest_quiz_scores"
+
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), primary_key=True)
+    quiz_id = db.Column(db.Integer, primary_key=True)
+    score = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Integer, nullable=False)
+    attempted_at = db.Column(db.DateTime, nullable=False)
+    best_score = db.Column(db.Integer, nullable=False)
+    best_total = db.Column(db.Integer, nullable=False)
+    best_at = db.Column(db.DateTime, nullable=False)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "quiz_id": self.quiz_id,
+            "score": self.score,
+            "total": self.total,
+            "percentage": round(self.score / self.total * 100) if self.total else 0,
+            "timestamp": self.attempted_at.isoformat(),
+            "best": {
+                "score": self.best_score,
+                "total": self.best_total,
+                "percentage": round(self.best_score / self.best_total * 100) if self.best_total else 0,
+                "timestamp": self.best_at.isoformat(),
+            },
+            "attempts": self.attempts,
+        }
+
+
+class IdempotencyKey(db.Model):
+    """
+    The outcome of a quiz score submission sent with an Idempotency-Key, so a retry gets the
+    same response instead of logging the attempt again. Stored with the attempt itself.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = db.Column(db.String, primary_key=True)   # "<session_id>:<Idempotency-Key>"
+    fingerprint = db.Column(db.String, nullable=False)
+    session_id = db.Column(db.String, nullable=False)
+    quiz_id = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Integer, nullable=False)
+    total = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def to_entry(self):
+        return {"session_id": self.session_id, "quiz_id": self.quiz_id, "score": self.score, "total": self.total}
+
+
+class IngestCheckpoint(db.Model):
+    """
+    Highest write-ahead log sequence number already stored, committed together with the rows
+    it covers so a replay after a crash never inserts an attempt twice.
+    """
+    __tablename__ = "ingest_checkpoints"
+
+    name = db.Column(db.String, primary_key=True)
+    seq = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ReviewState(db.Model):
+    """
+    Spaced-repetition state of one quiz for one session (SM-2). One small row per pair:
+    the next review time is all a scheduling decision needs, never the attempt history.
+    """
+    __tablename__ = "review_states"
+    __table_args__ = (db.Index("ix_review_states_session_due", "session_id", "due_at"),)
+
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), primary_key=True)
+    quiz_id = db.Column(db.Integer, primary_key=True)
+    repetitions = db.Column(db.Integer, nullable=False, default=0)
+    ease = db.Column(db.Float, nullable=False, default=2.5)
+    interval = db.Column(db.Float, nullable=False, default=0.0)  # days
+    due_at = db.Column(db.DateTime, nullable=False)
+    reviewed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class QuizLog(db.Model):
+    """
+    One submitted answer. Append-only: rows are written in batches and never updated.
+    """
+    __tablename__ = "quiz_logs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"))
+    quiz_id = db.Column(db.Integer, nullable=False)
+    question_index = db.Column(db.Integer, nullable=False)
+    question_text = db.Column(db.String)
+    selected_option = db.Column(db.Integer)
+    correct_option = db.Column(db.Integer)
+    is_correct = db.Column(db.Boolean)
+    answered_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class VowelStat(db.Model):
+    """
+    Running answer counts of one session for one vowel, updated with every stored batch.
+    """
+    __tablename__ = "vowel_stats"
+    __table_args__ = (db.UniqueConstraint("session_id", "vowel", name="uq_vowel_stats_session_vowel"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), nullable=False)
+    vowel = db.Column(db.String, nullable=False)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    incorrect = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "vowel_id": self.vowel,
+            "correct": self.correct,
+            "incorrect": self.incorrect,
+            "accuracy": round(self.correct / (self.correct + self.incorrect), 4) if self.correct + self.incorrect else None
+        }
+
+
+class WordStat(db.Model):
+    """
+    Running answer counts of one session for one prompt word.
+    """
+    __tablename__ = "word_stats"
+    __table_args__ = (db.UniqueConstraint("session_id", "word", name="uq_word_stats_session_word"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), nullable=False)
+    word = db.Column(db.String, nullable=False)
+    vowel = db.Column(db.String, nullable=True)
+    correct = db.Column(db.Integer, nullable=False, default=0)
+    incorrect = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            "word": self.word,
+            "vowel_id": self.vowel,
+            "correct": self.correct,
+            "incorrect": self.incorrect,
+            "accuracy": round(self.correct / (self.correct + self.incorrect), 4) if self.correct + self.incorrect else None
+        }
+
+
+class VowelConfusion(db.Model):
+    """
+    How often a vowel was picked when another (or the same) vowel was correct.
+    Rows with an empty session_id hold the totals over all sessions.
+    """
+    __tablename__ = "vowel_confusions"
+    __table_args__ = (
+        db.UniqueConstraint("session_id", "correct_vowel", "selected_vowel", name="uq_vowel_confusions_cell"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String, nullable=False)
+    correct_vowel = db.Column(db.String, nullable=False)
+    selected_vowel = db.Column(db.String, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Cohort(db.Model):
+    """
+    A class of learners, identified by their session ids.
+    """
+    __tablename__ = "cohorts"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String, unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    members = db.relationship("CohortMember", backref="cohort", cascade="all, delete-orphan", lazy=True)
+    report = db.relationship("CohortReport", uselist=False, cascade="all, delete-orphan", lazy=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "members": len(self.members),
+            "report_generated_at": self.report.generated_at.isoformat() if self.report else None,
+        }
+
+
+class CohortMember(db.Model):
+    __tablename__ = "cohort_members"
+
+    cohort_id = db.Column(db.Integer, db.ForeignKey("cohorts.id"), primary_key=True)
+    session_id = db.Column(db.String, db.ForeignKey("user_sessions.session_id"), primary_key=True, index=True)
+    joined_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class CohortReport(db.Model):
+    """
+    The latest precomputed report of a cohort, stored as a JSON blob.
+    """
+    __tablename__ = "cohort_reports"
+
+    cohort_id = db.Column(db.Integer, db.ForeignKey("cohorts.id"), primary_key=True)
+    report = db.Column(db.Text, nullable=False)
+    generated_at = db.Column(db.DateTime, nullable=False)
+    duration = db.Column(db.Float)  # seconds
 
-#     id = Column(Integer, primary_key=True)
-#     session_id = Column(String, ForeignKey("user_sessions.session_id"))
-#     question_index = Column(Integer, nullable=False)
-#     question_text = Column(String)
-#     selected_option = Column(String)
-#     correct_option = Column(String)
-#     is_correct = Column(Boolean)
 
-#     # Relationships
-#     session = relationship("UserSession", back_populates="quiz_logs")
+class DailyQuizStat(db.Model):
+    """
+    Attempts of one day at one quiz, rolled up from quiz_attempts once they pass retention.
+    """
+    __tablename__ = "daily_quiz_stats"
 
+    day = db.Column(db.Date, primary_key=True)
+    quiz_id = db.Column(db.Integer, primary_key=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
 
-# class VowelStat(Base):
-#     __tablename__ = "vowel_stats"
 
-#     id = Column(Integer, primary_key=True)
-#     session_id = Column(String, ForeignKey("user_sessions.session_id"))
-#     vowel = Column(String, nullable=False)
-#     correct = Column(Integer, default=0)
-#     incorrect = Column(Integer, default=0)
+class DailyVowelStat(db.Model):
+    """
+    Attempts of one day at the quizzes of one vowel, rolled up with DailyQuizStat.
+    """
+    __tablename__ = "daily_vowel_stats"
 
-#     # Relationships
-#     session = relationship("UserSession", back_populates="vowel_stats")
+    day = db.Column(db.Date, primary_key=True)
+    vowel_id = db.Column(db.String, primary_key=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    total = db.Column(db.Integer, nullable=False, default=0)
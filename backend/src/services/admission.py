@@ -0,0 +1,153 @@
+# src/services/admission.py
+import functools
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from flask import current_app, request
+
+from src.utils.format import error_response
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, up to `burst`. Each admitted request takes one token.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate, burst, now):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def take(self, now):
+        """
+        Takes a token if there is one. Returns 0 when admitted, else the seconds until the
+        next token.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionControl:
+    """
+    Admission for write requests: a token bucket per session id and per client IP, then a
+    global limit on concurrently running write handlers. Rejections are decided without
+    waiting (beyond a short grace period for a write slot), so an overloaded writer is
+    answered with 429/503 straight away instead of piling up requests.
+    """
+
+    def __init__(self, config):
+        self.limits = {
+            "session": (config["ADMISSION_SESSION_RATE"], config["ADMISSION_SESSION_BURST"]),
+            "ip": (config["ADMISSION_IP_RATE"], config["ADMISSION_IP_BURST"]),
+        }
+        self.max_buckets = config["ADMISSION_MAX_BUCKETS"]
+        self.max_writes = config["ADMISSION_MAX_CONCURRENT_WRITES"]
+        self.write_wait = config["ADMISSION_WRITE_WAIT"]
+        self.buckets = OrderedDict()    # (kind, key) -> TokenBucket, least recently used first
+        self.slots = threading.BoundedSemaphore(self.max_writes)
+        self.counters = Counter()
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def _take(self, kind, key, now):
+        bucket = self.buckets.get((kind, key))
+        if bucket is None:
+            bucket = self.buckets[(kind, key)] = TokenBucket(*self.limits[kind], now)
+            # An evicted bucket was idle the longest; it would have refilled the most anyway
+            while len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end((kind, key))
+        return bucket.take(now)
+
+    def admit(self, session_id, ip):
+        """
+        Returns None when the request may run (it then holds a write slot until release()),
+        else (status, message, retry_after).
+        """
+        now = time.monotonic()
+        with self._lock:
+            for kind, key in (("session", session_id), ("ip", ip)):
+                if key is None:
+                    continue
+                wait = self._take(kind, key, now)
+                if wait:
+                    self.counters[f"rejected_{kind}"] += 1
+                    return 429, f"Too many requests for this {kind}", wait
+
+        if not self.slots.acquire(timeout=self.write_wait):
+            with self._lock:
+                self.counters["rejected_busy"] += 1
+            return 503, "Too many writes in progress", 1.0
+        with self._lock:
+            self.counters["admitted"] += 1
+            self.in_flight += 1
+        return None
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "admitted": self.counters["admitted"],
+                "rejected_session": self.counters["rejected_session"],
+                "rejected_ip": self.counters["rejected_ip"],
+                "rejected_busy": self.counters["rejected_busy"],
+                "writes_in_flight": self.in_flight,
+                "max_concurrent_writes": self.max_writes,
+                "tracked_buckets": len(self.buckets),
+            }
+
+
+_admission = None
+_admission_lock = threading.Lock()
+
+
+def get_admission_control():
+    global _admission
+    if _admission is None:
+        with _admission_lock:
+            if _admission is None:
+                _admission = AdmissionControl(current_app.config)
+    return _admission
+
+
+def _rejected(status, message, retry_after):
+    response, status = error_response(message, status)
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response, status
+
+
+def admission_controlled(view):
+    """
+    Route decorator for write handlers: rate-limits by the session_id of the JSON body and
+    by client address, and bounds how many write handlers run at once. Answers 429 or 503
+    with Retry-After when a request is not admitted. Disabled with ADMISSION_CONTROL=false.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_app.config.get("ADMISSION_CONTROL", True):
+            return view(*args, **kwargs)
+        body = request.get_json(silent=True)
+        session_id = body.get("session_id") if isinstance(body, dict) else None
+        admission = get_admission_control()
+        rejection = admission.admit(session_id if isinstance(session_id, str) else None, request.remote_addr)
+        if rejection:
+            return _rejected(*rejection)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            admission.release()
+    return wrapper
@@ -0,0 +1,86 @@
+# src/services/answer_analytics.py
+from datetime import date, datetime, time, timedelta
+
+from src.db import db
+
+FETCH_SIZE = 10000
+
+ANSWERS_SQL = """
+    SELECT session_id, quiz_id, selected_option, correct_option, is_correct, answered_at
+    FROM quiz_logs
+    WHERE answered_at >= ? AND answered_at < ?
+    ORDER BY id
+"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Answer analytics requires numpy: pip install phonolab-backend[analytics]") from e
+    return numpy
+
+
+def _bound(value):
+    # Matches how SQLAlchemy stores DateTime in SQLite, so the range can use the answered_at index
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def load_answers(start, end=None):
+    """
+    Loads logged answers with start <= answered_at < end into NumPy column arrays.
+
+    start may be a date (end defaults to the following day) or a datetime. Rows are read
+    straight from the DB-API cursor in chunks; no ORM objects or per-row conversions are made.
+    Returns a dict of equally long arrays:
+    - session: int32 codes into `sessions` (the distinct session ids)
+    - quiz_id, selected_option, correct_option: int32 (-1 where missing)
+    - is_correct: bool
+    - answered_at: datetime64[us]
+    """
+    np = _numpy()
+    if isinstance(start, date) and not isinstance(start, datetime):
+        start = datetime.combine(start, time.min)
+    end = end or start + timedelta(days=1)
+
+    columns = ([], [], [], [], [], [])
+    cursor = db.session.connection().exec_driver_sql(ANSWERS_SQL, (_bound(start), _bound(end)))
+    while True:
+        rows = cursor.fetchmany(FETCH_SIZE)
+        if not rows:
+            break
+        for column, values in zip(columns, zip(*rows)):
+            column.extend(values)
+
+    session_ids, quiz_ids, selected, correct, is_correct, answered_at = columns
+    sessions, session_codes = np.unique(np.array(session_ids, dtype=object).astype(str), return_inverse=True)
+
+    def ids(values):
+        return np.array([-1 if value is None else value for value in values], dtype=np.int32)
+
+    return {
+        "session": session_codes.astype(np.int32),
+        "sessions": sessions,
+        "quiz_id": np.array(quiz_ids, dtype=np.int32),
+        "selected_option": ids(selected),
+        "correct_option": ids(correct),
+        "is_correct": np.array(is_correct, dtype=bool),
+        "answered_at": np.array(answered_at, dtype="datetime64[us]"),
+    }
+
+
+def item_statistics(answers):
+    """
+    Classical item analysis per quiz: answer count and proportion correct (p-value).
+    Returns {quiz_id: {"answers": n, "p_value": p}}.
+    """
+    np = _numpy()
+    if not len(answers["quiz_id"]):
+        return {}
+    quiz_ids, codes = np.unique(answers["quiz_id"], return_inverse=True)
+    counts = np.bincount(codes)
+    correct = np.bincount(codes, weights=answers["is_correct"])
+    return {
+        int(quiz_id): {"answers": int(count), "p_value": round(float(hits / count), 4)}
+        for quiz_id, count, hits in zip(quiz_ids, counts, correct)
+    }
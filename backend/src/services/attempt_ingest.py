@@ -0,0 +1,472 @@
+# src/services/attempt_ingest.py
+import atexit
+import fcntl
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as upsert
+from sqlalchemy.exc import DisconnectionError, InterfaceError, OperationalError
+
+from src.db import db
+from src.models.user import IngestCheckpoint, QuizAttempt, QuizLog
+from src.services.confusion import save_confusions
+from src.services.idempotency import save_idempotency_keys, unseen_attempts
+from src.services.progress import invalidate_progress
+from src.services.review import save_review_states
+from src.services.scores import save_latest_scores
+from src.services.sessions import ensure_sessions
+from src.services.stats import update_counters
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 30.0
+
+
+class IngestQueueFull(RuntimeError):
+    pass
+
+
+def _encode(record):
+    return json.dumps(record, default=lambda value: value.isoformat(), separators=(",", ":")) + "\n"
+
+
+def _decode(line):
+    record = json.loads(line)
+    record["attempted_at"] = datetime.fromisoformat(record["attempted_at"])
+    if record.get("review"):
+        for field in ("due_at", "reviewed_at"):
+            record["review"][field] = datetime.fromisoformat(record["review"][field])
+    return record
+
+
+def store_attempts(records, checkpoint=None):
+    """
+    Inserts a batch of attempts and their per-answer log rows, updates latest scores and review
+    states, and adds them to the accuracy counters, in one transaction with one multi-row
+    statement per table. With a checkpoint name, the log's checkpoint is advanced in the same
+    transaction. Sessions seen for the first time are registered in the same transaction.
+
+    Attempts whose idempotency key is already stored (a retry handled by another worker, or
+    by this one before the first attempt was stored) are dropped; the check runs on the
+    writer, inside the transaction, so it sees every key committed before.
+    """
+    last_seq = records[-1].get("seq")
+    records = unseen_attempts(records)
+    if records:
+        _insert_attempts(records)
+    if checkpoint:
+        save_checkpoint(checkpoint, last_seq)
+    db.session.commit()
+    if records:
+        invalidate_progress(*{r["session_id"] for r in records})
+
+
+def _insert_attempts(records):
+    ensure_sessions([r["session_id"] for r in records])
+    db.session.execute(insert(QuizAttempt), [{
+        "session_id": r["session_id"],
+        "quiz_id": r["quiz_id"],
+        "score": r["score"],
+        "total": r["total"],
+        "attempted_at": r["attempted_at"],
+    } for r in records])
+
+    answers = [{
+        "session_id": r["session_id"],
+        "quiz_id": r["quiz_id"],
+        "question_index": index,
+        "question_text": r.get("question_text"),
+        "selected_option": selected,
+        "correct_option": correct,
+        "is_correct": is_correct,
+        "answered_at": r["attempted_at"],
+    } for r in records for index, (selected, correct, is_correct) in enumerate(r.get("answers", ()))]
+    if answers:
+        db.session.execute(insert(QuizLog), answers)
+
+    save_latest_scores(records)
+    save_review_states([r["review"] for r in records if r.get("review")])
+    update_counters(records)
+    save_confusions(records)
+    save_idempotency_keys(records)
+
+
+def save_checkpoint(checkpoint, seq):
+    """
+    Moves a log's checkpoint to seq, in the caller's transaction.
+    """
+    db.session.execute(
+        upsert(IngestCheckpoint)
+        .values(name=checkpoint, seq=seq)
+        .on_conflict_do_update(index_elements=["name"], set_={"seq": seq})
+    )
+
+
+def _append_locked(path, records):
+    # Several processes share the dead-letter file: append under an exclusive lock, fsynced
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        f.writelines(_encode(record) for record in records)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_dead_letters(path):
+    """
+    Stores the attempts of a dead-letter file one at a time and keeps only those that fail
+    again. Returns (stored, remaining).
+    """
+    if not os.path.exists(path):
+        return 0, 0
+    with open(path, "r+", encoding="utf-8") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        records = [_decode(line) for line in f if line.strip()]
+        failed = []
+        for record in records:
+            try:
+                store_attempts([record])
+            except Exception:
+                logger.exception("Storing dead-lettered quiz attempt %s failed again", record["seq"])
+                db.session.rollback()
+                failed.append(record)
+        f.seek(0)
+        f.truncate()
+        f.writelines(_encode(record) for record in failed)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(records) - len(failed), len(failed)
+
+
+def _lock_file(f):
+    # flock locks belong to the open file, so another process (or another open of the same
+    # file) cannot take the lock while this one holds it
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    # The file may have been replayed and unlinked between our open and the lock
+    try:
+        return os.fstat(f.fileno()).st_ino == os.stat(f.name).st_ino
+    except FileNotFoundError:
+        return False
+
+
+def replay_log(path, checkpoint, batch_size):
+    """
+    Stores the attempts of a log that are newer than its checkpoint. A torn last line (crash
+    mid-append) is ignored; it was never acknowledged. Returns the number stored.
+    """
+    stored_seq = db.session.scalar(select(IngestCheckpoint.seq).where(IngestCheckpoint.name == checkpoint)) or 0
+    replayed, batch = 0, []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = _decode(line)
+            except ValueError:
+                logger.warning("Skipping unreadable line in %s", path)
+                continue
+            if record["seq"] <= stored_seq:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                store_attempts(batch, checkpoint)
+                replayed += len(batch)
+                batch = []
+    if batch:
+        store_attempts(batch, checkpoint)
+        replayed += len(batch)
+    return replayed
+
+
+def _database_unavailable(error):
+    # Locked, unreachable or broken database: every attempt would fail the same way
+    return isinstance(error, (OperationalError, InterfaceError, DisconnectionError))
+
+
+def _drop_checkpoint(checkpoint):
+    db.session.execute(delete(IngestCheckpoint).where(IngestCheckpoint.name == checkpoint))
+    db.session.commit()
+
+
+class AttemptWriter:
+    """
+    Write-behind ingestion for quiz attempts.
+
+    submit() appends the attempt to this process's write-ahead log and queues it; a single
+    background thread stores queued attempts in multi-row inserts. Concurrent submits share
+    fsyncs: whichever gets to sync first covers every line written so far (group commit). Each process has a
+    log of its own in ATTEMPT_LOG_DIR, locked while the process runs and named after it, with
+    its own sequence numbers and checkpoint row (the log's file name). Each batch commits the
+    highest sequence number it contains, and the log is truncated whenever everything in it is
+    stored. On start, the writer replays the logs of processes that are gone (their lock is
+    free) and deletes them.
+
+    While the database as a whole is unavailable (locked, unreachable), a batch is retried with
+    backoff for as long as it takes; submits get IngestQueueFull once the queue is full. A batch
+    that fails for another reason ATTEMPT_MAX_RETRIES times is stored one attempt at a time,
+    and the attempts that fail on their own go to ATTEMPT_DEAD_LETTER_FILE
+    (scripts/replay_dead_letters.py stores them once the cause is fixed).
+    """
+
+    def __init__(self, app):
+        config = app.config
+        self.app = app
+        self.directory = config["ATTEMPT_LOG_DIR"]
+        self.checkpoint = f"attempts-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}.wal"
+        self.path = os.path.join(self.directory, self.checkpoint)
+        self.batch_size = config["ATTEMPT_BATCH_SIZE"]
+        self.flush_interval = config["ATTEMPT_FLUSH_INTERVAL"]
+        self.max_retries = config["ATTEMPT_MAX_RETRIES"]
+        self.dead_letter_path = config["ATTEMPT_DEAD_LETTER_FILE"]
+        self.queue = queue.Queue(maxsize=config["ATTEMPT_QUEUE_SIZE"])
+        self.pending = {}       # (session_id, quiz_id) -> latest attempt not yet stored
+        self.seq = 0            # last sequence number written to the log
+        self.stored_seq = 0     # last sequence number committed to the database
+        self.synced_seq = 0     # last sequence number fsynced to the log
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._log = None
+
+    # --- Startup ---
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        # The log only takes its .wal name once locked, so another writer's recover() cannot
+        # replay and delete it between the open and the lock
+        self._log = open(self.path + ".tmp", "a", encoding="utf-8")
+        _lock_file(self._log)
+        os.rename(self.path + ".tmp", self.path)
+        self._thread = threading.Thread(target=self._run, name="attempt-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def recover(self):
+        """
+        Replays and deletes the logs left by processes that are no longer running.
+        Returns the number of attempts stored.
+        """
+        replayed = 0
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if name == self.checkpoint or not name.endswith(".wal"):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                if not _lock_file(f):
+                    continue    # a running process's log
+                count = replay_log(path, name, self.batch_size)
+                os.remove(path)
+            _drop_checkpoint(name)
+            if count:
+                logger.info("Replayed %d quiz attempts from %s", count, path)
+            replayed += count
+        return replayed
+
+    # --- Request path ---
+
+    def submit(self, record):
+        """
+        Makes an attempt durable in the log and queues it for storage.
+        Raises IngestQueueFull when the writer is too far behind.
+        """
+        with self._lock:
+            if self.queue.full():
+                raise IngestQueueFull("Too many quiz attempts waiting to be stored")
+            self.seq += 1
+            record = {**record, "seq": self.seq}
+            self._log.write(_encode(record))
+            self._log.flush()
+            self.pending[(record["session_id"], record["quiz_id"])] = record
+            self.queue.put_nowait(record)
+        self._sync(record["seq"])
+        return record
+
+    def _sync(self, seq):
+        # Group commit: the fsync runs outside the submit lock, so submits keep appending while
+        # it runs; a submit whose line an earlier fsync already covered returns at once
+        with self._sync_lock:
+            if self.synced_seq >= seq:
+                return
+            with self._lock:
+                written = self.seq
+            os.fsync(self._log.fileno())
+            self.synced_seq = written
+
+    def latest_pending(self, session_id, quiz_id):
+        """
+        The newest attempt for a session and quiz that is acknowledged but not stored yet.
+        """
+        return self.pending.get((session_id, quiz_id))
+
+    def session_pending(self, session_id):
+        """
+        The newest not yet stored attempt per quiz for a session.
+        """
+        with self._lock:
+            return [record for (sid, _), record in self.pending.items() if sid == session_id]
+
+    # --- Background writer ---
+
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        """
+        Stores a batch, retrying until it is stored or dead-lettered. Returns False if the
+        writer is stopped first; the batch stays in the log and is replayed on the next start.
+        """
+        remaining, failures, delay = list(batch), 0, RETRY_DELAY
+        while True:
+            try:
+                with self.app.app_context():
+                    if failures < self.max_retries:
+                        store_attempts(remaining, self.checkpoint)
+                    else:
+                        self._dead_letter(remaining, batch[-1]["seq"])
+                break
+            except Exception as e:
+                self._rollback()
+                unavailable = _database_unavailable(e)
+                if unavailable:
+                    logger.warning("Database unavailable, retrying %d quiz attempts in %.0fs: %s",
+                                   len(remaining), delay, e)
+                else:
+                    failures += 1
+                    logger.exception("Storing %d quiz attempts failed (try %d of %d)", len(remaining), failures,
+                                     self.max_retries)
+            if self._stop.wait(delay):
+                return False
+            delay = min(delay * 2, MAX_RETRY_DELAY) if unavailable else RETRY_DELAY
+
+        with self._lock:
+            self.stored_seq = batch[-1]["seq"]
+            for record in batch:
+                key = (record["session_id"], record["quiz_id"])
+                if self.pending.get(key) is record:
+                    del self.pending[key]
+            if self.stored_seq == self.seq:
+                self._log.truncate(0)
+        return True
+
+    def _rollback(self):
+        try:
+            with self.app.app_context():
+                db.session.rollback()
+        except Exception:
+            logger.exception("Rolling back a failed attempt batch failed")
+
+    def _dead_letter(self, remaining, last_seq):
+        """
+        Stores a batch that keeps failing one attempt at a time, so one bad attempt cannot hold
+        up the rest; the attempts that still fail on their own are moved to the dead-letter
+        file. Attempts are taken off `remaining` as they are handled, so a retry after the
+        database went away resumes where this stopped.
+        """
+        while remaining:
+            try:
+                store_attempts([remaining[0]], self.checkpoint)
+            except Exception as e:
+                db.session.rollback()
+                if _database_unavailable(e):
+                    raise
+                _append_locked(self.dead_letter_path, [remaining[0]])
+                logger.error("Moved quiz attempt %d to %s", remaining[0]["seq"], self.dead_letter_path)
+            remaining.pop(0)
+        save_checkpoint(self.checkpoint, last_seq)
+        db.session.commit()
+
+    def _run(self):
+        try:
+            with self.app.app_context():
+                self.recover()
+        except Exception:
+            logger.exception("Replaying the attempt logs in %s failed", self.directory)
+        batch = []
+        while not (self._stop.is_set() and self.queue.empty() and not batch):
+            # Nothing may end this loop but stop(): a dead writer would leave every submit with a full queue
+            try:
+                batch = batch or self._next_batch()
+                if batch:
+                    if not self._write(batch):
+                        break
+                    batch = []
+            except Exception:
+                logger.exception("The attempt writer failed; retrying")
+                if self._stop.wait(RETRY_DELAY):
+                    break
+
+    def flush(self, timeout=None):
+        """
+        Blocks until everything submitted so far is stored, or timeout seconds pass.
+        """
+        target, waited = self.seq, 0.0
+        while self.stored_seq < target and (timeout is None or waited < timeout):
+            time.sleep(0.01)
+            waited += 0.01
+        return self.stored_seq >= target
+
+    def stop(self):
+        """
+        Drains the queue and stops the writer thread.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        done = self.stored_seq == self.seq
+        if done:
+            os.remove(self.path)
+        self._log.close()
+        if done:
+            with self.app.app_context():
+                _drop_checkpoint(self.checkpoint)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _start_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = AttemptWriter(current_app._get_current_object())
+                writer.start()
+                _writer = writer
+
+
+def init_attempt_writer(app):
+    """
+    With write-behind enabled, starts the writer with the first request the process serves.
+    Scripts and CLI commands build the app without serving requests, so they neither start
+    a writer nor touch the logs of running servers.
+    """
+    if app.config.get("ATTEMPT_WRITE_BEHIND"):
+        app.before_request(_start_writer)
+
+
+def get_attempt_writer():
+    return _writer
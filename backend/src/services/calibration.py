@@ -0,0 +1,274 @@
+# src/services/calibration.py
+import os
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db
+from src.models.quiz import QuizCalibration, QuizItem
+from src.services.content_cache import bump_content_version
+
+MODELS = ("1pl", "2pl")
+
+# Gaussian priors (MAP estimation) keep abilities and difficulties finite for learners and
+# quizzes with all answers right or all wrong, and pin down the scale of the latent trait.
+ABILITY_SD = 1.0
+DIFFICULTY_SD = 2.0
+DISCRIMINATION_SD = 0.5
+DISCRIMINATION_RANGE = (0.2, 4.0)
+MAX_STEP = 1.0
+
+ANSWERS_SQL = """
+    SELECT id, session_id, quiz_id, is_correct
+    FROM quiz_logs
+    WHERE id > ?
+    ORDER BY id
+"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Item calibration requires numpy: pip install phonolab-backend[analytics]") from e
+    return numpy
+
+
+class Calibration:
+    """
+    Sufficient statistics and fitted parameters of an item-response model.
+
+    Answers are kept as one row per (session, quiz) pair with the number of answers and of
+    right answers, so memory grows with the number of distinct pairs, not of answers.
+    Sessions and quizzes are addressed by dense codes into `sessions` and `quiz_ids`.
+    """
+
+    def __init__(self, np, model="2pl"):
+        self.np = np
+        self.model = model
+        self.last_id = 0
+        self.sessions = {}      # session id -> code
+        self.quiz_ids = {}      # quiz id -> code
+        self.pairs = np.zeros(0, dtype=np.int64)     # session code << 32 | quiz code, sorted
+        self.answered = np.zeros(0, dtype=np.float64)
+        self.right = np.zeros(0, dtype=np.float64)
+        self.ability = np.zeros(0)
+        self.difficulty = np.zeros(0)
+        self.discrimination = np.zeros(0)
+
+    # --- Loading ---
+
+    def add(self, rows):
+        """
+        Merges a chunk of (id, session_id, quiz_id, is_correct) rows into the pair counts.
+        """
+        np = self.np
+        ids, session_ids, quiz_ids, is_correct = zip(*rows)
+        sessions = np.fromiter(
+            (self.sessions.setdefault(s, len(self.sessions)) for s in session_ids), np.int64, len(rows)
+        )
+        quizzes = np.fromiter(
+            (self.quiz_ids.setdefault(q, len(self.quiz_ids)) for q in quiz_ids), np.int64, len(rows)
+        )
+        keys = np.concatenate([self.pairs, sessions << 32 | quizzes])
+        answered = np.concatenate([self.answered, np.ones(len(rows))])
+        right = np.concatenate([self.right, np.array(is_correct, dtype=np.float64)])
+
+        self.pairs, codes = np.unique(keys, return_inverse=True)
+        self.answered = np.bincount(codes, weights=answered)
+        self.right = np.bincount(codes, weights=right)
+        self.last_id = max(ids)
+
+    def _grow(self):
+        # Parameters for sessions and quizzes first seen in this load start at the prior mean
+        np = self.np
+        self.ability = np.concatenate([self.ability, np.zeros(len(self.sessions) - len(self.ability))])
+        self.difficulty = np.concatenate([self.difficulty, np.zeros(len(self.quiz_ids) - len(self.difficulty))])
+        self.discrimination = np.concatenate(
+            [self.discrimination, np.ones(len(self.quiz_ids) - len(self.discrimination))]
+        )
+
+    # --- Fitting ---
+
+    def fit(self, iterations=50, tolerance=1e-4):
+        """
+        Joint MAP estimation by alternating, vectorized Newton steps: abilities, then
+        difficulties, then (2PL only) discriminations, each from the diagonal of the Fisher
+        information. Per-parameter sums over answers are np.bincount calls.
+        Returns the number of iterations run.
+        """
+        np = self.np
+        self._grow()
+        if not len(self.pairs):
+            return 0
+        person = (self.pairs >> 32).astype(np.intp)
+        item = (self.pairs & 0xFFFFFFFF).astype(np.intp)
+        n, k = self.answered, self.right
+        sessions, quizzes = len(self.ability), len(self.difficulty)
+
+        def residuals():
+            a = self.discrimination[item]
+            p = 1.0 / (1.0 + np.exp(-a * (self.ability[person] - self.difficulty[item])))
+            return a, k - n * p, n * p * (1.0 - p)
+
+        def step(gradient, information):
+            return np.clip(gradient / information, -MAX_STEP, MAX_STEP)
+
+        for iteration in range(1, iterations + 1):
+            a, r, w = residuals()
+            change = step(
+                np.bincount(person, a * r, sessions) - self.ability / ABILITY_SD ** 2,
+                np.bincount(person, a * a * w, sessions) + 1 / ABILITY_SD ** 2,
+            )
+            self.ability += change
+            largest = np.abs(change).max()
+
+            a, r, w = residuals()
+            change = step(
+                -np.bincount(item, a * r, quizzes) - self.difficulty / DIFFICULTY_SD ** 2,
+                np.bincount(item, a * a * w, quizzes) + 1 / DIFFICULTY_SD ** 2,
+            )
+            self.difficulty += change
+            largest = max(largest, np.abs(change).max())
+
+            if self.model == "2pl":
+                a, r, w = residuals()
+                distance = self.ability[person] - self.difficulty[item]
+                change = step(
+                    np.bincount(item, distance * r, quizzes) - (self.discrimination - 1) / DISCRIMINATION_SD ** 2,
+                    np.bincount(item, distance * distance * w, quizzes) + 1 / DISCRIMINATION_SD ** 2,
+                )
+                self.discrimination = np.clip(self.discrimination + change, *DISCRIMINATION_RANGE)
+                largest = max(largest, np.abs(change).max())
+
+            if largest < tolerance:
+                break
+        return iteration
+
+    def parameters(self):
+        """
+        {quiz_id: (difficulty, discrimination, answers)} for every quiz with answers.
+        """
+        np = self.np
+        answers = np.bincount((self.pairs & 0xFFFFFFFF).astype(np.intp), self.answered, len(self.quiz_ids))
+        return {
+            quiz_id: (float(self.difficulty[code]), float(self.discrimination[code]), int(answers[code]))
+            for quiz_id, code in self.quiz_ids.items()
+        }
+
+    # --- Checkpoints ---
+
+    def save(self, path):
+        np = self.np
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                model=np.array(self.model),
+                last_id=np.array(self.last_id),
+                sessions=np.array(list(self.sessions), dtype=str),
+                quiz_ids=np.array(list(self.quiz_ids), dtype=np.int64),
+                pairs=self.pairs, answered=self.answered, right=self.right,
+                ability=self.ability, difficulty=self.difficulty, discrimination=self.discrimination,
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, np, path):
+        with np.load(path) as data:
+            calibration = cls(np, str(data["model"]))
+            calibration.last_id = int(data["last_id"])
+            calibration.sessions = {s: code for code, s in enumerate(data["sessions"].tolist())}
+            calibration.quiz_ids = {q: code for code, q in enumerate(data["quiz_ids"].tolist())}
+            for field in ("pairs", "answered", "right", "ability", "difficulty", "discrimination"):
+                setattr(calibration, field, data[field])
+        return calibration
+
+
+def load_new_answers(calibration, chunk_size):
+    """
+    Streams quiz_logs rows after the calibration's last seen id into it, chunk by chunk.
+    Returns the number of answers read.
+    """
+    count = 0
+    cursor = db.session.connection().exec_driver_sql(ANSWERS_SQL, (calibration.last_id,))
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        calibration.add(rows)
+        count += len(rows)
+    return count
+
+
+def save_parameters(calibration):
+    """
+    Upserts the fitted parameters into quiz_calibrations and publishes a content version,
+    so quiz snapshots pick up the new difficulties. Quizzes deleted since are skipped.
+    """
+    existing = set(db.session.scalars(select(QuizItem.id)))
+    now = datetime.utcnow()
+    rows = [
+        {
+            "quiz_item_id": quiz_id,
+            "model": calibration.model,
+            "difficulty": round(difficulty, 4),
+            "discrimination": round(discrimination, 4),
+            "answers": answers,
+            "calibrated_at": now,
+        }
+        for quiz_id, (difficulty, discrimination, answers) in calibration.parameters().items()
+        if quiz_id in existing
+    ]
+    if rows:
+        statement = insert(QuizCalibration)
+        statement = statement.on_conflict_do_update(
+            index_elements=["quiz_item_id"],
+            set_={column: statement.excluded[column]
+                  for column in ("model", "difficulty", "discrimination", "answers", "calibrated_at")},
+        )
+        db.session.execute(statement, rows)
+        bump_content_version(f"{calibration.model} calibration", len(rows))
+    db.session.commit()
+    return len(rows)
+
+
+def calibrate(model="2pl", full=False, iterations=50, checkpoint=None, chunk_size=None):
+    """
+    Fits item parameters from the answer log and writes them to quiz_calibrations.
+
+    Unless `full` is set (or the model changed), the previous run's checkpoint is loaded and
+    only answers logged since are read; the fit then starts from the previous parameters and
+    usually converges in a few iterations. Returns a summary dict.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}, expected one of {MODELS}")
+    np = _numpy()
+    checkpoint = checkpoint or current_app.config["IRT_CHECKPOINT"]
+    chunk_size = chunk_size or current_app.config["IRT_CHUNK_SIZE"]
+
+    calibration = None
+    if not full and os.path.exists(checkpoint):
+        calibration = Calibration.load(np, checkpoint)
+        if calibration.model != model:
+            calibration = None
+    incremental = calibration is not None
+    calibration = calibration or Calibration(np, model)
+
+    new_answers = load_new_answers(calibration, chunk_size)
+    db.session.rollback()   # end the read transaction before the fit
+    fitted = calibration.fit(iterations) if new_answers or not incremental else 0
+    quizzes = save_parameters(calibration) if fitted else 0
+    calibration.save(checkpoint)
+
+    return {
+        "model": model,
+        "incremental": incremental,
+        "new_answers": new_answers,
+        "sessions": len(calibration.sessions),
+        "quizzes": quizzes,
+        "iterations": fitted,
+        "last_id": calibration.last_id,
+    }
@@ -0,0 +1,275 @@
+# src/services/cohorts.py
+import json
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, create_engine, select, text
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.pool import NullPool
+
+from src.db import db, reading
+from src.models.user import Cohort, CohortMember, CohortReport
+from src.services.confusion import ConfusionMatrix
+from src.services.content_cache import get_snapshot
+from src.services.progress import MASTERY_ACCURACY, MASTERY_MIN_ANSWERS
+from src.services.sessions import ensure_sessions
+
+logger = logging.getLogger(__name__)
+
+# Per partition of member sessions. Each statement reads the precomputed per-session tables,
+# never the attempt history, with an IN list of at most COHORT_PARTITION_SIZE ids.
+VOWELS_SQL = text(
+    "SELECT session_id, vowel, correct, incorrect FROM vowel_stats WHERE session_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+SCORES_SQL = text(
+    "SELECT session_id, quiz_id, score, total, attempts, attempted_at FROM latest_quiz_scores WHERE session_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+CONFUSION_SQL = text("""
+    SELECT correct_vowel, selected_vowel, SUM(count) FROM vowel_confusions
+    WHERE session_id IN :ids
+    GROUP BY correct_vowel, selected_vowel
+""").bindparams(bindparam("ids", expanding=True))
+
+
+def create_cohort(name, session_ids=()):
+    """
+    Creates a cohort. Returns None if the name is taken.
+    """
+    if Cohort.query.filter_by(name=name).first():
+        return None
+    cohort = Cohort(name=name)
+    db.session.add(cohort)
+    db.session.flush()
+    add_members(cohort.id, session_ids, commit=False)
+    db.session.commit()
+    return cohort
+
+
+def add_members(cohort_id, session_ids, commit=True):
+    """
+    Adds sessions to a cohort, creating sessions not seen yet. Members already in it are kept.
+    Returns the number of new members.
+    """
+    session_ids = list(dict.fromkeys(session_ids))
+    if not session_ids:
+        return 0
+    ensure_sessions(session_ids)
+    # Through the connection, so the executemany reports how many rows were inserted
+    added = db.session.connection().execute(
+        insert(CohortMember.__table__).on_conflict_do_nothing(index_elements=["cohort_id", "session_id"]),
+        [{"cohort_id": cohort_id, "session_id": session_id, "joined_at": datetime.utcnow()}
+         for session_id in session_ids],
+    ).rowcount
+    if commit:
+        db.session.commit()
+    return added
+
+
+# --- Report partitions (run in worker processes) ---
+
+def _partition_report(database_uri, session_ids):
+    """
+    Aggregates one partition of a cohort with its own connection. Returns plain data
+    (picklable) for build_report to merge.
+    """
+    engine = create_engine(database_uri, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            params = {"ids": session_ids}
+            vowels = connection.execute(VOWELS_SQL, params).all()
+            scores = connection.execute(SCORES_SQL, params).all()
+            confusion = connection.execute(CONFUSION_SQL, params).all()
+    finally:
+        engine.dispose()
+
+    students = {session_id: {"vowels": {}, "quizzes": 0, "attempts": 0, "score": 0, "total": 0, "last_active": None}
+                for session_id in session_ids}
+    for session_id, vowel, correct, incorrect in vowels:
+        students[session_id]["vowels"][vowel] = (correct, incorrect)
+
+    items = {}
+    for session_id, quiz_id, score, total, attempts, attempted_at in scores:
+        student = students[session_id]
+        student["quizzes"] += 1
+        student["attempts"] += attempts
+        student["score"] += score
+        student["total"] += total
+        student["last_active"] = max(student["last_active"] or attempted_at, attempted_at)
+        item = items.setdefault(quiz_id, [0, 0, 0])
+        item[0] += 1
+        item[1] += score
+        item[2] += total
+
+    return students, items, [tuple(row) for row in confusion]
+
+
+def _partitions(session_ids, size):
+    return [session_ids[i:i + size] for i in range(0, len(session_ids), size)]
+
+
+def _run_partitions(session_ids, workers=1):
+    partitions = _partitions(session_ids, current_app.config["COHORT_PARTITION_SIZE"])
+    uri = db.engine.url.render_as_string(hide_password=False)
+    workers = min(workers, len(partitions))
+    if workers <= 1:
+        return [_partition_report(uri, partition) for partition in partitions]
+    # fork rather than spawn: spawned workers re-import the main module, and the scripts create
+    # the app at import. Only single-threaded callers (the refresh script) may ask for workers:
+    # forking a threaded server can leave the children stuck on locks held at fork time. A
+    # forked worker only runs _partition_report, on a connection of its own.
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+        return list(pool.map(_partition_report, [uri] * len(partitions), partitions))
+
+
+# --- Reports ---
+
+def _accuracy(correct, total):
+    return round(correct / total, 4) if total else None
+
+
+def build_report(cohort, workers=1):
+    """
+    Per-student mastery, item difficulty and class-wide vowel confusion for a cohort, its
+    partitions built on a pool of `workers` processes (in this process for 1).
+    """
+    session_ids = sorted(member.session_id for member in cohort.members)
+    students, items, confusion = {}, {}, ConfusionMatrix()
+    for part_students, part_items, part_confusion in _run_partitions(session_ids, workers):
+        students.update(part_students)
+        for quiz_id, (count, score, total) in part_items.items():
+            item = items.setdefault(quiz_id, [0, 0, 0])
+            item[0], item[1], item[2] = item[0] + count, item[1] + score, item[2] + total
+        for correct, selected, count in part_confusion:
+            confusion.add(correct, selected, count)
+
+    student_rows = []
+    for session_id in session_ids:
+        student = students.get(session_id, {})
+        vowels = student.get("vowels", {})
+        mastered = sorted(
+            vowel for vowel, (correct, incorrect) in vowels.items()
+            if correct + incorrect >= MASTERY_MIN_ANSWERS and correct / (correct + incorrect) >= MASTERY_ACCURACY
+        )
+        last_active = student.get("last_active")
+        student_rows.append({
+            "session_id": session_id,
+            "quizzes_attempted": student.get("quizzes", 0),
+            "attempts": student.get("attempts", 0),
+            "latest_accuracy": _accuracy(student.get("score", 0), student.get("total", 0)),
+            "vowels": {vowel: _accuracy(correct, correct + incorrect) for vowel, (correct, incorrect) in sorted(vowels.items())},
+            "mastered_vowels": mastered,
+            "last_active": str(last_active).replace(" ", "T") if last_active else None,
+        })
+
+    quizzes = get_snapshot()["quizzes"]
+    item_rows = sorted(
+        (
+            {
+                "quiz_id": quiz_id,
+                "prompt_word": quizzes.get(quiz_id, {}).get("prompt_word"),
+                "students": count,
+                "p_value": _accuracy(score, total),
+                "difficulty": quizzes.get(quiz_id, {}).get("difficulty"),
+            }
+            for quiz_id, (count, score, total) in items.items()
+        ),
+        key=lambda item: (item["p_value"] if item["p_value"] is not None else 1.0, item["quiz_id"]),
+    )
+
+    return {
+        "cohort": {"id": cohort.id, "name": cohort.name, "members": len(session_ids)},
+        "students": student_rows,
+        "items": item_rows,
+        "confusion": confusion.to_dict(limit=5),
+    }
+
+
+def refresh_report(cohort_id, workers=1):
+    """
+    Rebuilds and stores a cohort's report blob (see build_report for workers). Returns the
+    CohortReport, or None if the cohort does not exist.
+    """
+    # Built from the read-only pool, so the writer connection is only held for the upsert
+    with reading():
+        cohort = db.session.get(Cohort, cohort_id)
+        if not cohort:
+            return None
+        started = time.perf_counter()
+        report = build_report(cohort, workers)
+    generated_at = datetime.utcnow()
+    duration = round(time.perf_counter() - started, 3)
+    blob = json.dumps({**report, "generated_at": generated_at.isoformat()}, separators=(",", ":"))
+    db.session.execute(
+        insert(CohortReport)
+        .values(cohort_id=cohort_id, report=blob, generated_at=generated_at, duration=duration)
+        .on_conflict_do_update(index_elements=["cohort_id"],
+                               set_={"report": blob, "generated_at": generated_at, "duration": duration})
+    )
+    db.session.commit()
+    db.session.expire(cohort)
+    return db.session.get(CohortReport, cohort_id)
+
+
+def refresh_stale_reports(max_age=None, workers=1):
+    """
+    Rebuilds every report older than max_age seconds (default COHORT_REPORT_MAX_AGE), and
+    those never built. Returns the ids of the cohorts refreshed.
+    """
+    max_age = current_app.config["COHORT_REPORT_MAX_AGE"] if max_age is None else max_age
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    cohort_ids = db.session.scalars(
+        select(Cohort.id)
+        .outerjoin(CohortReport, CohortReport.cohort_id == Cohort.id)
+        .where((CohortReport.generated_at.is_(None)) | (CohortReport.generated_at < cutoff))
+        .order_by(Cohort.id)
+    ).all()
+    for cohort_id in cohort_ids:
+        refresh_report(cohort_id, workers)
+    return cohort_ids
+
+
+def get_report(cohort_id):
+    """
+    The stored report blob of a cohort, decoded, or None if none was built yet.
+    """
+    blob = db.session.scalar(select(CohortReport.report).where(CohortReport.cohort_id == cohort_id))
+    return json.loads(blob) if blob else None
+
+
+_lock = threading.Lock()
+_refreshing = set()
+
+
+def request_refresh(cohort_id):
+    """
+    Rebuilds a cohort's report in a background thread, so the request that asked for it
+    does not wait. The thread builds every partition itself: a server process never forks.
+    Returns False if a rebuild of that cohort is already running.
+    """
+    with _lock:
+        if cohort_id in _refreshing:
+            return False
+        _refreshing.add(cohort_id)
+    app = current_app._get_current_object()
+
+    def run():
+        try:
+            with app.app_context():
+                refresh_report(cohort_id)
+        except Exception:
+            logger.exception("Refreshing the report of cohort %s failed", cohort_id)
+        finally:
+            with _lock:
+                _refreshing.discard(cohort_id)
+
+    threading.Thread(target=run, name=f"cohort-report-{cohort_id}", daemon=True).start()
+    return True
+
+
+def is_refreshing(cohort_id):
+    return cohort_id in _refreshing
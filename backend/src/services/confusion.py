@@ -0,0 +1,166 @@
+# src/services/confusion.py
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db, reading
+from src.models.user import CompletedLesson, VowelConfusion
+from src.services.content import IPA_TO_VOWEL_ID
+from src.services.content_cache import get_snapshot
+
+# Matrix axes: every vowel an answer can be mapped to, in v1..v12 order
+VOWELS = sorted(set(IPA_TO_VOWEL_ID.values()), key=lambda vowel_id: (len(vowel_id), vowel_id))
+VOWEL_INDEX = {vowel_id: i for i, vowel_id in enumerate(VOWELS)}
+
+ALL_SESSIONS = ""
+
+
+class ConfusionMatrix:
+    """
+    Dense counts of (correct vowel, selected vowel) in a flat array, row-major by correct vowel.
+    """
+
+    def __init__(self, rows=()):
+        size = len(VOWELS)
+        self.counts = array("q", bytes(8 * size * size))
+        self.loaded_at = time.monotonic()
+        for correct, selected, count in rows:
+            self.add(correct, selected, count)
+
+    def add(self, correct, selected, count=1):
+        i, j = VOWEL_INDEX.get(correct), VOWEL_INDEX.get(selected)
+        if i is not None and j is not None:
+            self.counts[i * len(VOWELS) + j] += count
+
+    def rows(self):
+        size = len(VOWELS)
+        return [self.counts[i * size:(i + 1) * size].tolist() for i in range(size)]
+
+    def most_confused(self, limit=3):
+        """
+        Off-diagonal cells, highest confusion rate (share of the correct vowel's answers) first.
+        """
+        size = len(VOWELS)
+        cells = []
+        for i, row in enumerate(self.rows()):
+            total = sum(row)
+            for j, count in enumerate(row):
+                if i != j and count:
+                    cells.append((count / total, count, VOWELS[i], VOWELS[j]))
+        cells.sort(key=lambda cell: (-cell[0], -cell[1], VOWEL_INDEX[cell[2]] * size + VOWEL_INDEX[cell[3]]))
+        return [
+            {"correct_vowel": correct, "selected_vowel": selected, "count": count, "rate": round(rate, 4)}
+            for rate, count, correct, selected in cells[:limit]
+        ]
+
+    def to_dict(self, limit=3):
+        return {"vowels": VOWELS, "matrix": self.rows(), "most_confused": self.most_confused(limit)}
+
+
+_lock = threading.Lock()
+_totals = {"matrix": None}
+_sessions = OrderedDict()   # session id -> ConfusionMatrix
+
+
+def _load(session_key):
+    rows = db.session.execute(
+        select(VowelConfusion.correct_vowel, VowelConfusion.selected_vowel, VowelConfusion.count)
+        .where(VowelConfusion.session_id == session_key)
+    ).all()
+    return ConfusionMatrix(rows)
+
+
+def get_matrix(session_id=None):
+    """
+    A session's matrix, or the totals over all sessions when session_id is None.
+    Served from memory; reloaded from vowel_confusions on a miss or after
+    CONFUSION_RELOAD_INTERVAL, to pick up answers stored by other workers.
+    """
+    interval = current_app.config.get("CONFUSION_RELOAD_INTERVAL", 60.0)
+    with _lock:
+        matrix = _totals["matrix"] if session_id is None else _sessions.get(session_id)
+        if matrix is not None and time.monotonic() - matrix.loaded_at < interval:
+            if session_id is not None:
+                _sessions.move_to_end(session_id)
+            return matrix
+
+    with reading():
+        matrix = _load(session_id or ALL_SESSIONS)
+    with _lock:
+        if session_id is None:
+            _totals["matrix"] = matrix
+            return matrix
+        _sessions[session_id] = matrix
+        _sessions.move_to_end(session_id)
+        while len(_sessions) > current_app.config.get("CONFUSION_CACHE_SIZE", 10000):
+            _sessions.popitem(last=False)
+    return matrix
+
+
+def record_confusions(session_id, pairs):
+    """
+    Adds (correct vowel, selected vowel) pairs to the matrices already in memory. The database
+    copy is updated when the attempt batch is stored (see save_confusions); a matrix loaded
+    later reads them from there, so it must not get them added twice.
+    """
+    if not pairs:
+        return
+    with _lock:
+        for matrix in (_sessions.get(session_id), _totals["matrix"]):
+            if matrix is None:
+                continue
+            for correct, selected in pairs:
+                matrix.add(correct, selected)
+
+
+def save_confusions(records):
+    """
+    Adds the confusion pairs of a batch of attempts to vowel_confusions, per session and in
+    total, with one additive upsert in the caller's transaction.
+    """
+    cells = Counter()
+    for record in records:
+        for correct, selected in record.get("confusions", ()):
+            cells[(record["session_id"], correct, selected)] += 1
+            cells[(ALL_SESSIONS, correct, selected)] += 1
+    if not cells:
+        return
+
+    statement = insert(VowelConfusion)
+    statement = statement.on_conflict_do_update(
+        index_elements=["session_id", "correct_vowel", "selected_vowel"],
+        set_={"count": VowelConfusion.count + statement.excluded["count"]},
+    )
+    db.session.execute(statement, [
+        {"session_id": session_id, "correct_vowel": correct, "selected_vowel": selected, "count": count}
+        for (session_id, correct, selected), count in cells.items()
+    ])
+
+
+def recommend_lesson(session_id):
+    """
+    The next lesson for a session: the lesson of the vowel it confuses most, skipping lessons it
+    has completed. Falls back to the most confused vowels over all sessions, then to the first
+    lesson not completed yet. Returns (lesson, reason) or (None, None).
+    """
+    lessons_by_vowel = get_snapshot()["lessons_by_vowel"]
+    completed = set(db.session.scalars(
+        select(CompletedLesson.lesson_id).where(CompletedLesson.session_id == session_id)
+    ))
+
+    for source, matrix in (("session", get_matrix(session_id)), ("all_sessions", get_matrix())):
+        for cell in matrix.most_confused(limit=None):
+            lesson = lessons_by_vowel.get(cell["correct_vowel"])
+            if lesson and lesson["id"] not in completed:
+                return lesson, {"source": source, **cell}
+
+    for vowel_id in VOWELS:
+        lesson = lessons_by_vowel.get(vowel_id)
+        if lesson and lesson["id"] not in completed:
+            return lesson, {"source": "not_completed"}
+    return None, None
@@ -0,0 +1,322 @@
+# src/services/content.py
+import hashlib
+import json
+import os
+import unicodedata
+
+from sqlalchemy import delete, insert, select, update
+
+from src.db import db
+from src.models.lesson import Lesson, LessonInstruction
+from src.models.phoneme import Vowel, WordExample
+from src.models.quiz import QuizItem
+from src.services.content_cache import bump_content_version
+
+# IPA initials to vowel_id (e.g., "i" → "v1")
+IPA_TO_VOWEL_ID = {
+    "i": "v1",     # see, beat, team
+    "ɪ": "v2",     # sit, bit, ship
+    "e": "v3",     # say, rain, game
+    "ɛ": "v4",     # bed, get, head
+    "æ": "v5",     # cat, bat, ham
+    "ə": "v12",    # the, to, alone
+    "ʌ": "v7",     # strut, mud, cup
+    "ɑ": "v6",     # spa, bra, car
+    "ɔ": "v8",     # saw, law, paw
+    "o": "v9",     # go, boat, show
+    "ʊ": "v11",    # foot, book, could
+    "u": "v10",    # boot, food, two
+}
+
+VOWEL_FIELDS = ("phoneme", "name", "ipa_example", "color_code", "audio_url", "description")
+WORD_EXAMPLE_FIELDS = ("audio_url", "ipa", "example_sentence")
+SECTIONS = ("vowels", "word_examples", "lessons")
+
+
+def parse_word_audio_filename(filename):
+    """
+    Extracts the IPA and word from a filename like '13_æ_ref_cat.mp3'.
+    Returns (ipa, word), or None when the name does not follow the pattern.
+    """
+    filename = unicodedata.normalize("NFC", filename)
+    if not filename.endswith(".mp3"):
+        return None
+
+    parts = filename[:-len(".mp3")].split("_")
+    if len(parts) < 4 or parts[2] != "ref":
+        return None
+
+    return parts[1], parts[3]
+
+
+def content_hash(fields):
+    """
+    Stable hash of a record's content fields, used to detect changed rows.
+    """
+    encoded = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def load_catalog(content_file, audio_dir):
+    """
+    Builds the desired catalog from the declarative content file and the word example audio directory.
+
+    Returns (catalog, warnings). The catalog maps each managed section to {key: fields}; sections missing
+    from the content file (and from the audio directory, for word examples) are left out so the sync
+    never touches them.
+    """
+    with open(content_file, "r", encoding="utf-8") as f:
+        content = json.load(f)
+
+    catalog = {}
+    warnings = []
+
+    if "vowels" in content:
+        catalog["vowels"] = {
+            entry["id"]: {
+                "phoneme": entry["phoneme"],
+                "name": entry["name"],
+                "ipa_example": entry["ipa_example"],
+                "color_code": entry.get("color_code", "#CCCCCC"),
+                "audio_url": f"/audio/vowels/{entry['audio_file']}",
+                "description": entry["description"],
+            }
+            for entry in content["vowels"]
+        }
+
+    word_examples = {}
+    if audio_dir and os.path.isdir(audio_dir):
+        for filename in sorted(os.listdir(audio_dir)):
+            parsed = parse_word_audio_filename(filename)
+            if not parsed:
+                if filename.endswith(".mp3"):
+                    warnings.append(f"{filename}: malformed filename")
+                continue
+
+            ipa, word = parsed
+            vowel_id = IPA_TO_VOWEL_ID.get(ipa)
+            if not vowel_id:
+                warnings.append(f"{filename}: unmapped IPA '{ipa}'")
+                continue
+
+            word_examples[(vowel_id, word)] = {
+                "audio_url": f"/audio/word_examples/{unicodedata.normalize('NFC', filename)}",
+                "ipa": ipa,
+                "example_sentence": None,
+            }
+
+    # Entries in the content file extend or override what the audio directory provides
+    for entry in content.get("word_examples", []):
+        vowel_id = entry.get("vowel_id") or IPA_TO_VOWEL_ID.get(entry.get("ipa"))
+        if not vowel_id:
+            warnings.append(f"word example '{entry.get('word')}': unmapped IPA '{entry.get('ipa')}'")
+            continue
+
+        fields = word_examples.setdefault((vowel_id, entry["word"]), {
+            "audio_url": None,
+            "ipa": entry.get("ipa"),
+            "example_sentence": None,
+        })
+        if "audio_file" in entry:
+            fields["audio_url"] = f"/audio/word_examples/{entry['audio_file']}"
+        for field in ("ipa", "example_sentence"):
+            if field in entry:
+                fields[field] = entry[field]
+
+    for key, fields in list(word_examples.items()):
+        if not fields["audio_url"]:
+            warnings.append(f"word example '{key[1]}': no audio file")
+            del word_examples[key]
+
+    if word_examples or "word_examples" in content:
+        catalog["word_examples"] = word_examples
+
+    if "lessons" in content:
+        catalog["lessons"] = {
+            entry["vowel_id"]: {"instructions": list(entry["instructions"][:5])}
+            for entry in content["lessons"]
+        }
+
+    # Children of vowels the catalog does not declare would be removed along with the vowel
+    if "vowels" in catalog:
+        for section in ("word_examples", "lessons"):
+            for key in [key for key in catalog.get(section, {}) if _vowel_of(key) not in catalog["vowels"]]:
+                warnings.append(f"{section} {key}: unknown vowel '{_vowel_of(key)}'")
+                del catalog[section][key]
+
+    return catalog, warnings
+
+
+def _vowel_of(key):
+    return key[0] if isinstance(key, tuple) else key
+
+
+def _load_current():
+    """
+    Reads the current content straight from the tables (no ORM hydration), keyed like the catalog.
+    Each value is (primary key, fields).
+    """
+    current = {}
+
+    rows = db.session.execute(select(Vowel.id, *[getattr(Vowel, f) for f in VOWEL_FIELDS]))
+    current["vowels"] = {row[0]: (row[0], dict(zip(VOWEL_FIELDS, row[1:]))) for row in rows}
+
+    rows = db.session.execute(select(
+        WordExample.id, WordExample.vowel_id, WordExample.word,
+        *[getattr(WordExample, f) for f in WORD_EXAMPLE_FIELDS]
+    ))
+    current["word_examples"] = {
+        (row[1], row[2]): (row[0], dict(zip(WORD_EXAMPLE_FIELDS, row[3:]))) for row in rows
+    }
+
+    lessons = {lesson_id: vowel_id for lesson_id, vowel_id in db.session.execute(select(Lesson.id, Lesson.vowel_id))}
+    instructions = {lesson_id: [] for lesson_id in lessons}
+    rows = db.session.execute(
+        select(LessonInstruction.lesson_id, LessonInstruction.text).order_by(LessonInstruction.id)
+    )
+    for lesson_id, text in rows:
+        instructions.setdefault(lesson_id, []).append(text)
+    current["lessons"] = {
+        vowel_id: (lesson_id, {"instructions": instructions[lesson_id]}) for lesson_id, vowel_id in lessons.items()
+    }
+
+    return current
+
+
+def plan_sync(catalog, prune=True):
+    """
+    Diffs the desired catalog against the database by content hash.
+
+    Returns {section: {"insert": {key: fields}, "update": {key: (pk, fields)}, "delete": {key: pk}}}.
+    """
+    current = _load_current()
+    plan = {}
+
+    for section in SECTIONS:
+        if section not in catalog:
+            continue
+
+        desired = catalog[section]
+        existing = current[section]
+        changes = {"insert": {}, "update": {}, "delete": {}}
+
+        for key, fields in desired.items():
+            if key not in existing:
+                changes["insert"][key] = fields
+            else:
+                pk, current_fields = existing[key]
+                if content_hash(current_fields) != content_hash(fields):
+                    changes["update"][key] = (pk, fields)
+
+        if prune:
+            changes["delete"] = {key: pk for key, (pk, _) in existing.items() if key not in desired}
+
+        plan[section] = changes
+
+    return plan
+
+
+def _apply_plan(plan):
+    """
+    Applies a sync plan with bulk statements. The caller owns the transaction.
+    """
+    vowels = plan.get("vowels", {})
+    word_examples = plan.get("word_examples", {})
+    lessons = plan.get("lessons", {})
+
+    # Children of removed vowels go first so no foreign key is left dangling
+    removed_vowels = list(vowels.get("delete", {}).values())
+    if removed_vowels:
+        removed_lessons = select(Lesson.id).where(Lesson.vowel_id.in_(removed_vowels))
+        db.session.execute(delete(LessonInstruction).where(LessonInstruction.lesson_id.in_(removed_lessons)))
+        db.session.execute(delete(Lesson).where(Lesson.vowel_id.in_(removed_vowels)))
+        db.session.execute(delete(WordExample).where(WordExample.vowel_id.in_(removed_vowels)))
+        db.session.execute(update(QuizItem).where(QuizItem.vowel_id.in_(removed_vowels)).values(vowel_id=None))
+        db.session.execute(delete(Vowel).where(Vowel.id.in_(removed_vowels)))
+
+    if vowels.get("insert"):
+        db.session.execute(insert(Vowel), [{"id": key, **fields} for key, fields in vowels["insert"].items()])
+    if vowels.get("update"):
+        db.session.execute(update(Vowel), [{"id": pk, **fields} for pk, fields in vowels["update"].values()])
+
+    if word_examples.get("delete"):
+        db.session.execute(delete(WordExample).where(WordExample.id.in_(list(word_examples["delete"].values()))))
+    if word_examples.get("insert"):
+        db.session.execute(insert(WordExample), [
+            {"vowel_id": vowel_id, "word": word, **fields}
+            for (vowel_id, word), fields in word_examples["insert"].items()
+        ])
+    if word_examples.get("update"):
+        db.session.execute(update(WordExample), [
+            {"id": pk, **fields} for pk, fields in word_examples["update"].values()
+        ])
+
+    stale_lessons = list(lessons.get("delete", {}).values()) + [pk for pk, _ in lessons.get("update", {}).values()]
+    if stale_lessons:
+        db.session.execute(delete(LessonInstruction).where(LessonInstruction.lesson_id.in_(stale_lessons)))
+    if lessons.get("delete"):
+        db.session.execute(delete(Lesson).where(Lesson.id.in_(list(lessons["delete"].values()))))
+
+    new_lessons = lessons.get("insert", {})
+    lesson_ids = {}
+    if new_lessons:
+        db.session.execute(insert(Lesson), [{"vowel_id": vowel_id} for vowel_id in new_lessons])
+        rows = db.session.execute(select(Lesson.id, Lesson.vowel_id).where(Lesson.vowel_id.in_(list(new_lessons))))
+        lesson_ids = {vowel_id: lesson_id for lesson_id, vowel_id in rows}
+
+    instruction_rows = [
+        {"lesson_id": lesson_ids[vowel_id], "text": text}
+        for vowel_id, fields in new_lessons.items()
+        for text in fields["instructions"]
+    ] + [
+        {"lesson_id": pk, "text": text}
+        for pk, fields in lessons.get("update", {}).values()
+        for text in fields["instructions"]
+    ]
+    if instruction_rows:
+        db.session.execute(insert(LessonInstruction), instruction_rows)
+
+
+def summarize_plan(plan):
+    """
+    Counts and keys of each change, suitable for printing or returning as JSON.
+    """
+    return {
+        section: {
+            action: {"count": len(entries), "keys": sorted(str(key) for key in entries)}
+            for action, entries in changes.items()
+        }
+        for section, changes in plan.items()
+    }
+
+
+def sync_content(content_file, audio_dir, dry_run=False, prune=True):
+    """
+    Brings the database in line with the content catalog.
+
+    Only the rows whose content hash differs are written, all in one transaction. A no-op sync
+    performs reads only. With dry_run the plan is computed and reported but nothing is written.
+    """
+    catalog, warnings = load_catalog(content_file, audio_dir)
+    plan = plan_sync(catalog, prune=prune)
+    changed = any(entries for changes in plan.values() for entries in changes.values())
+
+    if changed and not dry_run:
+        try:
+            _apply_plan(plan)
+            bump_content_version("content sync", change_count=sum(
+                len(entries) for changes in plan.values() for entries in changes.values()
+            ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    else:
+        db.session.rollback()
+
+    return {
+        "dry_run": dry_run,
+        "changed": changed,
+        "changes": summarize_plan(plan),
+        "warnings": warnings,
+    }
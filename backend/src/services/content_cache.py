@@ -0,0 +1,110 @@
+# src/services/content_cache.py
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, selectinload
+
+from src.db import db, reading
+from src.models.content import ContentRelease
+from src.models.lesson import Lesson
+from src.models.phoneme import Vowel
+from src.models.quiz import QuizItem
+
+_lock = threading.Lock()
+_state = {"version": None, "checked_at": 0.0, "snapshot": None}
+_listeners = []
+
+
+def on_content_change(callback):
+    """
+    Registers callback(version), called once each time a new content version is loaded.
+    """
+    _listeners.append(callback)
+    return callback
+
+
+def bump_content_version(note=None, change_count=0):
+    """
+    Records a new content version in the caller's transaction. Readers switch to it on commit.
+    Returns the release; its id is the new version once flushed.
+    """
+    release = ContentRelease(note=note, change_count=change_count)
+    db.session.add(release)
+    db.session.info["content_changed"] = True
+    return release
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("content_changed", False):
+        _state["checked_at"] = 0.0
+
+
+def current_version():
+    """
+    Reads the latest published content version from the database.
+    """
+    return db.session.scalar(select(func.max(ContentRelease.id))) or 0
+
+
+def live_version():
+    """
+    The content version readers should see. The database is consulted at most once per
+    CONTENT_VERSION_CHECK_INTERVAL seconds; commits in this process invalidate it immediately.
+    """
+    interval = current_app.config.get("CONTENT_VERSION_CHECK_INTERVAL", 1.0)
+    now = time.monotonic()
+    if _state["version"] is None or now - _state["checked_at"] >= interval:
+        with reading():
+            _state["version"] = current_version()
+        _state["checked_at"] = now
+    return _state["version"]
+
+
+def _build_snapshot(version):
+    vowels = Vowel.query.options(selectinload(Vowel.word_examples)).order_by(Vowel.id).all()
+    lessons = Lesson.query.options(
+        selectinload(Lesson.instructions), selectinload(Lesson.vowel).selectinload(Vowel.word_examples)
+    ).order_by(Lesson.id).all()
+    quizzes = QuizItem.query.options(
+        selectinload(QuizItem.options), selectinload(QuizItem.calibration)
+    ).order_by(QuizItem.id).all()
+
+    lesson_dicts = {lesson.id: lesson.to_dict() for lesson in lessons}
+    return {
+        "version": version,
+        "vowels": [vowel.to_dict() for vowel in vowels],
+        "lessons": lesson_dicts,
+        "lessons_by_vowel": {lesson.vowel_id: lesson_dicts[lesson.id] for lesson in lessons},
+        "quizzes": {quiz.id: quiz.to_dict() for quiz in quizzes},
+    }
+
+
+def get_snapshot():
+    """
+    Serialized vowels, lessons and quizzes of the live content version, rebuilt once per version.
+    """
+    version = live_version()
+    snapshot = _state["snapshot"]
+    if snapshot is not None and snapshot["version"] == version:
+        return snapshot
+
+    with _lock:
+        snapshot = _state["snapshot"]
+        if snapshot is None or snapshot["version"] != version:
+            with reading():
+                snapshot = _build_snapshot(version)
+            _state["snapshot"] = snapshot
+            for callback in _listeners:
+                callback(version)
+    return snapshot
+
+
+def refresh():
+    """
+    Forces a version check and rebuilds the snapshot if the version moved.
+    """
+    _state["checked_at"] = 0.0
+    return get_snapshot()
@@ -0,0 +1,155 @@
+# src/services/export.py
+import csv
+import gzip
+import io
+import os
+import zlib
+from datetime import date, datetime, time
+
+from src.db import read_engine
+
+# Exportable tables: columns in file order and the timestamp column used to partition by date
+EXPORT_TABLES = {
+    "quiz_attempts": (
+        ("id", "session_id", "quiz_id", "score", "total", "attempted_at"),
+        "attempted_at",
+    ),
+    "completed_lessons": (
+        ("id", "session_id", "lesson_id", "completed_at"),
+        "completed_at",
+    ),
+    "quiz_logs": (
+        ("id", "session_id", "quiz_id", "question_index", "question_text", "selected_option", "correct_option",
+         "is_correct", "answered_at"),
+        "answered_at",
+    ),
+}
+FORMATS = ("csv", "parquet")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow: pip install phonolab-backend[parquet]") from e
+    return pyarrow
+
+
+def _bound(value):
+    # Dates become midnight; matches how SQLAlchemy stores DateTime in SQLite
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _page_sql(table, start, end):
+    columns, timestamp = EXPORT_TABLES[table]
+    where = ["id > ?"]
+    if start:
+        where.append(f"{timestamp} >= ?")
+    if end:
+        where.append(f"{timestamp} < ?")
+    return f"SELECT {', '.join(columns)} FROM {table} WHERE {' AND '.join(where)} ORDER BY id LIMIT ?"
+
+
+def iter_pages(table, chunk_size, start=None, end=None):
+    """
+    Yields the rows of a table in id order, chunk_size rows at a time.
+
+    Each page is read by keyset (id > last id seen) in a transaction of its own that ends
+    before the page is yielded, so a slow consumer never keeps a read transaction (and the
+    SQLite WAL checkpoint) waiting; rows committed meanwhile with higher ids are included.
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table {table!r}, expected one of {sorted(EXPORT_TABLES)}")
+    sql = _page_sql(table, start, end)
+    bounds = [_bound(value) for value in (start, end) if value]
+    last_id = 0
+    while True:
+        with read_engine().connect() as connection:
+            rows = connection.exec_driver_sql(sql, (last_id, *bounds, chunk_size)).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1][0]
+        yield rows
+        if len(rows) < chunk_size:
+            return
+
+
+def _by_date(table, rows):
+    # SQLite returns timestamps as text; their first 10 characters are the date
+    index = EXPORT_TABLES[table][0].index(EXPORT_TABLES[table][1])
+    groups = {}
+    for row in rows:
+        groups.setdefault((row[index] or "unknown")[:10], []).append(row)
+    return groups
+
+
+def _write_csv(path, columns, rows):
+    exists = os.path.exists(path)
+    # Appending adds a gzip member; readers see one continuous file
+    with gzip.open(path, "at", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if not exists:
+            writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _write_parquet(path, columns, rows):
+    pyarrow = _pyarrow()
+    table = pyarrow.Table.from_pydict({column: list(values) for column, values in zip(columns, zip(*rows))})
+    pyarrow.parquet.write_table(table, path)
+
+
+def export_table(table, out_dir, fmt="csv", chunk_size=10000, start=None, end=None):
+    """
+    Writes a table to out_dir/<table>/date=YYYY-MM-DD/, one directory per day.
+
+    CSV output is one gzip file per day, appended to chunk by chunk; Parquet output is one
+    file per chunk and day. Only one chunk is in memory at a time. Existing files for the
+    same days are replaced. Returns {date: rows written}.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    if fmt == "parquet":
+        _pyarrow()
+    columns = EXPORT_TABLES[table][0]
+    counts, seen = {}, set()
+
+    for page, rows in enumerate(iter_pages(table, chunk_size, start, end)):
+        for day, group in _by_date(table, rows).items():
+            directory = os.path.join(out_dir, table, f"date={day}")
+            os.makedirs(directory, exist_ok=True)
+            if fmt == "csv":
+                path = os.path.join(directory, f"{table}.csv.gz")
+                if day not in seen and os.path.exists(path):
+                    os.remove(path)
+                _write_csv(path, columns, group)
+            else:
+                if day not in seen:
+                    for name in os.listdir(directory):
+                        if name.endswith(".parquet"):
+                            os.remove(os.path.join(directory, name))
+                _write_parquet(os.path.join(directory, f"part-{page:05d}.parquet"), columns, group)
+            seen.add(day)
+            counts[day] = counts.get(day, 0) + len(group)
+    return counts
+
+
+def stream_csv_gzip(table, chunk_size=10000, start=None, end=None):
+    """
+    Yields a table as gzip-compressed CSV bytes, one compressed block per chunk, for
+    streaming HTTP responses.
+    """
+    columns = EXPORT_TABLES[table][0]
+    compressor = zlib.compressobj(wbits=31)     # gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in iter_pages(table, chunk_size, start, end):
+        writer.writerows(rows)
+        yield compressor.compress(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+    yield compressor.compress(buffer.getvalue().encode("utf-8")) + compressor.flush()
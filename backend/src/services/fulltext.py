@@ -0,0 +1,183 @@
+# src/services/fulltext.py
+import re
+
+from sqlalchemy import text
+
+from src.db import db
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_TOKENS = 12
+
+# External-content FTS5 tables: the index stores only tokens, the text stays in the source
+# tables, and triggers keep both in step for every INSERT/UPDATE/DELETE (bulk ones included).
+FULLTEXT_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS lesson_instructions_fts USING fts5(
+        text, content='lesson_instructions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_instructions_fts_ai AFTER INSERT ON lesson_instructions BEGIN
+        INSERT INTO lesson_instructions_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_instructions_fts_ad AFTER DELETE ON lesson_instructions BEGIN
+        INSERT INTO lesson_instructions_fts(lesson_instructions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lesson_instructions_fts_au AFTER UPDATE ON lesson_instructions BEGIN
+        INSERT INTO lesson_instructions_fts(lesson_instructions_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO lesson_instructions_fts(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS vowels_fts USING fts5(
+        name, description, content='vowels', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vowels_fts_ai AFTER INSERT ON vowels BEGIN
+        INSERT INTO vowels_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vowels_fts_ad AFTER DELETE ON vowels BEGIN
+        INSERT INTO vowels_fts(vowels_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS vowels_fts_au AFTER UPDATE ON vowels BEGIN
+        INSERT INTO vowels_fts(vowels_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO vowels_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+    END
+    """,
+]
+
+# Lessons carry no text of their own; lesson hits come from their instructions and are
+# joined back to the lesson (and its vowel) at query time, so deleting a lesson is covered
+# by the instruction triggers.
+SEARCH_SQL = {
+    "lesson": """
+        SELECT 'lesson' AS type, li.lesson_id AS id, l.vowel_id AS vowel_id, li.id AS instruction_id,
+               snippet(lesson_instructions_fts, 0, :open, :close, '…', :tokens) AS snippet,
+               bm25(lesson_instructions_fts) AS rank
+        FROM lesson_instructions_fts
+        JOIN lesson_instructions li ON li.id = lesson_instructions_fts.rowid
+        JOIN lessons l ON l.id = li.lesson_id
+        WHERE lesson_instructions_fts MATCH :query
+    """,
+    "vowel": """
+        SELECT 'vowel' AS type, v.id AS id, v.id AS vowel_id, NULL AS instruction_id,
+               snippet(vowels_fts, -1, :open, :close, '…', :tokens) AS snippet,
+               bm25(vowels_fts, 2.0, 1.0) AS rank
+        FROM vowels_fts
+        JOIN vowels v ON v.rowid = vowels_fts.rowid
+        WHERE vowels_fts MATCH :query
+    """,
+}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class FullTextUnavailable(RuntimeError):
+    pass
+
+
+def fulltext_supported(connection):
+    if connection.dialect.name != "sqlite":
+        return False
+    return bool(connection.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar())
+
+
+def ensure_fulltext_index():
+    """
+    Creates the FTS5 shadow tables and their sync triggers if missing, and backfills
+    them from the source tables the first time. Returns False when FTS5 is unavailable.
+    """
+    with db.engine.begin() as connection:
+        if not fulltext_supported(connection):
+            return False
+
+        existing = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE name IN ('lesson_instructions_fts', 'vowels_fts')")
+        ).scalars().all()
+        for statement in FULLTEXT_DDL:
+            connection.execute(text(statement))
+        if "lesson_instructions_fts" not in existing:
+            connection.execute(text("INSERT INTO lesson_instructions_fts(lesson_instructions_fts) VALUES ('rebuild')"))
+        if "vowels_fts" not in existing:
+            connection.execute(text("INSERT INTO vowels_fts(vowels_fts) VALUES ('rebuild')"))
+    return True
+
+
+def rebuild_fulltext_index():
+    """
+    Re-derives both FTS5 tables from their source tables. Needed after a full VACUUM,
+    which may renumber the implicit rowids of `vowels`.
+    """
+    with db.engine.begin() as connection:
+        if not fulltext_supported(connection):
+            return False
+        connection.execute(text("INSERT INTO lesson_instructions_fts(lesson_instructions_fts) VALUES ('rebuild')"))
+        connection.execute(text("INSERT INTO vowels_fts(vowels_fts) VALUES ('rebuild')"))
+    return True
+
+
+def build_match_query(query):
+    """
+    Turns user input into an FTS5 query: every word must appear, a quoted string is
+    matched as a phrase and the last word also matches as a prefix.
+    """
+    phrases = re.findall(r'"([^"]+)"', query)
+    rest = re.sub(r'"[^"]*"', " ", query)
+    parts = ['"' + " ".join(_TOKEN.findall(phrase)) + '"' for phrase in phrases if _TOKEN.search(phrase)]
+    words = _TOKEN.findall(rest)
+    parts.extend(f'"{word}"' for word in words[:-1])
+    if words:
+        parts.append(f'"{words[-1]}"*')
+    return " ".join(parts)
+
+
+def search_content(query, page=1, per_page=10, kinds=("lesson", "vowel")):
+    """
+    BM25-ranked full-text search over lesson instructions and vowel names/descriptions,
+    with highlighted snippets. Returns (results, total).
+    """
+    match = build_match_query(query)
+    if not match:
+        return [], 0
+
+    union = " UNION ALL ".join(SEARCH_SQL[kind] for kind in kinds)
+    params = {
+        "query": match,
+        "open": SNIPPET_OPEN,
+        "close": SNIPPET_CLOSE,
+        "tokens": SNIPPET_TOKENS,
+        "limit": per_page,
+        "offset": (page - 1) * per_page,
+    }
+
+    try:
+        total = db.session.execute(text(f"SELECT count(*) FROM ({union})"), params).scalar()
+        rows = db.session.execute(text(f"{union} ORDER BY rank LIMIT :limit OFFSET :offset"), params).mappings().all()
+    except Exception as e:
+        if "no such table" in str(e):
+            raise FullTextUnavailable("Full-text search is not available on this database") from e
+        raise
+
+    results = [{
+        "type": row["type"],
+        "id": row["id"],
+        "vowel_id": row["vowel_id"],
+        "instruction_id": row["instruction_id"],
+        "snippet": row["snippet"],
+        "score": round(-row["rank"], 4),
+    } for row in rows]
+    return results, total
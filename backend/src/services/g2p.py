@@ -0,0 +1,249 @@
+# src/services/g2p.py
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+
+from flask import current_app
+
+from src.services.content import IPA_TO_VOWEL_ID
+
+# Compiled index layout:
+#   header   MAGIC (8 bytes), record count (uint32), reserved (uint32)
+#   offsets  one uint32 per record, relative to the start of the data section
+#   data     records sorted by word: b"word\tphoneme phoneme ...\tprimary_index\n"
+MAGIC = b"PHLG2P01"
+HEADER = struct.Struct("<8sII")
+OFFSET = struct.Struct("<I")
+
+ARPABET_TO_IPA = {
+    "AA": "ɑ", "AE": "æ", "AO": "ɔ", "AW": "aʊ", "AY": "aɪ", "EH": "ɛ", "EY": "e", "IH": "ɪ",
+    "IY": "i", "OW": "o", "OY": "ɔɪ", "UH": "ʊ", "UW": "u",
+    "B": "b", "CH": "tʃ", "D": "d", "DH": "ð", "F": "f", "G": "ɡ", "HH": "h", "JH": "dʒ", "K": "k",
+    "L": "l", "M": "m", "N": "n", "NG": "ŋ", "P": "p", "R": "ɹ", "S": "s", "SH": "ʃ", "T": "t",
+    "TH": "θ", "V": "v", "W": "w", "Y": "j", "Z": "z", "ZH": "ʒ",
+}
+
+VOWELS = {"ɑ", "æ", "ɔ", "aʊ", "aɪ", "ɛ", "e", "ɪ", "i", "o", "ɔɪ", "ʊ", "u", "ə", "ʌ", "ɝ", "ɚ"}
+
+# Grapheme rules for words missing from the dictionary, longest match first.
+# A rough approximation of English spelling, good enough to guess the vowel of a new word.
+GRAPHEME_RULES = sorted({
+    "tch": ["tʃ"], "igh": ["aɪ"], "ch": ["tʃ"], "sh": ["ʃ"], "th": ["θ"], "ng": ["ŋ"], "ph": ["f"],
+    "ck": ["k"], "qu": ["k", "w"], "wh": ["w"], "wr": ["ɹ"], "kn": ["n"],
+    "ee": ["i"], "ea": ["i"], "ie": ["i"], "oo": ["u"], "ai": ["e"], "ay": ["e"], "ey": ["e"],
+    "oa": ["o"], "oe": ["o"], "ow": ["o"], "ou": ["aʊ"], "oi": ["ɔɪ"], "oy": ["ɔɪ"], "au": ["ɔ"],
+    "aw": ["ɔ"], "ar": ["ɑ", "ɹ"], "or": ["ɔ", "ɹ"], "er": ["ɝ"], "ir": ["ɝ"], "ur": ["ɝ"],
+    "a": ["æ"], "e": ["ɛ"], "i": ["ɪ"], "o": ["ɑ"], "u": ["ʌ"], "y": ["j"],
+    "b": ["b"], "c": ["k"], "d": ["d"], "f": ["f"], "g": ["ɡ"], "h": ["h"], "j": ["dʒ"], "k": ["k"],
+    "l": ["l"], "m": ["m"], "n": ["n"], "p": ["p"], "r": ["ɹ"], "s": ["s"], "t": ["t"], "v": ["v"],
+    "w": ["w"], "x": ["k", "s"], "z": ["z"],
+}.items(), key=lambda rule: -len(rule[0]))
+
+# Vowel letter followed by consonant + silent final e ("cake", "note")
+MAGIC_E = {"a": "e", "e": "i", "i": "aɪ", "o": "o", "u": "u"}
+_MAGIC_E_PATTERN = re.compile(r"([aeiou])([^aeiouy]{1})e$")
+
+
+def normalize_word(word):
+    return unicodedata.normalize("NFC", word or "").strip().casefold()
+
+
+def arpabet_to_ipa(arpabet):
+    """
+    Converts CMUdict phonemes to IPA tokens. Returns (tokens, index of the primary-stressed vowel).
+    """
+    tokens, primary = [], -1
+    for phone in arpabet:
+        base, stress = phone.rstrip("012"), phone[len(phone.rstrip("012")):]
+        if base == "AH":
+            symbol = "ə" if stress == "0" else "ʌ"
+        elif base == "ER":
+            symbol = "ɚ" if stress == "0" else "ɝ"
+        else:
+            symbol = ARPABET_TO_IPA[base]
+        if stress == "1" and primary < 0:
+            primary = len(tokens)
+        tokens.append(symbol)
+
+    if primary < 0:
+        primary = next((i for i, token in enumerate(tokens) if token in VOWELS), -1)
+    return tokens, primary
+
+
+def compile_dictionary(source_path, index_path):
+    """
+    Compiles a CMUdict-style text file into the sorted binary index. The first pronunciation
+    of a word wins; variants like "WORD(2)" are skipped. The file is replaced atomically.
+    """
+    entries = {}
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line.startswith(";;;"):
+                continue
+            word, *phones = line.split()
+            if "(" in word or not phones:
+                continue
+            key = normalize_word(word)
+            if key not in entries:
+                tokens, primary = arpabet_to_ipa(phones)
+                entries[key] = f"{key}\t{' '.join(tokens)}\t{primary}\n".encode("utf-8")
+
+    keys = sorted(entries, key=lambda key: key.encode("utf-8"))
+    offsets, position = [], 0
+    for key in keys:
+        offsets.append(position)
+        position += len(entries[key])
+
+    tmp_path = f"{index_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(keys), 0))
+        for offset in offsets:
+            f.write(OFFSET.pack(offset))
+        for key in keys:
+            f.write(entries[key])
+    os.replace(tmp_path, index_path)
+    return len(keys)
+
+
+class PronunciationDictionary:
+    """
+    Read-only view of a compiled index. The file is memory-mapped, so opening it costs no
+    parsing and the pages are shared between worker processes through the OS page cache.
+    """
+
+    def __init__(self, index_path):
+        self._file = open(index_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, _ = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a pronunciation index: {index_path}")
+        self._data_start = HEADER.size + OFFSET.size * self.count
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _record_start(self, i):
+        return self._data_start + OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * i)[0]
+
+    def lookup(self, word):
+        """
+        Binary search for a word. Returns (tokens, primary_index) or None.
+        """
+        key = normalize_word(word).encode("utf-8")
+        low, high = 0, self.count - 1
+        while low <= high:
+            middle = (low + high) // 2
+            start = self._record_start(middle)
+            tab = self._map.find(b"\t", start)
+            current = self._map[start:tab]
+            if current == key:
+                end = self._map.find(b"\n", tab)
+                phonemes, primary = self._map[tab + 1:end].decode("utf-8").rsplit("\t", 1)
+                return phonemes.split(" "), int(primary)
+            if current < key:
+                low = middle + 1
+            else:
+                high = middle - 1
+        return None
+
+
+def rule_based_phonemes(word):
+    """
+    Guesses phonemes from spelling. Returns (tokens, primary_index); the first vowel is taken as stressed.
+    """
+    word = re.sub(r"[^a-z]", "", normalize_word(word))
+    magic = _MAGIC_E_PATTERN.search(word) if len(word) > 3 else None
+    if magic:
+        word = word[:-1]
+
+    tokens, i = [], 0
+    while i < len(word):
+        for graphemes, phonemes in GRAPHEME_RULES:
+            if word.startswith(graphemes, i):
+                if magic and i == magic.start(1) and len(graphemes) == 1:
+                    phonemes = [MAGIC_E[graphemes]]
+                elif graphemes == "y" and i > 0:
+                    phonemes = ["i"] if i == len(word) - 1 else ["ɪ"]
+                elif graphemes == "c" and word[i + 1:i + 2] in ("e", "i", "y"):
+                    phonemes = ["s"]
+                # Doubled consonants ("ll", "tt") are pronounced once
+                if tokens and phonemes == [tokens[-1]] and phonemes[0] not in VOWELS:
+                    phonemes = []
+                tokens.extend(phonemes)
+                i += len(graphemes)
+                break
+        else:
+            i += 1
+
+    primary = next((i for i, token in enumerate(tokens) if token in VOWELS), -1)
+    return tokens, primary
+
+
+def format_ipa(tokens, primary):
+    """
+    Joins IPA tokens, marking primary stress before the onset of the stressed syllable
+    when the word has more than one vowel.
+    """
+    if sum(token in VOWELS for token in tokens) < 2 or primary < 0:
+        return "".join(tokens)
+    if not any(token in VOWELS for token in tokens[:primary]):
+        mark = 0
+    else:
+        mark = primary - 1 if tokens[primary - 1] not in VOWELS else primary
+    return "".join(tokens[:mark]) + "ˈ" + "".join(tokens[mark:])
+
+
+_lock = threading.Lock()
+_dictionary = None
+
+
+def get_dictionary():
+    """
+    The process-wide dictionary. The index is (re)compiled only when missing or older than its
+    source file; otherwise startup is just an mmap.
+    """
+    global _dictionary
+    if _dictionary is None:
+        with _lock:
+            if _dictionary is None:
+                source = current_app.config["G2P_DICTIONARY"]
+                index = current_app.config["G2P_INDEX"]
+                if not os.path.exists(index) or os.path.getmtime(index) < os.path.getmtime(source):
+                    compile_dictionary(source, index)
+                _dictionary = PronunciationDictionary(index)
+    return _dictionary
+
+
+def phonemes(word, dictionary=None):
+    """
+    IPA tokens of a word and the index of its stressed vowel, plus where they came from.
+    """
+    dictionary = dictionary or get_dictionary()
+    found = dictionary.lookup(word)
+    tokens, primary = found if found else rule_based_phonemes(word)
+    return tokens, primary, "dictionary" if found else ("rules" if tokens else None)
+
+
+def transcribe(word, dictionary=None):
+    """
+    IPA transcription of one word, from the dictionary or, failing that, from spelling rules.
+    """
+    tokens, primary, source = phonemes(word, dictionary)
+    vowel = tokens[primary] if primary >= 0 else None
+
+    return {
+        "word": word,
+        "ipa": format_ipa(tokens, primary),
+        "phonemes": tokens,
+        "vowel": vowel,
+        "vowel_id": IPA_TO_VOWEL_ID.get(vowel),
+        "vowel_ids": [IPA_TO_VOWEL_ID[token] for token in tokens if token in IPA_TO_VOWEL_ID],
+        "source": source,
+    }
@@ -0,0 +1,142 @@
+# src/services/grading.py
+import threading
+
+from sqlalchemy import select
+
+from src.db import db, reading
+from src.models.quiz import QuizItem, QuizOption
+from src.services.content import IPA_TO_VOWEL_ID
+from src.services.content_cache import live_version
+
+
+class InvalidAnswers(ValueError):
+    pass
+
+
+class UnknownOptions(InvalidAnswers):
+    pass
+
+
+class DuplicateOptions(InvalidAnswers):
+    pass
+
+
+def score_answers(option_ids, options, correct, label="the quiz"):
+    """
+    (score, total) of the selected option ids among a quiz's options and correct options:
+    see AnswerKey.grade.
+    """
+    unknown = [option_id for option_id in option_ids if option_id not in options]
+    if unknown:
+        raise UnknownOptions(f"Options not in {label}: {unknown}")
+    if len(set(option_ids)) != len(option_ids):
+        raise DuplicateOptions("Each option can be selected only once")
+    hits = sum(1 for option_id in option_ids if option_id in correct)
+    return max(0, hits - (len(option_ids) - hits)), len(correct)
+
+
+class AnswerKey:
+    """
+    Per quiz, the frozenset of its correct option ids and of all its option ids, plus its
+    prompt word and vowel (and each option's vowel) for the answer log and analytics.
+    Grading is a couple of set lookups; no quiz or option rows are loaded.
+    """
+
+    def __init__(self, version, correct, options, items, option_vowels):
+        self.version = version
+        self.correct = correct
+        self.options = options
+        self.items = items                  # quiz_id -> (prompt_word, vowel_id)
+        self.option_vowels = option_vowels  # option_id -> vowel_id, when its IPA is a known vowel
+
+    def __contains__(self, quiz_id):
+        # A quiz without a correct option cannot be graded
+        return bool(self.correct.get(quiz_id))
+
+    def grade(self, quiz_id, option_ids):
+        """
+        Returns (score, total) for the selected option ids of one quiz. The total is the
+        number of correct options of the quiz; each of them selected scores a point and each
+        wrong option selected takes one off (down to 0), so selecting everything gains nothing.
+        Raises UnknownOptions if an id does not belong to the quiz and DuplicateOptions if an
+        id is selected more than once.
+        """
+        return score_answers(option_ids, self.options[quiz_id], self.correct[quiz_id], f"quiz {quiz_id}")
+
+    def answers(self, quiz_id, option_ids):
+        """
+        Per selected option: (selected id, the correct option it is judged against, is_correct).
+        The correct option is the selection itself when right, else the quiz's first correct option.
+        """
+        correct = self.correct[quiz_id]
+        fallback = min(correct) if correct else None
+        return [
+            (option_id, option_id if option_id in correct else fallback, option_id in correct)
+            for option_id in option_ids
+        ]
+
+    def confusions(self, quiz_id, option_ids):
+        """
+        (correct vowel, selected vowel) per answer, for answers whose vowels are both known.
+        A right answer counts as the quiz's vowel selected for itself. A wrong answer whose vowel
+        is unknown, or given as the quiz's own (older options carry the prompt's IPA), is left
+        out rather than counted as right.
+        """
+        vowel_id = self.items.get(quiz_id, (None, None))[1]
+        if not vowel_id:
+            return []
+        correct = self.correct[quiz_id]
+        pairs = []
+        for option_id in option_ids:
+            selected = vowel_id if option_id in correct else self.option_vowels.get(option_id)
+            if selected and (option_id in correct or selected != vowel_id):
+                pairs.append((vowel_id, selected))
+        return pairs
+
+
+def build_answer_key(version):
+    correct, options, option_vowels = {}, {}, {}
+    rows = db.session.execute(
+        select(QuizOption.quiz_item_id, QuizOption.id, QuizOption.is_correct, QuizOption.ipa, QuizOption.vowel_id)
+    )
+    for quiz_id, option_id, is_correct, ipa, vowel_id in rows:
+        options.setdefault(quiz_id, []).append(option_id)
+        if is_correct:
+            correct.setdefault(quiz_id, []).append(option_id)
+        vowel_id = vowel_id or IPA_TO_VOWEL_ID.get((ipa or "").strip("/[] "))
+        if vowel_id:
+            option_vowels[option_id] = vowel_id
+
+    items = {
+        quiz_id: (prompt_word, vowel_id)
+        for quiz_id, prompt_word, vowel_id in db.session.execute(
+            select(QuizItem.id, QuizItem.prompt_word, QuizItem.vowel_id)
+        )
+    }
+
+    empty = frozenset()
+    return AnswerKey(
+        version,
+        {quiz_id: frozenset(correct.get(quiz_id, empty)) for quiz_id in options},
+        {quiz_id: frozenset(ids) for quiz_id, ids in options.items()},
+        items,
+        option_vowels,
+    )
+
+
+_lock = threading.Lock()
+_key = AnswerKey(None, {}, {}, {}, {})
+
+
+def get_answer_key():
+    """
+    The answer key of the live content version, rebuilt only when the version moves.
+    """
+    global _key
+    version = live_version()
+    if _key.version != version:
+        with _lock:
+            if _key.version != version:
+                with reading():
+                    _key = build_answer_key(version)
+    return _key
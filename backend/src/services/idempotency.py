@@ -0,0 +1,226 @@
+# src/services/idempotency.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db, reading
+from src.models.user import IdempotencyKey
+
+IN_FLIGHT = object()
+
+
+class IdempotencyConflict(RuntimeError):
+    """The same key is being processed by another request right now."""
+
+
+class IdempotencyMismatch(ValueError):
+    """The key was used before with a different request body."""
+
+
+def fingerprint(quiz_id, option_ids):
+    return hashlib.blake2b(f"{quiz_id}:{','.join(map(str, option_ids))}".encode(), digest_size=16).hexdigest()
+
+
+class BloomFilter:
+    """
+    Two generations of a bit array: keys are added to the current one, looked up in both,
+    and the older generation is dropped every `period` seconds, so a key is remembered for
+    between one and two periods and the false-positive rate does not creep up forever.
+    """
+
+    def __init__(self, bits, hashes, period):
+        self.bits = bits
+        self.hashes = hashes
+        self.period = period
+        self.current = bytearray(bits // 8 + 1)
+        self.previous = bytearray(bits // 8 + 1)
+        self.rotated_at = time.monotonic()
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def _rotate(self):
+        if time.monotonic() - self.rotated_at >= self.period:
+            self.previous, self.current = self.current, bytearray(self.bits // 8 + 1)
+            self.rotated_at = time.monotonic()
+
+    def add(self, key):
+        self._rotate()
+        for position in self._positions(key):
+            self.current[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        positions = self._positions(key)
+        return any(
+            all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+            for bits in (self.current, self.previous)
+        )
+
+
+class IdempotencyStore:
+    """
+    Responses of recent POSTs by idempotency key.
+
+    Lookups go to a bounded in-memory LRU first (recent and in-flight keys), then to the
+    idempotency_keys table, which is written with the attempt itself. With the Bloom filter
+    enabled (IDEMPOTENCY_BLOOM, off by default), the table is only queried for keys the filter
+    may have seen, so a first submission costs no query. The filter only knows keys seen by
+    this process (and those loaded from the table when it starts), so it is only safe with a
+    single worker process.
+
+    A retry that reaches another worker before the first attempt is stored is not caught
+    here; store_attempts drops it when the batch is stored.
+    """
+
+    def __init__(self, ttl, size, bloom=None):
+        self.ttl = ttl
+        self.size = size
+        self.bloom = bloom
+        self.recent = OrderedDict()     # key -> (stored at, fingerprint, entry or IN_FLIGHT)
+        self.warmed = bloom is None
+        self._lock = threading.Lock()
+
+    def _warm(self):
+        # Fills the filter with keys stored within the TTL, e.g. before a restart
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        with reading():
+            keys = db.session.scalars(select(IdempotencyKey.key).where(IdempotencyKey.created_at >= cutoff)).all()
+        for key in keys:
+            self.bloom.add(key)
+        self.warmed = True
+
+    def _stored(self, key):
+        if self.bloom is not None and key not in self.bloom:
+            return None
+        with reading():
+            row = db.session.get(IdempotencyKey, key)
+        if row is None or row.created_at < datetime.utcnow() - timedelta(seconds=self.ttl):
+            return None
+        return row.fingerprint, row.to_entry()
+
+    def begin(self, key, request_fingerprint):
+        """
+        Returns the stored entry for a key seen before, or None after reserving the key for
+        this request. Raises IdempotencyConflict while another request holds the key and
+        IdempotencyMismatch when the key came with a different request.
+        """
+        if not self.warmed:
+            with self._lock:
+                if not self.warmed:
+                    self._warm()
+        with self._lock:
+            cached = self.recent.get(key)
+            if cached is not None and time.monotonic() - cached[0] >= self.ttl:
+                del self.recent[key]
+                cached = None
+        stored = (cached[1], cached[2]) if cached is not None else self._stored(key)
+
+        with self._lock:
+            if stored is None:
+                if key in self.recent:      # reserved by a concurrent request meanwhile
+                    stored = self.recent[key][1:]
+                else:
+                    self.recent[key] = (time.monotonic(), request_fingerprint, IN_FLIGHT)
+                    self._evict()
+                    return None
+        stored_fingerprint, entry = stored
+        if stored_fingerprint != request_fingerprint:
+            raise IdempotencyMismatch("Idempotency-Key was already used for a different request")
+        if entry is IN_FLIGHT:
+            raise IdempotencyConflict("A request with this Idempotency-Key is in progress")
+        return entry
+
+    def complete(self, key, request_fingerprint, entry):
+        with self._lock:
+            self.recent[key] = (time.monotonic(), request_fingerprint, entry)
+            self.recent.move_to_end(key)
+            self._evict()
+            if self.bloom is not None:
+                self.bloom.add(key)
+
+    def abort(self, key):
+        with self._lock:
+            cached = self.recent.get(key)
+            if cached is not None and cached[2] is IN_FLIGHT:
+                del self.recent[key]
+
+    def _evict(self):
+        while len(self.recent) > self.size:
+            self.recent.popitem(last=False)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = current_app.config
+                bloom = None
+                if config.get("IDEMPOTENCY_BLOOM", False):
+                    bloom = BloomFilter(config["IDEMPOTENCY_BLOOM_BITS"], config["IDEMPOTENCY_BLOOM_HASHES"],
+                                        config["IDEMPOTENCY_TTL"])
+                _store = IdempotencyStore(config["IDEMPOTENCY_TTL"], config["IDEMPOTENCY_CACHE_SIZE"], bloom)
+    return _store
+
+
+def unseen_attempts(records):
+    """
+    The attempts of a batch whose idempotency key is not stored yet, keeping the first
+    attempt per key; attempts without a key are all kept. Reads in the caller's transaction.
+    """
+    keys = {r["idempotency_key"] for r in records if r.get("idempotency_key")}
+    if not keys:
+        return records
+    seen = set(db.session.scalars(select(IdempotencyKey.key).where(IdempotencyKey.key.in_(keys))))
+    unseen = []
+    for record in records:
+        key = record.get("idempotency_key")
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        unseen.append(record)
+    return unseen
+
+
+def save_idempotency_keys(records):
+    """
+    Stores the idempotency keys of a batch of attempts in the caller's transaction.
+    """
+    rows = [{
+        "key": r["idempotency_key"],
+        "fingerprint": r["fingerprint"],
+        "session_id": r["session_id"],
+        "quiz_id": r["quiz_id"],
+        "score": r["score"],
+        "total": r["total"],
+        "created_at": r["attempted_at"],
+    } for r in records if r.get("idempotency_key")]
+    if rows:
+        db.session.execute(insert(IdempotencyKey).on_conflict_do_nothing(index_elements=["key"]), rows)
+
+
+def prune_idempotency_keys(cutoff, batch_size):
+    """
+    Deletes keys stored before cutoff, in batches. Returns the number deleted.
+    """
+    deleted = 0
+    while True:
+        expired = select(IdempotencyKey.key).where(IdempotencyKey.created_at < cutoff).limit(batch_size)
+        count = db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(expired))).rowcount
+        db.session.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -0,0 +1,285 @@
+# src/services/importer.py
+import csv
+import os
+from itertools import islice
+
+from sqlalchemy import delete, insert, select, update
+
+from src.db import db
+from src.models.lesson import Lesson, LessonInstruction
+from src.models.phoneme import Vowel, WordExample
+from src.models.quiz import QuizItem
+from src.services.content import IPA_TO_VOWEL_ID
+from src.services.content_cache import bump_content_version
+from src.services.quiz import upsert_quiz_options
+
+KINDS = ("vowels", "word_examples", "lessons", "quizzes")
+LIST_SEPARATOR = "|"
+
+
+class RowError(ValueError):
+    pass
+
+
+def iter_rows(path, sheet=None):
+    """
+    Streams (row_number, row) pairs from a CSV file or one sheet of an xlsx workbook.
+
+    The first row is the header. xlsx files are opened in read-only mode so rows are
+    read lazily and memory stays flat regardless of the sheet size.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row_number, row in enumerate(csv.DictReader(f), start=2):
+                yield row_number, row
+        return
+
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ImportError("Reading xlsx files requires openpyxl: pip install phonolab-backend[xlsx]") from e
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True) if sheet else workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for row_number, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def sheet_names(path):
+    """
+    Returns the importable sheets of an xlsx workbook, in import order.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return [kind for kind in KINDS if kind in workbook.sheetnames]
+    finally:
+        workbook.close()
+
+
+# --- Row validation ---
+
+def _text(row, field, required=True):
+    value = row.get(field)
+    value = str(value).strip() if value is not None else ""
+    if required and not value:
+        raise RowError(f"Missing required field: {field}")
+    return value or None
+
+
+def _list(row, field):
+    value = _text(row, field, required=False)
+    return [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()] if value else []
+
+
+def _vowel_id(row, vowel_ids):
+    vowel_id = _text(row, "vowel_id", required=False)
+    if not vowel_id:
+        ipa = _text(row, "ipa", required=False) or _text(row, "prompt_ipa", required=False)
+        vowel_id = IPA_TO_VOWEL_ID.get(ipa)
+        if not vowel_id:
+            raise RowError(f"Cannot map IPA '{ipa}' to a vowel")
+    if vowel_id not in vowel_ids:
+        raise RowError(f"Unknown vowel: {vowel_id}")
+    return vowel_id
+
+
+def _validate_vowel(row, vowel_ids):
+    record = {field: _text(row, field) for field in ("id", "phoneme", "name", "ipa_example", "audio_url")}
+    record["color_code"] = _text(row, "color_code", required=False) or "#CCCCCC"
+    record["description"] = _text(row, "description", required=False) or ""
+    return record
+
+
+def _validate_word_example(row, vowel_ids):
+    return {
+        "word": _text(row, "word"),
+        "audio_url": _text(row, "audio_url"),
+        "ipa": _text(row, "ipa", required=False),
+        "example_sentence": _text(row, "example_sentence", required=False),
+        "vowel_id": _vowel_id(row, vowel_ids),
+    }
+
+
+def _validate_lesson(row, vowel_ids):
+    instructions = _list(row, "instructions") or [
+        text for text in (_text(row, f"instruction_{i}", required=False) for i in range(1, 6)) if text
+    ]
+    if not instructions:
+        raise RowError("A lesson needs at least one instruction")
+    return {"vowel_id": _vowel_id(row, vowel_ids), "instructions": instructions[:5]}
+
+
+def _validate_quiz(row, vowel_ids):
+    record = {field: _text(row, field) for field in ("prompt_word", "prompt_ipa", "prompt_audio_url")}
+    correct_options = _list(row, "correct_options")
+    wrong_option = _text(row, "wrong_option")
+    if not correct_options:
+        raise RowError("Missing required field: correct_options")
+
+    record["vowel_id"] = _vowel_id(row, vowel_ids)
+    record["options"] = [
+        {"word": record["prompt_word"], "ipa": record["prompt_ipa"], "audio_url": url, "is_correct": True}
+        for url in correct_options
+    ] + [{"word": record["prompt_word"], "ipa": record["prompt_ipa"], "audio_url": wrong_option, "is_correct": False}]
+    return record
+
+
+VALIDATORS = {
+    "vowels": _validate_vowel,
+    "word_examples": _validate_word_example,
+    "lessons": _validate_lesson,
+    "quizzes": _validate_quiz,
+}
+
+
+# --- Batch upserts ---
+
+def _upsert_vowels(records):
+    existing = set(db.session.scalars(select(Vowel.id).where(Vowel.id.in_([r["id"] for r in records]))))
+    new = [r for r in records if r["id"] not in existing]
+    changed = [r for r in records if r["id"] in existing]
+    if new:
+        db.session.execute(insert(Vowel), new)
+    if changed:
+        db.session.execute(update(Vowel), changed)
+
+
+def _upsert_word_examples(records):
+    rows = db.session.execute(
+        select(WordExample.id, WordExample.vowel_id, WordExample.word)
+        .where(WordExample.word.in_({r["word"] for r in records}))
+    )
+    existing = {(vowel_id, word): example_id for example_id, vowel_id, word in rows}
+    new = [r for r in records if (r["vowel_id"], r["word"]) not in existing]
+    changed = [{"id": existing[(r["vowel_id"], r["word"])], **r} for r in records if (r["vowel_id"], r["word"]) in existing]
+    if new:
+        db.session.execute(insert(WordExample), new)
+    if changed:
+        db.session.execute(update(WordExample), changed)
+
+
+def _upsert_lessons(records):
+    vowel_ids = [r["vowel_id"] for r in records]
+    existing = dict(db.session.execute(select(Lesson.vowel_id, Lesson.id).where(Lesson.vowel_id.in_(vowel_ids))).all())
+    if existing:
+        db.session.execute(delete(LessonInstruction).where(LessonInstruction.lesson_id.in_(list(existing.values()))))
+
+    new = [{"vowel_id": vowel_id} for vowel_id in vowel_ids if vowel_id not in existing]
+    if new:
+        db.session.execute(insert(Lesson), new)
+        existing = dict(db.session.execute(select(Lesson.vowel_id, Lesson.id).where(Lesson.vowel_id.in_(vowel_ids))).all())
+
+    db.session.execute(insert(LessonInstruction), [
+        {"lesson_id": existing[r["vowel_id"]], "text": text} for r in records for text in r["instructions"]
+    ])
+
+
+def _upsert_quizzes(records):
+    urls = [r["prompt_audio_url"] for r in records]
+    existing = dict(db.session.execute(
+        select(QuizItem.prompt_audio_url, QuizItem.id).where(QuizItem.prompt_audio_url.in_(urls))
+    ).all())
+    items = [{k: v for k, v in r.items() if k != "options"} for r in records]
+
+    changed = [{"id": existing[item["prompt_audio_url"]], **item} for item in items if item["prompt_audio_url"] in existing]
+    if changed:
+        db.session.execute(update(QuizItem), changed)
+
+    new = [item for item in items if item["prompt_audio_url"] not in existing]
+    if new:
+        db.session.execute(insert(QuizItem), new)
+        existing = dict(db.session.execute(
+            select(QuizItem.prompt_audio_url, QuizItem.id).where(QuizItem.prompt_audio_url.in_(urls))
+        ).all())
+
+    upsert_quiz_options([(existing[r["prompt_audio_url"]], r["options"]) for r in records])
+
+
+UPSERTS = {
+    "vowels": _upsert_vowels,
+    "word_examples": _upsert_word_examples,
+    "lessons": _upsert_lessons,
+    "quizzes": _upsert_quizzes,
+}
+
+NATURAL_KEYS = {
+    "vowels": lambda r: r["id"],
+    "word_examples": lambda r: (r["vowel_id"], r["word"]),
+    "lessons": lambda r: r["vowel_id"],
+    "quizzes": lambda r: r["prompt_audio_url"],
+}
+
+
+def import_rows(kind, rows, batch_size=500):
+    """
+    Validates and upserts a stream of (row_number, row) pairs of one kind, batch by batch.
+
+    Each batch is written with executemany-style statements and committed on its own, so
+    invalid rows (or a failing batch) are reported without aborting the rest of the load.
+    Rows may refer to the vowels committed before the call (e.g. by the vowels sheet of the
+    same workbook, imported first).
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown content kind: {kind}")
+
+    validate, upsert, natural_key = VALIDATORS[kind], UPSERTS[kind], NATURAL_KEYS[kind]
+    vowel_ids = set(db.session.scalars(select(Vowel.id)))
+    report = {"kind": kind, "imported": 0, "errors": []}
+
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+
+        records = {}
+        for row_number, row in batch:
+            try:
+                # Later rows win when a key repeats within the batch
+                record = validate(row, vowel_ids)
+                records[natural_key(record)] = (row_number, record)
+            except (RowError, KeyError, TypeError) as e:
+                report["errors"].append({"row": row_number, "error": str(e)})
+
+        if not records:
+            continue
+
+        try:
+            upsert([record for _, record in records.values()])
+            db.session.commit()
+            report["imported"] += len(records)
+        except Exception as e:
+            db.session.rollback()
+            report["errors"].extend({"row": row_number, "error": f"Batch failed: {e}"} for row_number, _ in records.values())
+
+    # One version bump per load, not per batch, so readers rebuild their caches once
+    if report["imported"]:
+        bump_content_version(f"{kind} import", change_count=report["imported"])
+        db.session.commit()
+
+    return report
+
+
+def import_file(path, kind=None, batch_size=500):
+    """
+    Imports a CSV file of the given kind, or every recognised sheet (vowels, word_examples,
+    lessons, quizzes) of an xlsx workbook. Returns one report per imported kind.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    if path.lower().endswith(".csv"):
+        if not kind:
+            raise ValueError("The content kind is required for CSV files")
+        return [import_rows(kind, iter_rows(path), batch_size)]
+
+    kinds = [kind] if kind else sheet_names(path)
+    return [import_rows(sheet, iter_rows(path, sheet), batch_size) for sheet in kinds]
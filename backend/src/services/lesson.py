@@ -1,11 +1,15 @@
+from sqlalchemy import select
+
 from src.db import db
 from src.models.lesson import Lesson, LessonInstruction
 from src.models.phoneme import Vowel
+from src.services.content_cache import bump_content_version
 
 
-def create_lesson(vowel_id, instruction_texts):
+def create_lesson(vowel_id, instruction_texts, commit=True):
     """
     Creates a lesson linked to a vowel, with up to 5 instruction items.
+    With commit=False the change is left in the caller's transaction (used by publishing).
     """
     vowel = db.session.get(Vowel, vowel_id)
     if not vowel:
@@ -17,7 +21,9 @@ def create_lesson(vowel_id, instruction_texts):
         lesson.instructions.append(LessonInstruction(text=text))
 
     db.session.add(lesson)
-    db.session.commit()
+    if commit:
+        bump_content_version("lesson created")
+        db.session.commit()
     return lesson
 
 
@@ -35,9 +41,10 @@ def get_lesson_by_vowel(vowel_id):
     return Lesson.query.filter_by(vowel_id=vowel_id).first()
 
 
-def update_lesson_instructions(lesson_id, new_instructions):
+def update_lesson_instructions(lesson_id, new_instructions, commit=True):
     """
     Replaces instructions for a given lesson with new ones.
+    With commit=False the change is left in the caller's transaction (used by publishing).
     """
     lesson = db.session.get(Lesson, lesson_id)
     if not lesson:
@@ -48,20 +55,25 @@ def update_lesson_instructions(lesson_id, new_instructions):
     for text in new_instructions[:5]:
         lesson.instructions.append(LessonInstruction(text=text))
 
-    db.session.commit()
+    if commit:
+        bump_content_version("lesson updated")
+        db.session.commit()
     return lesson
 
 
-def delete_lesson(lesson_id):
+def delete_lesson(lesson_id, commit=True):
     """
     Deletes a lesson and its associated instructions.
+    With commit=False the change is left in the caller's transaction (used by publishing).
     """
     lesson = db.session.get(Lesson, lesson_id)
     if not lesson:
         return False
 
     db.session.delete(lesson)
-    db.session.commit()
+    if commit:
+        bump_content_version("lesson deleted")
+        db.session.commit()
     return True
 
 
@@ -70,3 +82,35 @@ def get_all_lessons():
     Returns all lessons (for internal/dev use).
     """
     return Lesson.query.all()
+
+
+def validate_lessons(payloads, vowel_ids=None, taken=None):
+    """
+    Checks a batch of lesson payloads, each shaped like the POST /lessons/ body (vowel_id,
+    instructions), against the given vowel ids and the vowels that already have a lesson
+    (default: the live ones). A vowel gets at most one lesson.
+    Returns (valid, errors): valid is a list of (index, vowel_id, instructions), errors of {"index", "error"}.
+    """
+    if vowel_ids is None:
+        vowel_ids = set(db.session.scalars(select(Vowel.id)))
+    taken = set(db.session.scalars(select(Lesson.vowel_id)) if taken is None else taken)
+    valid, errors = [], []
+
+    for index, data in enumerate(payloads):
+        vowel_id = data.get("vowel_id") if isinstance(data, dict) else None
+        instructions = data.get("instructions") if isinstance(data, dict) else None
+
+        if not vowel_id or not instructions:
+            error = "vowel_id and instructions are required"
+        elif not isinstance(instructions, list):
+            error = "instructions must be a list"
+        elif vowel_id not in vowel_ids:
+            error = "Vowel not found"
+        elif vowel_id in taken:
+            error = f"Lesson already exists for vowel {vowel_id}"
+        else:
+            taken.add(vowel_id)
+            valid.append((index, vowel_id, instructions[:5]))
+            continue
+        errors.append({"index": index, "error": error})
+    return valid, errors
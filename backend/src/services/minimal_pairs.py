@@ -0,0 +1,186 @@
+# src/services/minimal_pairs.py
+from itertools import combinations
+
+from sqlalchemy import delete, insert, or_, select
+
+from src.db import db
+from src.models.phoneme import ComparisonPair, WordExample, WordSkeleton
+from src.services.content import IPA_TO_VOWEL_ID
+from src.services.g2p import get_dictionary, phonemes
+
+VOWEL_SLOT = "_"
+
+# Keeps IN (...) lists well under SQLite's bound-parameter limit
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def skeleton_for(word, vowel_id, dictionary=None):
+    """
+    The word's phonemes with the slot of its vowel masked, e.g. "b _ t" for "bit".
+    Returns (skeleton, slot), or (None, None) when the word has no vowel to mask.
+
+    The masked slot is the stressed vowel when it is the example's vowel, otherwise the
+    first occurrence of the example's vowel, so "alone" under /ə/ masks its first syllable.
+    """
+    tokens, primary, _ = phonemes(word, dictionary)
+    if primary < 0:
+        return None, None
+
+    slot = primary
+    if IPA_TO_VOWEL_ID.get(tokens[primary]) != vowel_id:
+        slot = next((i for i, token in enumerate(tokens) if IPA_TO_VOWEL_ID.get(token) == vowel_id), primary)
+    return " ".join(tokens[:slot] + [VOWEL_SLOT] + tokens[slot + 1:]), slot
+
+
+def _stale_example_ids():
+    """
+    Word examples without a skeleton or whose word, vowel or audio changed since it was
+    computed, and skeletons whose example is gone.
+    """
+    stale = db.session.scalars(
+        select(WordExample.id)
+        .outerjoin(WordSkeleton, WordSkeleton.word_example_id == WordExample.id)
+        .where(or_(
+            WordSkeleton.word_example_id.is_(None),
+            WordSkeleton.word != WordExample.word,
+            WordSkeleton.vowel_id != WordExample.vowel_id,
+            WordSkeleton.audio_url != WordExample.audio_url,
+        ))
+    ).all()
+    orphaned = db.session.scalars(
+        select(WordSkeleton.word_example_id)
+        .outerjoin(WordExample, WordExample.id == WordSkeleton.word_example_id)
+        .where(WordExample.id.is_(None))
+    ).all()
+    return set(stale), set(orphaned)
+
+
+def _pair_row(a, b, skeleton):
+    if a.vowel_id > b.vowel_id:
+        a, b = b, a
+    return {
+        "vowel_id": a.vowel_id,
+        "contrast_with": b.vowel_id,
+        "word_a": a.word,
+        "word_b": b.word,
+        "audio_url_a": a.audio_url,
+        "audio_url_b": b.audio_url,
+        "word_example_a_id": a.word_example_id,
+        "word_example_b_id": b.word_example_id,
+        "skeleton": skeleton,
+    }
+
+
+def _is_pair(a, b):
+    return a.vowel_id != b.vowel_id and a.word != b.word
+
+
+def refresh_pairs(rebuild=False, commit=True):
+    """
+    Brings skeletons and comparison pairs up to date with the word examples. Run by publish
+    (in its transaction, commit=False), by the import and sync scripts and by
+    scripts/build_minimal_pairs.py; readers never refresh.
+
+    Only changed examples are re-transcribed; their new skeletons are matched against the
+    existing ones through the skeleton index, so the cost grows with the size of the change,
+    not with the word list. rebuild=True recomputes everything.
+    Returns {"examples": re-indexed examples, "pairs": pairs created}.
+    """
+    if rebuild:
+        db.session.execute(delete(ComparisonPair))
+        db.session.execute(delete(WordSkeleton))
+        stale, orphaned = set(db.session.scalars(select(WordExample.id))), set()
+    else:
+        stale, orphaned = _stale_example_ids()
+
+    changed = stale | orphaned
+    if not changed:
+        return {"examples": 0, "pairs": 0}
+
+    if not rebuild:
+        for ids in _chunks(changed):
+            db.session.execute(delete(ComparisonPair).where(or_(
+                ComparisonPair.word_example_a_id.in_(ids), ComparisonPair.word_example_b_id.in_(ids)
+            )))
+            db.session.execute(delete(WordSkeleton).where(WordSkeleton.word_example_id.in_(ids)))
+
+    dictionary = get_dictionary()
+    skeletons = []
+    for ids in _chunks(stale):
+        rows = db.session.execute(
+            select(WordExample.id, WordExample.word, WordExample.vowel_id, WordExample.audio_url)
+            .where(WordExample.id.in_(ids))
+        )
+        for example_id, word, vowel_id, audio_url in rows:
+            skeleton, slot = skeleton_for(word, vowel_id, dictionary)
+            skeletons.append({
+                "word_example_id": example_id,
+                "skeleton": skeleton,
+                "slot": slot,
+                "word": word,
+                "vowel_id": vowel_id,
+                "audio_url": audio_url,
+            })
+    if skeletons:
+        db.session.execute(insert(WordSkeleton), skeletons)
+
+    # Every example sharing a skeleton with a changed one, grouped by skeleton
+    buckets = {}
+    keys = {row["skeleton"] for row in skeletons if row["skeleton"]}
+    for chunk in _chunks(keys):
+        rows = db.session.execute(
+            select(
+                WordSkeleton.skeleton, WordSkeleton.word_example_id, WordSkeleton.word,
+                WordSkeleton.vowel_id, WordSkeleton.audio_url,
+            ).where(WordSkeleton.skeleton.in_(chunk))
+        )
+        for row in rows:
+            buckets.setdefault(row.skeleton, []).append(row)
+
+    pairs = []
+    for skeleton, members in buckets.items():
+        if rebuild:
+            pairs.extend(_pair_row(a, b, skeleton) for a, b in combinations(members, 2) if _is_pair(a, b))
+            continue
+        new = [m for m in members if m.word_example_id in stale]
+        old = [m for m in members if m.word_example_id not in stale]
+        pairs.extend(_pair_row(a, b, skeleton) for a, b in combinations(new, 2) if _is_pair(a, b))
+        pairs.extend(_pair_row(a, b, skeleton) for a in new for b in old if _is_pair(a, b))
+
+    for chunk in _chunks(pairs):
+        db.session.execute(insert(ComparisonPair), chunk)
+
+    if commit:
+        db.session.commit()
+    return {"examples": len(changed), "pairs": len(pairs)}
+
+
+def get_contrast(vowel_a, vowel_b):
+    """
+    Minimal pairs between two vowels, each oriented so word_a carries vowel_a.
+    """
+    pairs = ComparisonPair.query.filter(or_(
+        (ComparisonPair.vowel_id == vowel_a) & (ComparisonPair.contrast_with == vowel_b),
+        (ComparisonPair.vowel_id == vowel_b) & (ComparisonPair.contrast_with == vowel_a),
+    )).order_by(ComparisonPair.word_a, ComparisonPair.word_b).all()
+
+    results = []
+    for pair in pairs:
+        data = pair.to_dict()
+        if pair.vowel_id != vowel_a:
+            data.update({
+                "vowel_id": pair.contrast_with,
+                "contrast_with": pair.vowel_id,
+                "word_a": pair.word_b,
+                "word_b": pair.word_a,
+                "audio_url_a": pair.audio_url_b,
+                "audio_url_b": pair.audio_url_a,
+            })
+        results.append(data)
+    return results
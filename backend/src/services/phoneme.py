@@ -1,5 +1,12 @@
 # src/services/phoneme.py
+from sqlalchemy import insert, select
+
+from src.db import db
 from src.models.phoneme import Vowel, WordExample
+from src.services.g2p import get_dictionary, transcribe
+from src.services.word_search import search_words
+
+WORD_EXAMPLE_REQUIRED_FIELDS = ("word", "audio_url")
 
 
 def get_all_vowels():
@@ -17,6 +24,79 @@ def get_word_example_by_id(example_id):
 def get_word_example_by_name(word):
     return WordExample.query.filter_by(word=word).first()
 
+
+def transcribe_words(words):
+    """
+    Maps words to IPA and vowel ids using the pronunciation dictionary, with a spelling-rule fallback.
+    """
+    dictionary = get_dictionary()
+    return [transcribe(word, dictionary) for word in words]
+
+
+def search_word_examples(query, limit=10):
+    """
+    Ranked, normalized (NFC/casefold) search over words, IPA and vowels, tolerant of prefixes and typos.
+    """
+    return search_words(query, limit=limit)
+
+
+def validate_word_examples(payloads, vowel_ids=None):
+    """
+    Checks a batch of word example payloads against the given vowel ids (default: the live
+    vowels) and turns them into word_examples rows.
+
+    Each payload needs word and audio_url; example_sentence is optional. A missing vowel_id
+    (and ipa) is filled in from the word's stressed vowel via grapheme-to-phoneme lookup.
+    Returns (valid, errors): valid is a list of (index, row), errors of {"index", "error"}.
+    """
+    if vowel_ids is None:
+        vowel_ids = set(db.session.scalars(select(Vowel.id)))
+    valid, errors = [], []
+    dictionary = None
+
+    for index, data in enumerate(payloads):
+        if not isinstance(data, dict):
+            errors.append({"index": index, "error": "Word example must be an object"})
+            continue
+
+        missing = [field for field in WORD_EXAMPLE_REQUIRED_FIELDS if not data.get(field)]
+        if missing:
+            errors.append({"index": index, "error": f"Missing required field: {missing[0]}"})
+            continue
+
+        vowel_id, ipa = data.get("vowel_id"), data.get("ipa")
+        if not vowel_id:
+            dictionary = dictionary or get_dictionary()
+            transcription = transcribe(data["word"], dictionary)
+            vowel_id, ipa = transcription["vowel_id"], ipa or transcription["vowel"]
+            if not vowel_id:
+                errors.append({"index": index, "error": f"Cannot determine the vowel of '{data['word']}'"})
+                continue
+
+        if vowel_id not in vowel_ids:
+            errors.append({"index": index, "error": f"Vowel not found: {vowel_id}"})
+        else:
+            valid.append((index, {
+                "word": data["word"],
+                "audio_url": data["audio_url"],
+                "ipa": ipa,
+                "example_sentence": data.get("example_sentence"),
+                "vowel_id": vowel_id,
+            }))
+
+    return valid, errors
+
+
+def insert_word_examples(rows):
+    """
+    Bulk-inserts word_examples rows in the caller's transaction with one multi-row insert.
+    Returns the new ids in input order.
+    """
+    return db.session.scalars(
+        insert(WordExample).returning(WordExample.id, sort_by_parameter_order=True), rows
+    ).all()
+
+
 # phase 2
 # def get_vowel_by_phoneme(phoneme):
 #     return Vowel.query.filter_by(phoneme=phoneme).first()
@@ -0,0 +1,153 @@
+# src/services/progress.py
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import text
+
+from src.db import db
+
+# A vowel counts as mastered after enough answers at a high enough accuracy
+MASTERY_MIN_ANSWERS = 10
+MASTERY_ACCURACY = 0.8
+
+# Everything the dashboard shows, in one statement: one row per active day, per completed
+# lesson and per answered vowel. Each branch is a range scan of a session_id index.
+PROGRESS_SQL = text("""
+    SELECT 'day' AS kind, date(attempted_at) AS key, COUNT(*) AS a, SUM(score) AS b, SUM(total) AS c
+    FROM quiz_attempts
+    WHERE session_id = :session_id
+    GROUP BY date(attempted_at)
+    UNION ALL
+    SELECT 'lesson', completed_at, lesson_id, NULL, NULL
+    FROM completed_lessons
+    WHERE session_id = :session_id
+    UNION ALL
+    SELECT 'vowel', vowel, correct, incorrect, NULL
+    FROM vowel_stats
+    WHERE session_id = :session_id
+""")
+
+# Moves whenever any worker stores an attempt (and its counters) or a completed lesson for the
+# session. Row ids rather than timestamps: a write-behind attempt may be stored after a newer one.
+WATERMARK_SQL = text("""
+    SELECT (SELECT MAX(id) FROM quiz_attempts WHERE session_id = :session_id),
+           (SELECT MAX(id) FROM completed_lessons WHERE session_id = :session_id)
+""")
+
+
+def _streaks(days, today):
+    """
+    (current, longest) runs of consecutive active days. The current streak is still alive
+    if the last active day is today or yesterday.
+    """
+    current = longest = run = 0
+    previous = None
+    for day in sorted(days):
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+    if previous is not None and today - previous <= timedelta(days=1):
+        current = run
+    return current, longest
+
+
+def compute_progress(session_id, today=None):
+    """
+    Completed lessons, per-vowel mastery, activity streaks and a daily learning curve
+    for one session.
+    """
+    today = today or datetime.utcnow().date()
+    days, lessons, vowels = [], [], []
+    for kind, key, a, b, c in db.session.execute(PROGRESS_SQL, {"session_id": session_id}):
+        if kind == "day":
+            days.append((date.fromisoformat(key), a, b or 0, c or 0))
+        elif kind == "lesson":
+            lessons.append((a, key))
+        else:
+            vowels.append((key, a, b))
+
+    curve, score, total = [], 0, 0
+    for day, attempts, day_score, day_total in sorted(days):
+        score, total = score + day_score, total + day_total
+        curve.append({
+            "date": day.isoformat(),
+            "attempts": attempts,
+            "accuracy": round(day_score / day_total, 4) if day_total else None,
+            "cumulative_accuracy": round(score / total, 4) if total else None,
+        })
+
+    mastery = []
+    for vowel_id, correct, incorrect in sorted(vowels):
+        answers = correct + incorrect
+        accuracy = correct / answers if answers else 0.0
+        mastery.append({
+            "vowel_id": vowel_id,
+            "answers": answers,
+            "accuracy": round(accuracy, 4),
+            "mastered": answers >= MASTERY_MIN_ANSWERS and accuracy >= MASTERY_ACCURACY,
+        })
+
+    # completed_at comes back as SQLite's text form; its first 10 characters are the date
+    completed = sorted(lessons, key=lambda lesson: lesson[1] or "")
+    active_days = {day for day, _, _, _ in days} | {
+        date.fromisoformat(completed_at[:10]) for _, completed_at in completed if completed_at
+    }
+    current, longest = _streaks(active_days, today)
+
+    return {
+        "session_id": session_id,
+        "completed_lessons": [
+            {"lesson_id": lesson_id, "completed_at": completed_at.replace(" ", "T") if completed_at else None}
+            for lesson_id, completed_at in completed
+        ],
+        "vowel_mastery": mastery,
+        "mastered_vowels": sum(1 for vowel in mastery if vowel["mastered"]),
+        "streak": {"current": current, "longest": longest, "active_days": len(active_days)},
+        "learning_curve": curve,
+        "quiz_attempts": sum(day["attempts"] for day in curve),
+    }
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # session id -> (watermark, progress dict)
+_computed_at = {}       # session id -> monotonic time
+
+
+def get_progress(session_id):
+    """
+    A session's progress from the in-process LRU, recomputed on a miss, after PROGRESS_TTL
+    seconds, or once the session's watermark moves: its latest stored attempt and completed
+    lesson, read from the session_id indexes, so writes through any worker are seen at once. Attempts
+    still waiting in a write-behind queue show up once they are stored.
+    """
+    ttl = current_app.config.get("PROGRESS_TTL", 300.0)
+    watermark = tuple(db.session.execute(WATERMARK_SQL, {"session_id": session_id}).one())
+    with _lock:
+        cached = _cache.get(session_id)
+        if cached is not None and cached[0] == watermark and time.monotonic() - _computed_at[session_id] < ttl:
+            _cache.move_to_end(session_id)
+            return cached[1]
+
+    progress = compute_progress(session_id)
+    with _lock:
+        _cache[session_id] = (watermark, progress)
+        _computed_at[session_id] = time.monotonic()
+        _cache.move_to_end(session_id)
+        while len(_cache) > current_app.config.get("PROGRESS_CACHE_SIZE", 10000):
+            evicted, _ = _cache.popitem(last=False)
+            del _computed_at[evicted]
+    return progress
+
+
+def invalidate_progress(*session_ids):
+    """
+    Drops cached progress after a session's lessons or attempts change in this process (other
+    processes notice through the watermark).
+    """
+    with _lock:
+        for session_id in session_ids:
+            if _cache.pop(session_id, None) is not None:
+                del _computed_at[session_id]
@@ -0,0 +1,268 @@
+# src/services/publishing.py
+import uuid
+
+from sqlalchemy import select
+
+from src.db import db
+from src.models.content import ContentDraft
+from src.models.lesson import Lesson
+from src.models.phoneme import Vowel
+from src.models.quiz import QuizItem
+from src.services.content_cache import bump_content_version, refresh
+from src.services.lesson import create_lesson, delete_lesson, update_lesson_instructions, validate_lessons
+from src.services.minimal_pairs import refresh_pairs
+from src.services.phoneme import insert_word_examples, validate_word_examples
+from src.services.quiz import delete_quiz, insert_quizzes, update_quiz_options, validate_quizzes
+from src.services.word_search import index_word_examples
+
+VOWEL_FIELDS = ("id", "phoneme", "name", "ipa_example", "color_code", "audio_url", "description")
+
+
+def _stage(kind, target_id, payload):
+    return _stage_all(kind, [(target_id, payload)])[0]
+
+
+def _stage_all(kind, entries):
+    # Later edits of the same target replace earlier ones; all entries commit together
+    target_ids = [str(target_id) for target_id, _ in entries]
+    ContentDraft.query.filter(ContentDraft.kind == kind, ContentDraft.target_id.in_(target_ids)) \
+        .delete(synchronize_session=False)
+    drafts = [ContentDraft(kind=kind, target_id=target_id, payload=payload)
+              for target_id, (_, payload) in zip(target_ids, entries)]
+    db.session.add_all(drafts)
+    db.session.commit()
+    return drafts
+
+
+def _new_target():
+    # New items have no id until they are published
+    return uuid.uuid4().hex
+
+
+def _staged_targets(kind):
+    return set(db.session.scalars(select(ContentDraft.target_id).where(ContentDraft.kind == kind)))
+
+
+def _vowel_ids():
+    # Live vowels and staged ones; drafts are applied in order, so a new vowel is in place
+    # before the lessons, quizzes and word examples staged after it
+    return set(db.session.scalars(select(Vowel.id))) | _staged_targets("vowel")
+
+
+def stage_lesson_instructions(lesson_id, instructions):
+    """
+    Stages new instructions for a lesson. Returns None if the lesson does not exist.
+    """
+    if not db.session.get(Lesson, lesson_id):
+        return None
+    return _stage("lesson", lesson_id, {"instructions": list(instructions[:5])})
+
+
+def stage_lessons(payloads, atomic=True):
+    """
+    Stages new lessons, one draft each, keyed by vowel (a vowel has at most one lesson, live
+    or staged). With atomic=True any invalid item stages nothing.
+    Returns (staged, errors) where staged is a list of {"index", "draft"}.
+    """
+    taken = set(db.session.scalars(select(Lesson.vowel_id))) | _staged_targets("new_lesson")
+    valid, errors = validate_lessons(payloads, _vowel_ids(), taken)
+    if not valid or (atomic and errors):
+        return [], errors
+    drafts = _stage_all("new_lesson", [
+        (vowel_id, {"vowel_id": vowel_id, "instructions": instructions}) for _, vowel_id, instructions in valid
+    ])
+    return [{"index": index, "draft": draft.to_dict()} for draft, (index, _, _) in zip(drafts, valid)], errors
+
+
+def stage_lesson_deletion(lesson_id):
+    """
+    Stages the deletion of a lesson. Returns None if the lesson does not exist.
+    """
+    if not db.session.get(Lesson, lesson_id):
+        return None
+    return _stage("lesson_deletion", lesson_id, {})
+
+
+def stage_quiz_options(quiz_id, options):
+    """
+    Stages a replacement option list for a quiz. Returns None if the quiz does not exist.
+    """
+    if not db.session.get(QuizItem, quiz_id):
+        return None
+    return _stage("quiz", quiz_id, {"options": options})
+
+
+def stage_quizzes(payloads, atomic=True):
+    """
+    Stages new quizzes (payloads shaped like the POST /quiz/ body), one draft each.
+    With atomic=True any invalid item stages nothing.
+    Returns (staged, errors) where staged is a list of {"index", "draft"}.
+    """
+    valid, errors = validate_quizzes(payloads, _vowel_ids())
+    if not valid or (atomic and errors):
+        return [], errors
+    drafts = stage_new_quizzes([(item, options) for _, item, options in valid])
+    return [{"index": index, "draft": draft.to_dict()} for draft, (index, _, _) in zip(drafts, valid)], errors
+
+
+def stage_new_quizzes(quizzes):
+    """
+    Stages validated (item, options) pairs as new quizzes. Returns the drafts.
+    """
+    return _stage_all("new_quiz", [(_new_target(), {"item": item, "options": options}) for item, options in quizzes])
+
+
+def staged_quiz_prompts():
+    """
+    (prompt_word, vowel_id) of the new quizzes waiting to be published.
+    """
+    drafts = db.session.scalars(select(ContentDraft.payload).where(ContentDraft.kind == "new_quiz"))
+    return {(payload["item"]["prompt_word"], payload["item"]["vowel_id"]) for payload in drafts}
+
+
+def stage_quiz_deletion(quiz_id):
+    """
+    Stages the deletion of a quiz. Returns None if the quiz does not exist.
+    """
+    if not db.session.get(QuizItem, quiz_id):
+        return None
+    return _stage("quiz_deletion", quiz_id, {})
+
+
+def stage_vowel(data):
+    """
+    Stages a new vowel. Raises ValueError if a live vowel already uses the ID.
+    """
+    if db.session.get(Vowel, data["id"]):
+        raise ValueError("Vowel with this ID already exists")
+    return _stage("vowel", data["id"], {field: data[field] for field in VOWEL_FIELDS})
+
+
+def stage_word_examples(payloads, atomic=True):
+    """
+    Stages a batch of new word examples as a single draft, with vowels filled in by the
+    grapheme-to-phoneme lookup now. With atomic=True any invalid item stages nothing.
+    Returns (draft, errors); draft is None when nothing was staged.
+    """
+    valid, errors = validate_word_examples(payloads, _vowel_ids())
+    if not valid or (atomic and errors):
+        return None, errors
+    return _stage("word_examples", _new_target(), {"rows": [row for _, row in valid]}), errors
+
+
+def get_drafts():
+    """
+    Returns the staged edits in the order they will be applied.
+    """
+    return ContentDraft.query.order_by(ContentDraft.id).all()
+
+
+def discard_drafts():
+    """
+    Drops every staged edit. Returns how many were discarded.
+    """
+    deleted = ContentDraft.query.delete()
+    db.session.commit()
+    return deleted
+
+
+def _apply_new_lesson(payload):
+    vowel_id = payload["vowel_id"]
+    if not db.session.get(Vowel, vowel_id) or Lesson.query.filter_by(vowel_id=vowel_id).first():
+        return None
+    lesson = create_lesson(vowel_id, payload["instructions"], commit=False)
+    db.session.flush()
+    return lesson
+
+
+def _apply_new_quiz(payload):
+    vowel_id = payload["item"].get("vowel_id")
+    if vowel_id is not None and not db.session.get(Vowel, vowel_id):
+        return None
+    return insert_quizzes([(payload["item"], payload["options"])])[0]
+
+
+def _apply_word_examples(payload, example_ids):
+    vowel_ids = set(db.session.scalars(select(Vowel.id)))
+    rows = [row for row in payload["rows"] if row["vowel_id"] in vowel_ids]
+    if not rows:
+        return None
+    ids = insert_word_examples(rows)
+    example_ids.extend(ids)
+    return ids
+
+
+def _apply_draft(draft, example_ids):
+    if draft.kind == "lesson":
+        return update_lesson_instructions(int(draft.target_id), draft.payload["instructions"], commit=False)
+    if draft.kind == "new_lesson":
+        return _apply_new_lesson(draft.payload)
+    if draft.kind == "lesson_deletion":
+        return delete_lesson(int(draft.target_id), commit=False) or None
+    if draft.kind == "quiz":
+        return update_quiz_options(int(draft.target_id), draft.payload["options"], commit=False)
+    if draft.kind == "new_quiz":
+        return _apply_new_quiz(draft.payload)
+    if draft.kind == "quiz_deletion":
+        return delete_quiz(int(draft.target_id), commit=False) or None
+    if draft.kind == "word_examples":
+        return _apply_word_examples(draft.payload, example_ids)
+    if draft.kind == "vowel":
+        vowel = db.session.get(Vowel, draft.target_id)
+        if vowel:
+            return None
+        vowel = Vowel(**draft.payload)
+        db.session.add(vowel)
+        db.session.flush()
+        return vowel
+    return None
+
+
+def _created_ids(kind, result):
+    # Ids of the rows a creation draft inserted; they only exist once it is published
+    if kind in ("new_lesson", "vowel"):
+        return [result.id]
+    if kind == "new_quiz":
+        return [result]
+    if kind == "word_examples":
+        return list(result)
+    return None
+
+
+def publish(note=None):
+    """
+    Applies every staged edit and swaps the live content version in a single transaction.
+
+    Readers keep seeing the previous version until the commit, then the snapshot is rebuilt once.
+    Minimal pairs are brought up to date in the same transaction.
+    Drafts whose target disappeared (or whose vowel ID got taken) are dropped and reported as skipped.
+    Applied creation drafts (new lessons, quizzes, vowels and word examples) carry the ids of
+    the rows they inserted as "created_ids", in the order they were staged.
+    """
+    drafts = get_drafts()
+    if not drafts:
+        return {"version": refresh()["version"], "applied": [], "skipped": []}
+
+    applied, skipped, example_ids = [], [], []
+
+    try:
+        for draft in drafts:
+            result = _apply_draft(draft, example_ids)
+            if result is None:
+                skipped.append(draft.to_dict())
+            else:
+                created_ids = _created_ids(draft.kind, result)
+                applied.append({**draft.to_dict(), **({"created_ids": created_ids} if created_ids else {})})
+            db.session.delete(draft)
+
+        refresh_pairs(commit=False)
+        release = bump_content_version(note=note, change_count=len(applied))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if example_ids:
+        index_word_examples(release.id, example_ids)
+    snapshot = refresh()
+    return {"version": snapshot["version"], "applied": applied, "skipped": skipped}
@@ -1,5 +1,11 @@
+from sqlalchemy import delete, insert, select, update
+
 from src.db import db
+from src.models.phoneme import Vowel, WordExample
 from src.models.quiz import QuizItem, QuizOption
+from src.services.content_cache import bump_content_version
+
+QUIZ_REQUIRED_FIELDS = ("prompt_word", "prompt_ipa", "prompt_audio_url", "correct_options", "wrong_option")
 
 
 def create_quiz(prompt_word, prompt_ipa, prompt_audio_url, options, vowel_id=None):
@@ -13,16 +19,18 @@ def create_quiz(prompt_word, prompt_ipa, prompt_audio_url, options, vowel_id=Non
         vowel_id=vowel_id
     )
 
-    for option in options:
+    for option in with_option_vowels([(vowel_id, options)])[0]:
         quiz_option = QuizOption(
             word=option["word"],
             ipa=option["ipa"],
             audio_url=option["audio_url"],
-            is_correct=option.get("is_correct", False)
+            is_correct=option.get("is_correct", False),
+            vowel_id=option["vowel_id"]
         )
         quiz.options.append(quiz_option)
 
     db.session.add(quiz)
+    bump_content_version("quiz created")
     db.session.commit()
     return quiz
 
@@ -41,38 +49,177 @@ def get_quiz_by_id(quiz_id):
     return QuizItem.query.get(quiz_id)
 
 
-def delete_quiz(quiz_id):
+def delete_quiz(quiz_id, commit=True):
     """
     Deletes a quiz item and its options.
+    With commit=False the change is left in the caller's transaction (used by publishing).
     """
-    quiz = QuizItem.query.get(quiz_id)
+    quiz = db.session.get(QuizItem, quiz_id)
     if quiz:
         db.session.delete(quiz)
-        db.session.commit()
+        if commit:
+            bump_content_version("quiz deleted")
+            db.session.commit()
         return True
     return False
 
 
-def update_quiz_options(quiz_id, new_options):
+def with_option_vowels(quizzes):
+    """
+    The options of (quiz vowel_id, options) pairs with each option's vowel_id filled in unless
+    given: the quiz's vowel for a correct option, and for a wrong one the vowel of the word
+    example with the same audio URL (None if there is none). A wrong option's word and IPA are
+    the prompt's, so without this a wrong answer would count as the quiz's own vowel.
+    """
+    urls = {option["audio_url"] for _, options in quizzes for option in options
+            if not option.get("is_correct") and not option.get("vowel_id")}
+    example_vowels = dict(db.session.execute(
+        select(WordExample.audio_url, WordExample.vowel_id).where(WordExample.audio_url.in_(urls))
+    ).all()) if urls else {}
+    return [
+        [{**option, "vowel_id": option.get("vowel_id")
+          or (vowel_id if option.get("is_correct") else example_vowels.get(option["audio_url"]))}
+         for option in options]
+        for vowel_id, options in quizzes
+    ]
+
+
+def upsert_quiz_options(quizzes):
+    """
+    Sets the options of existing quizzes, given as (quiz_id, options) pairs, in the caller's
+    transaction. Options are matched to the quiz's current ones by audio URL and updated in place,
+    keeping their ids, which stored attempts, answer logs and clients refer to; unmatched ones
+    are inserted and options no longer listed are deleted.
+    """
+    current, stale = {}, set()
+    rows = db.session.execute(
+        select(QuizOption.id, QuizOption.quiz_item_id, QuizOption.audio_url)
+        .where(QuizOption.quiz_item_id.in_([quiz_id for quiz_id, _ in quizzes]))
+        .order_by(QuizOption.id)
+    )
+    for option_id, quiz_id, audio_url in rows:
+        current.setdefault((quiz_id, audio_url), []).append(option_id)
+        stale.add(option_id)
+
+    quiz_vowels = dict(db.session.execute(
+        select(QuizItem.id, QuizItem.vowel_id).where(QuizItem.id.in_([quiz_id for quiz_id, _ in quizzes]))
+    ).all())
+    filled = with_option_vowels([(quiz_vowels.get(quiz_id), options) for quiz_id, options in quizzes])
+
+    changed, new = [], []
+    for (quiz_id, _), options in zip(quizzes, filled):
+        for option in options:
+            row = {field: option[field] for field in ("word", "ipa", "audio_url", "vowel_id")}
+            row["is_correct"] = option.get("is_correct", False)
+            matches = current.get((quiz_id, option["audio_url"]))
+            if matches:
+                option_id = matches.pop(0)
+                stale.discard(option_id)
+                changed.append({"id": option_id, **row})
+            else:
+                new.append({"quiz_item_id": quiz_id, **row})
+
+    if stale:
+        db.session.execute(delete(QuizOption).where(QuizOption.id.in_(list(stale))))
+    if changed:
+        db.session.execute(update(QuizOption), changed)
+    if new:
+        db.session.execute(insert(QuizOption), new)
+
+
+def update_quiz_options(quiz_id, new_options, commit=True):
     """
-    Replaces all options for a quiz item with new ones.
+    Replaces the options of a quiz item, updating the ones it keeps in place (see
+    upsert_quiz_options) so their ids stay valid.
+    With commit=False the change is left in the caller's transaction (used by publishing).
     """
-    quiz = QuizItem.query.get(quiz_id)
+    quiz = db.session.get(QuizItem, quiz_id)
     if not quiz:
         return None
 
-    # Clear existing options
-    quiz.options.clear()
-
-    # Add new options
-    for option in new_options:
-        quiz_option = QuizOption(
-            word=option["word"],
-            ipa=option["ipa"],
-            audio_url=option["audio_url"],
-            is_correct=option.get("is_correct", False)
-        )
-        quiz.options.append(quiz_option)
+    upsert_quiz_options([(quiz_id, new_options)])
+    db.session.expire(quiz, ["options"])
 
-    db.session.commit()
+    if commit:
+        bump_content_version("quiz updated")
+        db.session.commit()
     return quiz
+
+
+def build_quiz_options(prompt_word, prompt_ipa, correct_options, wrong_option):
+    """
+    Builds the answer options of a quiz from its correct audio URLs and the wrong one.
+    """
+    options = [{"word": prompt_word, "ipa": prompt_ipa, "audio_url": url, "is_correct": True}
+               for url in correct_options]
+
+    options.append({
+        "word": prompt_word,
+        "ipa": prompt_ipa,
+        "audio_url": wrong_option,
+        "is_correct": False
+    })
+    return options
+
+
+def validate_quiz_payload(data, vowel_ids):
+    """
+    Checks one quiz payload (same shape as POST /quiz/) and returns its item row and options.
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Quiz must be an object")
+    for field in QUIZ_REQUIRED_FIELDS:
+        if not data.get(field):
+            raise ValueError(f"Missing field: {field}")
+    if not isinstance(data["correct_options"], list):
+        raise ValueError("correct_options must be a list of audio URLs")
+
+    vowel_id = data.get("vowel_id")
+    if vowel_id is not None and vowel_id not in vowel_ids:
+        raise ValueError(f"Vowel not found: {vowel_id}")
+
+    item = {
+        "prompt_word": data["prompt_word"],
+        "prompt_ipa": data["prompt_ipa"],
+        "prompt_audio_url": data["prompt_audio_url"],
+        "vowel_id": vowel_id,
+    }
+    options = build_quiz_options(data["prompt_word"], data["prompt_ipa"], data["correct_options"], data["wrong_option"])
+    return item, options
+
+
+def insert_quizzes(quizzes):
+    """
+    Bulk-inserts (item, options) pairs in the caller's transaction: one multi-row insert for
+    the items and one for all of their options. Returns the new quiz ids in input order.
+    """
+    quiz_ids = db.session.scalars(
+        insert(QuizItem).returning(QuizItem.id, sort_by_parameter_order=True),
+        [item for item, _ in quizzes]
+    ).all()
+    filled = with_option_vowels([(item.get("vowel_id"), options) for item, options in quizzes])
+    db.session.execute(insert(QuizOption), [
+        {"quiz_item_id": quiz_id, **option}
+        for quiz_id, options in zip(quiz_ids, filled)
+        for option in options
+    ])
+    return quiz_ids
+
+
+def validate_quizzes(payloads, vowel_ids=None):
+    """
+    Checks a batch of quiz payloads (each shaped like the POST /quiz/ body) against the given
+    vowel ids (default: the live vowels).
+    Returns (valid, errors): valid is a list of (index, item, options), errors of {"index", "error"}.
+    """
+    if vowel_ids is None:
+        vowel_ids = set(db.session.scalars(select(Vowel.id)))
+    valid, errors = [], []
+
+    for index, data in enumerate(payloads):
+        try:
+            valid.append((index, *validate_quiz_payload(data, vowel_ids)))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    return valid, errors
@@ -0,0 +1,263 @@
+# src/services/quiz_generator.py
+import math
+import random
+import threading
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import select
+
+from src.db import db, reading
+from src.models.phoneme import Vowel, WordExample
+from src.models.quiz import QuizItem
+from src.services.content import IPA_TO_VOWEL_ID
+from src.services.content_cache import live_version
+from src.services.grading import score_answers
+from src.services.publishing import stage_new_quizzes, staged_quiz_prompts
+
+# Approximate position of each vowel on the IPA chart: (height, backness), with
+# height from close (0) to open (6) and backness from front (0) to back (2).
+# Vowels that sit close together are the ones learners confuse, so they make the best distractors.
+VOWEL_CHART = {
+    "i": (0.0, 0.0),
+    "ɪ": (1.0, 0.3),
+    "e": (2.0, 0.0),
+    "ɛ": (3.0, 0.0),
+    "æ": (5.0, 0.0),
+    "ə": (3.0, 1.0),
+    "ʌ": (4.0, 1.7),
+    "ɑ": (6.0, 2.0),
+    "ɔ": (4.0, 2.0),
+    "o": (2.0, 2.0),
+    "ʊ": (1.0, 1.7),
+    "u": (0.0, 2.0),
+}
+
+DEFAULT_CORRECT_COUNT = 1
+DEFAULT_DISTRACTOR_COUNT = 2
+NEIGHBOUR_COUNT = 3
+
+
+class InvalidQuizToken(ValueError):
+    """A session quiz token that is forged, from another session or outlived its words."""
+
+
+def neighbouring_vowels(vowel_ids, count=NEIGHBOUR_COUNT):
+    """
+    For each vowel ID, the `count` nearest other vowels on the chart, nearest first.
+    Vowels missing from the chart are neighbours of nothing and get no neighbours.
+    """
+    positions = {
+        vowel_id: VOWEL_CHART[ipa] for ipa, vowel_id in IPA_TO_VOWEL_ID.items()
+        if vowel_id in vowel_ids and ipa in VOWEL_CHART
+    }
+    return {
+        vowel_id: sorted(
+            (other for other in positions if other != vowel_id),
+            key=lambda other: (math.dist(position, positions[other]), other)
+        )[:count]
+        for vowel_id, position in positions.items()
+    }
+
+
+class QuizPools:
+    """
+    Per-vowel candidate pools: the word examples of each vowel and the vowels whose
+    examples serve as its distractors. Built from one column-only read per content version.
+    """
+
+    def __init__(self, version, examples_by_vowel, phonemes):
+        self.version = version
+        self.examples_by_vowel = examples_by_vowel
+        self.phonemes = phonemes
+        self.neighbours = neighbouring_vowels(set(examples_by_vowel))
+        self.examples = {example["id"]: example for examples in examples_by_vowel.values() for example in examples}
+
+    def prompts(self, vowel_ids=None):
+        """
+        Word examples that can anchor a quiz: their vowel has another example to be the
+        correct answer and at least one neighbour with examples to draw distractors from.
+        """
+        for vowel_id in sorted(vowel_ids or self.examples_by_vowel):
+            examples = self.examples_by_vowel.get(vowel_id, [])
+            if len(examples) < 2 or not any(self.examples_by_vowel.get(n) for n in self.neighbours.get(vowel_id, ())):
+                continue
+            yield from examples
+
+    def _option(self, example, is_correct):
+        return {
+            "word_example_id": example["id"],
+            "word": example["word"],
+            "ipa": example["ipa"] or self.phonemes[example["vowel_id"]],
+            "audio_url": example["audio_url"],
+            "is_correct": is_correct,
+            "vowel_id": example["vowel_id"],
+        }
+
+    def build(self, prompt, rng, correct_count=DEFAULT_CORRECT_COUNT, distractor_count=DEFAULT_DISTRACTOR_COUNT):
+        """
+        One quiz for a prompt word: pick the option(s) sharing its vowel. Correct options come
+        from the same vowel, distractors from its neighbours, nearest vowel first.
+        Returns (item, options) or None when the pools are too small.
+        """
+        vowel_id = prompt["vowel_id"]
+        same = [example for example in self.examples_by_vowel.get(vowel_id, []) if example["id"] != prompt["id"]]
+        if not same:
+            return None
+        correct = rng.sample(same, min(correct_count, len(same)))
+
+        distractors = []
+        neighbours = [n for n in self.neighbours.get(vowel_id, ()) if self.examples_by_vowel.get(n)]
+        for i in range(distractor_count):
+            if not neighbours:
+                break
+            pool = self.examples_by_vowel[neighbours[i % len(neighbours)]]
+            choices = [example for example in pool if example not in distractors]
+            if choices:
+                distractors.append(rng.choice(choices))
+        if not distractors:
+            return None
+
+        options = [self._option(e, True) for e in correct] + [self._option(e, False) for e in distractors]
+        rng.shuffle(options)
+        item = {
+            "prompt_word": prompt["word"],
+            "prompt_ipa": prompt["ipa"] or self.phonemes[vowel_id],
+            "prompt_audio_url": prompt["audio_url"],
+            "vowel_id": vowel_id,
+        }
+        return item, options
+
+
+_lock = threading.Lock()
+_pools = None
+
+
+def build_pools(version):
+    examples_by_vowel = {}
+    rows = db.session.execute(
+        select(WordExample.id, WordExample.word, WordExample.ipa, WordExample.audio_url, WordExample.vowel_id)
+        .order_by(WordExample.id)
+    ).mappings()
+    for row in rows:
+        examples_by_vowel.setdefault(row["vowel_id"], []).append(dict(row))
+    phonemes = dict(db.session.execute(select(Vowel.id, Vowel.phoneme)).all())
+    return QuizPools(version, examples_by_vowel, phonemes)
+
+
+def get_pools():
+    """
+    The pools for the live content version, rebuilt only when the version moves.
+    """
+    global _pools
+    version = live_version()
+    if _pools is None or _pools.version != version:
+        with _lock:
+            if _pools is None or _pools.version != version:
+                with reading():
+                    _pools = build_pools(version)
+    return _pools
+
+
+def _rng(seed, *parts):
+    # String seeds hash deterministically across processes, unlike hash()
+    return random.Random(":".join(str(part) for part in (seed, *parts)))
+
+
+def generate_quizzes(vowel_ids=None, seed=0, correct_count=DEFAULT_CORRECT_COUNT,
+                     distractor_count=DEFAULT_DISTRACTOR_COUNT, skip_existing=True, limit=None):
+    """
+    Generates one quiz per eligible word example and stages them for the next publish.
+
+    Each quiz draws from its own generator seeded with (seed, word example id), so a rerun with
+    the same seed reproduces the same quizzes regardless of which other words exist.
+    With skip_existing, prompts that already have a quiz for their vowel, live or staged, are
+    left out. Returns the drafts.
+    """
+    pools = get_pools()
+    existing = set()
+    if skip_existing:
+        existing = set(db.session.execute(select(QuizItem.prompt_word, QuizItem.vowel_id)).all())
+        existing |= staged_quiz_prompts()
+
+    quizzes = []
+    for prompt in pools.prompts(vowel_ids):
+        if (prompt["word"], prompt["vowel_id"]) in existing:
+            continue
+        quiz = pools.build(prompt, _rng(seed, prompt["id"]), correct_count, distractor_count)
+        if quiz:
+            item, options = quiz
+            quizzes.append((item, [{k: v for k, v in o.items() if k != "word_example_id"} for o in options]))
+        if limit and len(quizzes) >= limit:
+            break
+
+    if not quizzes:
+        return []
+
+    try:
+        return stage_new_quizzes(quizzes)
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _serializer():
+    return URLSafeSerializer(current_app.config["SECRET_KEY"], salt="session-quiz")
+
+
+def generate_session_quiz(session_id, seed=None, vowel_id=None, correct_count=DEFAULT_CORRECT_COUNT,
+                          distractor_count=DEFAULT_DISTRACTOR_COUNT):
+    """
+    A quiz for a session, drawn at random from the pools; the same (session_id, seed) always
+    gives the same quiz while the word examples stay the same. Nothing is written: the quiz
+    lives only in the response. Its options are identified by word example id and come without
+    answer flags; the signed token lists them, so grade_session_quiz can check the answers.
+    Returns None if no quiz can be built.
+    """
+    seed = seed if seed is not None else random.getrandbits(32)
+    rng = _rng(seed, session_id)
+    pools = get_pools()
+
+    prompts = list(pools.prompts([vowel_id] if vowel_id else None))
+    while prompts:
+        prompt = prompts.pop(rng.randrange(len(prompts)))
+        quiz = pools.build(prompt, rng, correct_count, distractor_count)
+        if not quiz:
+            continue
+        item, options = quiz
+        option_ids = [option["word_example_id"] for option in options]
+        token = _serializer().dumps({"session_id": session_id, "seed": seed, "vowel_id": item["vowel_id"],
+                                     "options": option_ids})
+        return {
+            **item,
+            "seed": seed,
+            "token": token,
+            "options": [
+                {"id": option["word_example_id"], **{k: option[k] for k in ("word", "ipa", "audio_url")}}
+                for option in options
+            ],
+        }
+    return None
+
+
+def grade_session_quiz(session_id, token, option_ids):
+    """
+    Grades the selected word example ids of a quiz from generate_session_quiz, the way
+    AnswerKey.grade does: an option is correct when its word has the quiz's vowel.
+    Nothing is stored. Returns (score, total).
+    Raises InvalidQuizToken for a bad token and InvalidAnswers for ids not in the quiz or
+    selected twice.
+    """
+    try:
+        payload = _serializer().loads(token)
+    except BadSignature:
+        raise InvalidQuizToken("Invalid quiz token")
+    if payload["session_id"] != session_id:
+        raise InvalidQuizToken("The quiz token belongs to another session")
+
+    examples = get_pools().examples
+    options = set(payload["options"])
+    if not options <= examples.keys():
+        raise InvalidQuizToken("The quiz's words have changed; generate a new quiz")
+    correct = {option_id for option_id in options if examples[option_id]["vowel_id"] == payload["vowel_id"]}
+    return score_answers(option_ids, options, correct, "the session quiz")
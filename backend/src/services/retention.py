@@ -0,0 +1,211 @@
+# src/services/retention.py
+import logging
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db
+from src.models.user import DailyQuizStat, DailyVowelStat
+from src.services.fulltext import rebuild_fulltext_index
+from src.services.idempotency import prune_idempotency_keys
+from src.services.progress import invalidate_progress
+from src.services.sessions import forget_sessions
+
+logger = logging.getLogger(__name__)
+
+# Oldest rows first by rowid: expired rows sit at the start of the table, so each batch
+# is found without scanning past them.
+EXPIRED_ATTEMPTS_SQL = text("""
+    SELECT a.id, a.quiz_id, a.score, a.total, a.attempted_at, q.vowel_id
+    FROM quiz_attempts a
+    LEFT JOIN quiz_items q ON q.id = a.quiz_id
+    WHERE a.attempted_at < :cutoff
+    ORDER BY a.id
+    LIMIT :limit
+""")
+DELETE_ATTEMPTS_SQL = text("DELETE FROM quiz_attempts WHERE id IN :ids").bindparams(bindparam("ids", expanding=True))
+DELETE_ANSWERS_SQL = text("""
+    DELETE FROM quiz_logs WHERE id IN (
+        SELECT id FROM quiz_logs WHERE answered_at < :cutoff ORDER BY answered_at LIMIT :limit
+    )
+""")
+
+# Sessions with no attempt (latest_quiz_scores), answer (quiz_logs), review or review due, or
+# completed lesson since the cutoff, and in no cohort. Anonymous browser sessions that were
+# abandoned, in practice. quiz_logs has no session_id index: its recent rows are read once,
+# through the answered_at index, rather than per session.
+EXPIRED_SESSIONS_SQL = text("""
+    SELECT s.session_id FROM user_sessions s
+    WHERE s.started_at < :cutoff
+      AND NOT EXISTS (SELECT 1 FROM latest_quiz_scores l WHERE l.session_id = s.session_id AND l.attempted_at >= :cutoff)
+      AND NOT EXISTS (SELECT 1 FROM completed_lessons c WHERE c.session_id = s.session_id AND c.completed_at >= :cutoff)
+      AND NOT EXISTS (SELECT 1 FROM review_states r WHERE r.session_id = s.session_id
+                      AND (r.reviewed_at >= :cutoff OR r.due_at >= :cutoff))
+      AND s.session_id NOT IN (SELECT q.session_id FROM quiz_logs q
+                               WHERE q.answered_at >= :cutoff AND q.session_id IS NOT NULL)
+      AND NOT EXISTS (SELECT 1 FROM cohort_members m WHERE m.session_id = s.session_id)
+    ORDER BY s.id
+    LIMIT :limit
+""")
+# Every table with per-session rows; the global confusion totals (session_id '') are kept.
+# All but quiz_logs are looked up through an index on session_id; quiz_logs is kept short by
+# the answer retention, which normally has removed these sessions' answers already.
+SESSION_TABLES = (
+    "completed_lessons", "quiz_attempts", "quiz_logs", "review_states", "latest_quiz_scores",
+    "vowel_stats", "word_stats", "vowel_confusions", "cohort_members", "user_sessions",
+)
+
+
+def _bound(value):
+    # Matches how SQLAlchemy stores DateTime in SQLite, for comparisons in raw SQL
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _pause():
+    # Lets writers waiting on the database lock in between batches
+    time.sleep(current_app.config.get("RETENTION_PAUSE", 0.0))
+
+
+def _add_counts(model, key, rows):
+    statement = insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=["day", key],
+        set_={column: getattr(model, column) + statement.excluded[column] for column in ("attempts", "score", "total")},
+    )
+    db.session.execute(statement, rows)
+
+
+def roll_up_attempts(cutoff, batch_size):
+    """
+    Moves quiz attempts older than cutoff into daily_quiz_stats and daily_vowel_stats, one
+    batch per transaction: the batch is added to the daily counts and deleted together, so
+    an interrupted run neither loses nor double-counts attempts. Returns the number rolled up.
+    """
+    rolled = 0
+    while True:
+        rows = db.session.execute(EXPIRED_ATTEMPTS_SQL, {"cutoff": cutoff, "limit": batch_size}).all()
+        if not rows:
+            break
+        quizzes, vowels = Counter(), Counter()
+        for _, quiz_id, score, total, attempted_at, vowel_id in rows:
+            day = date.fromisoformat(str(attempted_at)[:10])
+            for counter, key in ((quizzes, (day, quiz_id)), (vowels, (day, vowel_id))):
+                if key[1] is None:
+                    continue
+                counter[key + ("attempts",)] += 1
+                counter[key + ("score",)] += score
+                counter[key + ("total",)] += total
+
+        for model, key, counter in ((DailyQuizStat, "quiz_id", quizzes), (DailyVowelStat, "vowel_id", vowels)):
+            keys = {(day, value) for day, value, _ in counter}
+            if keys:
+                _add_counts(model, key, [{
+                    "day": day,
+                    key: value,
+                    "attempts": counter[(day, value, "attempts")],
+                    "score": counter[(day, value, "score")],
+                    "total": counter[(day, value, "total")],
+                } for day, value in keys])
+        db.session.execute(DELETE_ATTEMPTS_SQL, {"ids": [row[0] for row in rows]})
+        db.session.commit()
+        rolled += len(rows)
+        if len(rows) < batch_size:
+            break
+        _pause()
+    return rolled
+
+
+def delete_old_answers(cutoff, batch_size):
+    """
+    Deletes per-answer log rows older than cutoff in batches. Returns the number deleted.
+    """
+    deleted = 0
+    while True:
+        count = db.session.execute(DELETE_ANSWERS_SQL, {"cutoff": cutoff, "limit": batch_size}).rowcount
+        db.session.commit()
+        deleted += count
+        if count < batch_size:
+            break
+        _pause()
+    return deleted
+
+
+def delete_expired_sessions(cutoff, batch_size):
+    """
+    Deletes sessions idle since cutoff with everything recorded for them, a batch of sessions
+    per transaction. Returns the number of sessions deleted.
+    """
+    deleted = 0
+    while True:
+        session_ids = db.session.scalars(EXPIRED_SESSIONS_SQL, {"cutoff": cutoff, "limit": batch_size}).all()
+        if not session_ids:
+            break
+        for table in SESSION_TABLES:
+            db.session.execute(
+                text(f"DELETE FROM {table} WHERE session_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": session_ids},
+            )
+        db.session.commit()
+        invalidate_progress(*session_ids)
+        forget_sessions(session_ids)
+        deleted += len(session_ids)
+        if len(session_ids) < batch_size:
+            break
+        _pause()
+    return deleted
+
+
+def compact(full=False):
+    """
+    Returns free pages to the filesystem and refreshes the query planner statistics.
+
+    Without `full`, pages are released with PRAGMA incremental_vacuum, which only works once
+    the database uses auto_vacuum=INCREMENTAL. A full VACUUM switches it to that mode; it
+    rewrites the whole file (and blocks writers meanwhile) and may renumber the implicit rowids
+    of `vowels`, so the full-text index is rebuilt after it. Returns the auto_vacuum mode used.
+    """
+    with db.engine.connect() as connection:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+        mode = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        if full:
+            connection.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.exec_driver_sql("VACUUM")
+            mode = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+        elif mode == 2:
+            connection.exec_driver_sql("PRAGMA incremental_vacuum")
+        else:
+            logger.info("auto_vacuum is not INCREMENTAL; run a full vacuum once to enable it")
+        connection.exec_driver_sql("PRAGMA analysis_limit = 1000")
+        connection.exec_driver_sql("ANALYZE")
+    if full:
+        rebuild_fulltext_index()
+    return {0: "none", 1: "full", 2: "incremental"}.get(mode, str(mode))
+
+
+def apply_retention(retention_days=None, session_ttl_days=None, batch_size=None, vacuum=False, now=None):
+    """
+    Runs the whole retention pass: attempt roll-up, answer and session deletion, compaction.
+    Returns a summary dict.
+    """
+    config = current_app.config
+    now = now or datetime.utcnow()
+    retention_days = config["RETENTION_DAYS"] if retention_days is None else retention_days
+    session_ttl_days = config["SESSION_TTL_DAYS"] if session_ttl_days is None else session_ttl_days
+    batch_size = batch_size or config["RETENTION_BATCH_SIZE"]
+    cutoff = _bound(now - timedelta(days=retention_days))
+    session_cutoff = _bound(now - timedelta(days=session_ttl_days))
+
+    summary = {
+        "attempts_rolled_up": roll_up_attempts(cutoff, batch_size),
+        "answers_deleted": delete_old_answers(cutoff, batch_size),
+        "sessions_deleted": delete_expired_sessions(session_cutoff, batch_size),
+    }
+    summary["idempotency_keys_deleted"] = prune_idempotency_keys(
+        now - timedelta(seconds=config["IDEMPOTENCY_TTL"]), batch_size
+    )
+    summary["auto_vacuum"] = compact(full=vacuum)
+    return summary
@@ -0,0 +1,198 @@
+# src/services/review.py
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db, reading
+from src.models.user import ReviewState
+
+# SM-2 parameters. A failed review comes back within the same sitting rather than the next day.
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL = 1.0    # days
+SECOND_INTERVAL = 6.0   # days
+RELEARN_INTERVAL = 10 / (24 * 60)   # 10 minutes, in days
+PASSING_QUALITY = 3
+
+REVIEW_COLUMNS = ("repetitions", "ease", "interval", "due_at", "reviewed_at")
+
+
+def quality_of(score, total):
+    """
+    Maps a quiz score to an SM-2 response quality from 0 (blackout) to 5 (perfect).
+    """
+    return round(5 * score / total) if total else 0
+
+
+def sm2(repetitions, ease, interval, quality, now):
+    """
+    One SM-2 step. Returns (repetitions, ease, interval, due_at).
+    """
+    if quality < PASSING_QUALITY:
+        repetitions, interval = 0, RELEARN_INTERVAL
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = FIRST_INTERVAL
+        elif repetitions == 2:
+            interval = SECOND_INTERVAL
+        else:
+            interval = interval * ease
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, ease, interval, now + timedelta(days=interval)
+
+
+class ReviewQueue:
+    """
+    The due times of one session's quizzes in a min-heap.
+
+    Rescheduling pushes a new entry and leaves the old one in place; entries whose due time
+    no longer matches `states` are dropped when they reach the top (lazy deletion), so an
+    update costs O(log n).
+    """
+
+    def __init__(self, rows=()):
+        self.states = {}    # quiz_id -> (repetitions, ease, interval, due_at)
+        self.heap = []      # (due_at, quiz_id)
+        self.loaded_at = time.monotonic()
+        for quiz_id, repetitions, ease, interval, due_at in rows:
+            self.states[quiz_id] = (repetitions, ease, interval, due_at)
+            self.heap.append((due_at, quiz_id))
+        heapq.heapify(self.heap)
+
+    def __contains__(self, quiz_id):
+        return quiz_id in self.states
+
+    def schedule(self, quiz_id, state):
+        self.states[quiz_id] = state
+        heapq.heappush(self.heap, (state[3], quiz_id))
+        # Keep stale entries from piling up for learners who review the same few quizzes often
+        if len(self.heap) > 2 * len(self.states) + 16:
+            self.heap = [(s[3], q) for q, s in self.states.items()]
+            heapq.heapify(self.heap)
+
+    def due(self, now, limit):
+        """
+        Up to `limit` quiz ids due at `now`, most overdue first. The heap is left unchanged.
+        """
+        taken, result = [], []
+        while self.heap and len(result) < limit and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            state = self.states.get(entry[1])
+            if state is None or state[3] != entry[0] or entry[1] in result:
+                continue
+            taken.append(entry)
+            result.append(entry[1])
+        for entry in taken:
+            heapq.heappush(self.heap, entry)
+        return result
+
+    def next_due_at(self):
+        while self.heap:
+            due_at, quiz_id = self.heap[0]
+            state = self.states.get(quiz_id)
+            if state is not None and state[3] == due_at:
+                return due_at
+            heapq.heappop(self.heap)
+        return None
+
+
+_lock = threading.Lock()
+_queues = OrderedDict()
+
+
+def _load_queue(session_id):
+    rows = db.session.execute(
+        select(ReviewState.quiz_id, ReviewState.repetitions, ReviewState.ease, ReviewState.interval,
+               ReviewState.due_at)
+        .where(ReviewState.session_id == session_id)
+    ).all()
+    return ReviewQueue(rows)
+
+
+def get_queue(session_id):
+    """
+    The session's review queue from the in-process LRU, loaded from review_states on a miss
+    or once it is older than REVIEW_QUEUE_TTL (other workers may have scheduled reviews).
+    """
+    ttl = current_app.config.get("REVIEW_QUEUE_TTL", 30.0)
+    with _lock:
+        queue = _queues.get(session_id)
+        if queue is not None and time.monotonic() - queue.loaded_at < ttl:
+            _queues.move_to_end(session_id)
+            return queue
+
+    with reading():
+        queue = _load_queue(session_id)
+    with _lock:
+        _queues[session_id] = queue
+        _queues.move_to_end(session_id)
+        while len(_queues) > current_app.config.get("REVIEW_QUEUE_CACHE_SIZE", 10000):
+            _queues.popitem(last=False)
+    return queue
+
+
+def reschedule(session_id, quiz_id, score, total, now=None):
+    """
+    The review_states row an attempt leads to. The in-memory queue is left as it is until
+    the attempt is recorded (see apply_review).
+    """
+    now = now or datetime.utcnow()
+    queue = get_queue(session_id)
+    with _lock:
+        repetitions, ease, interval, _ = queue.states.get(quiz_id, (0, DEFAULT_EASE, 0.0, now))
+    repetitions, ease, interval, due_at = sm2(repetitions, ease, interval, quality_of(score, total), now)
+    return {
+        "session_id": session_id,
+        "quiz_id": quiz_id,
+        "repetitions": repetitions,
+        "ease": ease,
+        "interval": interval,
+        "due_at": due_at,
+        "reviewed_at": now,
+    }
+
+
+def apply_review(row):
+    """
+    Schedules a review_states row from reschedule in the session's in-memory queue.
+    """
+    queue = get_queue(row["session_id"])
+    with _lock:
+        queue.schedule(row["quiz_id"], (row["repetitions"], row["ease"], row["interval"], row["due_at"]))
+
+
+def save_review_states(rows):
+    """
+    Upserts review_states rows in the caller's transaction, in one executemany.
+    Later rows for the same (session, quiz) win.
+    """
+    if not rows:
+        return
+    statement = insert(ReviewState)
+    statement = statement.on_conflict_do_update(
+        index_elements=["session_id", "quiz_id"],
+        set_={column: statement.excluded[column] for column in REVIEW_COLUMNS},
+    )
+    db.session.execute(statement, rows)
+
+
+def next_quizzes(session_id, quiz_ids, limit=10, now=None):
+    """
+    Quiz ids to show next: reviews that are due, most overdue first, then quizzes the session
+    has never attempted (in `quiz_ids` order) to fill the remaining slots.
+    Returns (quiz ids, next due time of the rest or None).
+    """
+    now = now or datetime.utcnow()
+    queue = get_queue(session_id)
+    with _lock:
+        available = set(quiz_ids)
+        due = [quiz_id for quiz_id in queue.due(now, limit) if quiz_id in available]
+        new = [quiz_id for quiz_id in quiz_ids if quiz_id not in queue][:limit - len(due)]
+        return due + new, queue.next_due_at()
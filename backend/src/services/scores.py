@@ -0,0 +1,110 @@
+# src/services/scores.py
+from sqlalchemy import case, select, text
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db
+from src.models.user import LatestQuizScore
+
+LATEST_COLUMNS = ("score", "total", "attempted_at")
+BEST_COLUMNS = ("best_score", "best_total", "best_at")
+
+
+def _ratio(score, total):
+    return score / total if total else 0.0
+
+
+def _summarize(records):
+    # One row per (session, quiz): the batch's latest and best attempt and its attempt count
+    rows = {}
+    for r in records:
+        key = (r["session_id"], r["quiz_id"])
+        row = rows.get(key)
+        if row is None:
+            rows[key] = {
+                "session_id": r["session_id"], "quiz_id": r["quiz_id"],
+                "score": r["score"], "total": r["total"], "attempted_at": r["attempted_at"],
+                "best_score": r["score"], "best_total": r["total"], "best_at": r["attempted_at"],
+                "attempts": 1,
+            }
+            continue
+        row["attempts"] += 1
+        if r["attempted_at"] >= row["attempted_at"]:
+            row.update(score=r["score"], total=r["total"], attempted_at=r["attempted_at"])
+        if _ratio(r["score"], r["total"]) > _ratio(row["best_score"], row["best_total"]):
+            row.update(best_score=r["score"], best_total=r["total"], best_at=r["attempted_at"])
+    return list(rows.values())
+
+
+def save_latest_scores(records):
+    """
+    Folds a batch of attempts into latest_quiz_scores with one executemany upsert in the
+    caller's transaction. An older attempt (e.g. replayed from the log) never replaces a newer
+    latest score, and the best score only moves up.
+    """
+    if not records:
+        return
+    statement = insert(LatestQuizScore)
+    new = statement.excluded
+    is_newer = new.attempted_at >= LatestQuizScore.attempted_at
+    is_better = new.best_score * 1.0 / new.best_total > LatestQuizScore.best_score * 1.0 / LatestQuizScore.best_total
+
+    set_ = {"attempts": LatestQuizScore.attempts + new.attempts}
+    set_.update({column: case((is_newer, new[column]), else_=getattr(LatestQuizScore, column))
+                 for column in LATEST_COLUMNS})
+    set_.update({column: case((is_better, new[column]), else_=getattr(LatestQuizScore, column))
+                 for column in BEST_COLUMNS})
+    db.session.execute(
+        statement.on_conflict_do_update(index_elements=["session_id", "quiz_id"], set_=set_),
+        _summarize(records),
+    )
+
+
+def get_latest_score(session_id, quiz_id):
+    """
+    Primary-key lookup of a session's latest and best score at a quiz, or None.
+    """
+    return db.session.get(LatestQuizScore, (session_id, quiz_id))
+
+
+def get_latest_scores(session_id):
+    """
+    All of a session's latest scores, by quiz id, in one range scan of the primary key.
+    """
+    return db.session.scalars(
+        select(LatestQuizScore).where(LatestQuizScore.session_id == session_id).order_by(LatestQuizScore.quiz_id)
+    ).all()
+
+
+REBUILD_SQL = """
+    INSERT INTO latest_quiz_scores
+        (session_id, quiz_id, score, total, attempted_at, best_score, best_total, best_at, attempts)
+    SELECT a.session_id, a.quiz_id, latest.score, latest.total, latest.attempted_at,
+           best.score, best.total, best.attempted_at, a.attempts
+    FROM (
+        SELECT session_id, quiz_id, COUNT(*) AS attempts
+        FROM quiz_attempts
+        WHERE session_id IS NOT NULL
+        GROUP BY session_id, quiz_id
+    ) AS a
+    JOIN quiz_attempts AS latest ON latest.id = (
+        SELECT id FROM quiz_attempts
+        WHERE session_id = a.session_id AND quiz_id = a.quiz_id
+        ORDER BY attempted_at DESC, id DESC LIMIT 1
+    )
+    JOIN quiz_attempts AS best ON best.id = (
+        SELECT id FROM quiz_attempts
+        WHERE session_id = a.session_id AND quiz_id = a.quiz_id
+        ORDER BY score * 1.0 / total DESC, attempted_at DESC LIMIT 1
+    )
+"""
+
+
+def rebuild_latest_scores():
+    """
+    Recomputes latest_quiz_scores from quiz_attempts. Each correlated lookup is an index seek
+    on (session_id, quiz_id, attempted_at).
+    """
+    db.session.execute(text("DELETE FROM latest_quiz_scores"))
+    count = db.session.execute(text(REBUILD_SQL)).rowcount
+    db.session.commit()
+    return count
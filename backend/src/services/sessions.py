@@ -0,0 +1,80 @@
+# src/services/sessions.py
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from src.db import db
+from src.models.user import UserSession
+
+_lock = threading.Lock()
+_known = OrderedDict()  # session id -> when its user_sessions row was last confirmed, least recently seen first
+
+
+def _remember(session_ids):
+    limit = current_app.config.get("SESSION_CACHE_SIZE", 100000)
+    now = time.monotonic()
+    with _lock:
+        for session_id in session_ids:
+            _known[session_id] = now
+            _known.move_to_end(session_id)
+        while len(_known) > limit:
+            _known.popitem(last=False)
+
+
+def ensure_sessions(session_ids):
+    """
+    Makes sure user_sessions has a row for every id, in the caller's transaction.
+
+    Ids this process confirmed within SESSION_CACHE_TTL seconds are skipped without touching
+    the database; the rest are inserted with one INSERT ... ON CONFLICT DO NOTHING, which is
+    atomic under concurrent first requests. Ids are remembered once the caller's transaction
+    commits. The TTL is what lets a session come back after the retention job (another
+    process) deleted its row: the next attempt after the entry expires inserts it again.
+    Returns the ids that were not known.
+    """
+    cutoff = time.monotonic() - current_app.config.get("SESSION_CACHE_TTL", 3600.0)
+    with _lock:
+        unknown = [session_id for session_id in dict.fromkeys(session_ids) if _known.get(session_id, cutoff) <= cutoff]
+        for session_id in session_ids:
+            if session_id in _known:
+                _known.move_to_end(session_id)
+    if unknown:
+        now = datetime.utcnow()
+        db.session.execute(
+            insert(UserSession).on_conflict_do_nothing(index_elements=["session_id"]),
+            [{"session_id": session_id, "started_at": now} for session_id in unknown],
+        )
+        db.session.info.setdefault("new_sessions", []).extend(unknown)
+    return unknown
+
+
+def ensure_session(session_id):
+    return bool(ensure_sessions([session_id]))
+
+
+def forget_sessions(session_ids):
+    """
+    Drops deleted sessions from this process's known-session cache; other processes insert
+    them again once their entries expire (SESSION_CACHE_TTL).
+    """
+    with _lock:
+        for session_id in session_ids:
+            _known.pop(session_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_on_commit(session):
+    new_sessions = session.info.pop("new_sessions", None)
+    if new_sessions:
+        _remember(new_sessions)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("new_sessions", None)
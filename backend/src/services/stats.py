@@ -0,0 +1,75 @@
+# src/services/stats.py
+from collections import Counter
+
+from sqlalchemy.dialects.sqlite import insert
+
+from src.db import db
+from src.models.user import VowelStat, WordStat
+
+
+def _upsert_counts(model, key_column, rows):
+    statement = insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=["session_id", key_column],
+        set_={
+            "correct": model.correct + statement.excluded.correct,
+            "incorrect": model.incorrect + statement.excluded.incorrect,
+        },
+    )
+    db.session.execute(statement, rows)
+
+
+def update_counters(records):
+    """
+    Adds a batch of graded attempts to the per-session vowel and word counters, in the
+    caller's transaction. Answers are summed in memory first, so each counter is touched
+    by at most one upsert per batch.
+    """
+    vowels, words, word_vowels = Counter(), Counter(), {}
+    for record in records:
+        session_id, vowel_id, word = record["session_id"], record.get("vowel_id"), record.get("question_text")
+        for _, _, is_correct in record.get("answers", ()):
+            column = "correct" if is_correct else "incorrect"
+            if vowel_id:
+                vowels[(session_id, vowel_id, column)] += 1
+            if word:
+                words[(session_id, word, column)] += 1
+                word_vowels[(session_id, word)] = vowel_id
+
+    if vowels:
+        keys = {(session_id, vowel_id) for session_id, vowel_id, _ in vowels}
+        _upsert_counts(VowelStat, "vowel", [{
+            "session_id": session_id,
+            "vowel": vowel_id,
+            "correct": vowels[(session_id, vowel_id, "correct")],
+            "incorrect": vowels[(session_id, vowel_id, "incorrect")],
+        } for session_id, vowel_id in keys])
+
+    if words:
+        _upsert_counts(WordStat, "word", [{
+            "session_id": session_id,
+            "word": word,
+            "vowel": vowel_id,
+            "correct": words[(session_id, word, "correct")],
+            "incorrect": words[(session_id, word, "incorrect")],
+        } for (session_id, word), vowel_id in word_vowels.items()])
+
+
+def get_vowel_accuracy(session_id):
+    """
+    The session's counters for every vowel it has answered, one row per vowel.
+    """
+    stats = VowelStat.query.filter_by(session_id=session_id).order_by(VowelStat.vowel).all()
+    return [stat.to_dict() for stat in stats]
+
+
+def get_word_accuracy(session_id, vowel_id=None, limit=50):
+    """
+    The session's word counters, least accurate first.
+    """
+    query = WordStat.query.filter_by(session_id=session_id)
+    if vowel_id:
+        query = query.filter_by(vowel=vowel_id)
+    total = WordStat.correct + WordStat.incorrect
+    stats = query.order_by((WordStat.correct * 1.0 / total).asc(), total.desc(), WordStat.word).limit(limit).all()
+    return [stat.to_dict() for stat in stats]
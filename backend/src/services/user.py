@@ -1,37 +1,120 @@
 # src/services/user.py
-from src.db import db
-from src.models.user import UserSession, CompletedLesson, QuizAttempt
-
+from datetime import datetime
 
-def get_or_create_session(session_id):
-    session = UserSession.query.filter_by(session_id=session_id).first()
-    if not session:
-        session = UserSession(session_id=session_id)
-        db.session.add(session)
-        db.session.commit()
-    return session
+from src.db import db
+from src.models.user import CompletedLesson, LatestQuizScore, QuizAttempt
+from src.services.attempt_ingest import get_attempt_writer, store_attempts
+from src.services.confusion import record_confusions
+from src.services.grading import get_answer_key
+from src.services.progress import invalidate_progress
+from src.services.review import apply_review, reschedule
+from src.services.scores import get_latest_score, get_latest_scores
+from src.services.sessions import ensure_session
 
 
 def mark_lesson_complete(session_id, lesson_id):
-    session = get_or_create_session(session_id)
+    """
+    Records a completed lesson once per session. Returns False if it was already recorded.
+    """
+    ensure_session(session_id)
     existing = CompletedLesson.query.filter_by(session_id=session_id, lesson_id=lesson_id).first()
-    if not existing:
-        db.session.add(CompletedLesson(session_id=session_id, lesson_id=lesson_id))
-        db.session.commit()
+    if existing:
+        return False
+    db.session.add(CompletedLesson(session_id=session_id, lesson_id=lesson_id))
+    db.session.commit()
+    invalidate_progress(session_id)
     return True
 
 
-def log_quiz_attempt(session_id, quiz_id, answers):
-    correct = sum(1 for ans in answers if ans.get("is_correct"))
-    total = len(answers)
+def log_quiz_attempt(session_id, quiz_id, option_ids, idempotency_key=None, fingerprint=None):
+    """
+    Grades the selected option ids against the answer key and records the attempt.
+    An idempotency key (with the request fingerprint) is stored along with it.
+
+    Every selected option is also logged as a QuizLog row. With write-behind ingestion the
+    attempt is acknowledged once it is in the attempt log and stored by the background
+    writer; otherwise it is committed here.
+    Returns None if the quiz does not exist (or has no correct option); raises InvalidAnswers
+    for ids from another quiz or selected twice, and IngestQueueFull when the writer cannot
+    keep up.
+    """
+    answer_key = get_answer_key()
+    if quiz_id not in answer_key:
+        return None
+    correct, total = answer_key.grade(quiz_id, option_ids)
 
     attempt = QuizAttempt(
         session_id=session_id,
         quiz_id=quiz_id,
         score=correct,
-        total=total
+        total=total,
+        attempted_at=datetime.utcnow()
     )
+    prompt_word, vowel_id = answer_key.items.get(quiz_id, (None, None))
+    record = {
+        "session_id": session_id,
+        "quiz_id": quiz_id,
+        "score": correct,
+        "total": total,
+        "attempted_at": attempt.attempted_at,
+        "question_text": prompt_word,
+        "vowel_id": vowel_id,
+        "answers": answer_key.answers(quiz_id, option_ids),
+        "confusions": answer_key.confusions(quiz_id, option_ids),
+        "review": reschedule(session_id, quiz_id, correct, total, attempt.attempted_at),
+    }
+    if idempotency_key:
+        record.update(idempotency_key=idempotency_key, fingerprint=fingerprint)
 
-    db.session.add(attempt)
-    db.session.commit()
+    writer = get_attempt_writer()
+    if writer:
+        writer.submit(record)
+    else:
+        store_attempts([record])
+    # Only an attempt that is recorded counts in the in-memory confusions and review queue
+    record_confusions(session_id, record["confusions"])
+    apply_review(record["review"])
     return attempt
+
+
+def _with_pending(row, record):
+    # A stored score row updated with an acknowledged attempt not stored yet
+    if row is None:
+        row = LatestQuizScore(
+            session_id=record["session_id"], quiz_id=record["quiz_id"], attempts=0,
+            best_score=record["score"], best_total=record["total"], best_at=record["attempted_at"],
+        )
+    else:
+        db.session.expunge(row)
+        if record["score"] / record["total"] > row.best_score / row.best_total:
+            row.best_score, row.best_total, row.best_at = record["score"], record["total"], record["attempted_at"]
+    row.score, row.total, row.attempted_at = record["score"], record["total"], record["attempted_at"]
+    row.attempts += 1
+    return row
+
+
+def get_latest_attempt(session_id, quiz_id):
+    """
+    The session's latest (and best) score at a quiz, read by primary key from
+    latest_quiz_scores, including an attempt still waiting in the write-behind queue of this
+    process (read-your-writes).
+    """
+    row = get_latest_score(session_id, quiz_id)
+    writer = get_attempt_writer()
+    pending = writer.latest_pending(session_id, quiz_id) if writer else None
+    if pending and (row is None or pending["attempted_at"] > row.attempted_at):
+        row = _with_pending(row, pending)
+    return row
+
+
+def get_session_scores(session_id):
+    """
+    Latest and best scores of a session for every quiz it has attempted, by quiz id.
+    """
+    rows = {row.quiz_id: row for row in get_latest_scores(session_id)}
+    writer = get_attempt_writer()
+    for record in writer.session_pending(session_id) if writer else ():
+        row = rows.get(record["quiz_id"])
+        if row is None or record["attempted_at"] > row.attempted_at:
+            rows[record["quiz_id"]] = _with_pending(row, record)
+    return [rows[quiz_id] for quiz_id in sorted(rows)]
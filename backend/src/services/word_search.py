@@ -0,0 +1,345 @@
+# src/services/word_search.py
+import hashlib
+import logging
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy import select
+
+from src.db import db, reading
+from src.models.phoneme import Vowel, WordExample
+from src.services.content_cache import live_version
+
+logger = logging.getLogger(__name__)
+
+# IPA stress and length marks do not change which word the user is after
+_IGNORED_MARKS = dict.fromkeys(map(ord, "ˈˌːˑ/[]"), None)
+_TOKEN_SPLIT = re.compile(r"[^\w]+", re.UNICODE)
+
+# Field weights: a hit on the word itself ranks above a hit in a vowel description
+WORD_WEIGHT = 1.0
+IPA_WEIGHT = 0.9
+VOWEL_NAME_WEIGHT = 0.8
+DESCRIPTION_WEIGHT = 0.5
+
+MAX_PREFIX_TERMS = 200
+MAX_POSTINGS_PER_TERM = 1000
+MIN_FUZZY_LENGTH = 3
+
+
+def normalize(text):
+    """
+    NFC + casefold, with IPA stress/length marks and surrounding whitespace removed.
+    """
+    if not text:
+        return ""
+    return unicodedata.normalize("NFC", text).casefold().translate(_IGNORED_MARKS).strip()
+
+
+def _deletes(term):
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def _edit_distance(a, b, limit):
+    """
+    Levenshtein distance, or limit + 1 as soon as it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if limit == 1:
+        return _distance_up_to_one(a, b)
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _distance_up_to_one(a, b):
+    """
+    0 or 1 when a and b are at most one edit apart, otherwise 2. Linear time.
+    """
+    if a == b:
+        return 0
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return 1 if a[i + 1:] == b[i + 1:] else 2
+    return 1 if a[i:] == b[i + 1:] else 2
+
+
+class WordSearchIndex:
+    """
+    In-memory index over word examples and vowels.
+
+    Terms are kept in a sorted list (prefix lookups by bisection), in an exact-match
+    dictionary and in a single-deletion index (SymSpell style) that supplies candidates for
+    typo-tolerant matching with a handful of hash lookups. Documents can be added and removed
+    one at a time, so writes never require a rebuild.
+    """
+
+    def __init__(self, version=None, digest=None):
+        self.version = version
+        self.digest = digest     # of the rows it was built from, see _read_rows
+        self.documents = {}      # doc key -> public result payload
+        self.doc_terms = {}      # doc key -> [(term, weight)]
+        self.postings = {}       # term -> {doc key: weight}
+        self.terms = []          # sorted distinct terms
+        self.deletes = {}        # term with one character deleted -> set of terms
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _add_term(self, term, key, weight):
+        postings = self.postings.get(term)
+        if postings is None:
+            postings = self.postings[term] = {}
+            insort(self.terms, term)
+            for variant in _deletes(term):
+                self.deletes.setdefault(variant, set()).add(term)
+        postings[key] = max(weight, postings.get(key, 0.0))
+
+    def _remove_term(self, term, key):
+        postings = self.postings.get(term)
+        if postings is None:
+            return
+        postings.pop(key, None)
+        if not postings:
+            del self.postings[term]
+            del self.terms[bisect_left(self.terms, term)]
+            for variant in _deletes(term):
+                bucket = self.deletes.get(variant)
+                if bucket is not None:
+                    bucket.discard(term)
+                    if not bucket:
+                        del self.deletes[variant]
+
+    def add(self, key, payload, fields):
+        """
+        Indexes a document. fields is a list of (text, weight, tokenize).
+        """
+        self.remove(key)
+        terms = []
+        for text, weight, tokenize in fields:
+            normalized = normalize(text)
+            if not normalized:
+                continue
+            pieces = [t for t in _TOKEN_SPLIT.split(normalized) if t] if tokenize else [normalized]
+            terms.extend((piece, weight) for piece in pieces)
+
+        self.documents[key] = payload
+        self.doc_terms[key] = terms
+        for term, weight in terms:
+            self._add_term(term, key, weight)
+
+    def remove(self, key):
+        for term, _ in self.doc_terms.pop(key, ()):
+            self._remove_term(term, key)
+        self.documents.pop(key, None)
+
+    def add_word_example(self, example_id, word, ipa, audio_url, vowel_id):
+        self.add(("word_example", example_id), {
+            "type": "word_example",
+            "id": example_id,
+            "word": word,
+            "ipa": ipa,
+            "audio_url": audio_url,
+            "vowel_id": vowel_id,
+        }, [(word, WORD_WEIGHT, False), (ipa, IPA_WEIGHT, False)])
+
+    def add_vowel(self, vowel_id, phoneme, name, description, audio_url):
+        self.add(("vowel", vowel_id), {
+            "type": "vowel",
+            "id": vowel_id,
+            "phoneme": phoneme,
+            "name": name,
+            "audio_url": audio_url,
+        }, [(phoneme, IPA_WEIGHT, False), (name, VOWEL_NAME_WEIGHT, False), (description, DESCRIPTION_WEIGHT, True)])
+
+    def search(self, query, limit=10, max_typos=None):
+        """
+        Ranked results for a query: exact term matches first, then prefix matches,
+        then terms within a small edit distance.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        scores = {}
+        matches = {}
+
+        def score(term, base, kind):
+            # Very common terms (a bare vowel symbol) would otherwise score every document
+            for key, weight in islice(self.postings[term].items(), MAX_POSTINGS_PER_TERM):
+                value = base * weight
+                if value > scores.get(key, 0.0):
+                    scores[key] = value
+                    matches[key] = kind
+
+        if query in self.postings:
+            score(query, 3.0, "exact")
+
+        start = bisect_left(self.terms, query)
+        for term in self.terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(query):
+                break
+            if term != query:
+                score(term, 2.0 + len(query) / len(term), "prefix")
+
+        if len(scores) < limit and len(query) >= MIN_FUZZY_LENGTH:
+            max_typos = max_typos if max_typos is not None else (1 if len(query) <= 5 else 2)
+            for term in self._fuzzy_candidates(query, max_typos):
+                distance = _edit_distance(query, term, max_typos)
+                if 0 < distance <= max_typos:
+                    score(term, 1.0 - distance / (len(query) + 1), "fuzzy")
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], str(item[0][1])))[:limit]
+        return [{**self.documents[key], "score": round(value, 4), "match": matches[key]} for key, value in ranked]
+
+    def _fuzzy_candidates(self, query, max_typos):
+        """
+        Terms that share a deletion variant with the query. Query-side variants go one deletion
+        deeper when two typos are allowed; candidates are verified by edit distance afterwards.
+        """
+        candidates = set(self.deletes.get(query, ()))
+        frontier = {query}
+        for _ in range(max_typos):
+            frontier = {variant for word in frontier for variant in _deletes(word)}
+            for variant in frontier:
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates.update(self.deletes.get(variant, ()))
+        return candidates
+
+
+_lock = threading.Lock()
+_index = WordSearchIndex()
+_rebuild_lock = threading.Lock()
+_rebuild = {"thread": None}
+
+
+def _read_rows():
+    """
+    The word example and vowel rows the index is built from, with a digest of them, so a new
+    content version that left them unchanged (a quiz or lesson edit) needs no rebuild.
+    """
+    with reading():
+        examples = db.session.execute(select(
+            WordExample.id, WordExample.word, WordExample.ipa, WordExample.audio_url, WordExample.vowel_id
+        ).order_by(WordExample.id)).all()
+        vowels = db.session.execute(
+            select(Vowel.id, Vowel.phoneme, Vowel.name, Vowel.description, Vowel.audio_url).order_by(Vowel.id)
+        ).all()
+    digest = hashlib.blake2b(digest_size=16)
+    for row in (*examples, *vowels):
+        digest.update(repr(tuple(row)).encode())
+    return examples, vowels, digest.hexdigest()
+
+
+def build_index(version, rows=None):
+    """
+    Builds a full index from the database with column-only reads.
+    """
+    examples, vowels, digest = rows or _read_rows()
+    index = WordSearchIndex(version, digest)
+    for row in examples:
+        index.add_word_example(*row)
+    for row in vowels:
+        index.add_vowel(*row)
+    return index
+
+
+def _swap(version, rows):
+    global _index
+    _, _, digest = rows
+    with _lock:
+        current = _index
+    if current.digest == digest:
+        index = None        # same words and vowels: only the version moves
+    else:
+        index = build_index(version, rows)
+    with _lock:
+        # A local write may have moved the index meanwhile (index_word_examples)
+        if _index.version is not None and _index.version >= version:
+            return
+        if index is None and _index is current:
+            _index.version = version
+        elif index is not None:
+            _index = index
+
+
+def _rebuild_in_background(app, version):
+    try:
+        with app.app_context():
+            _swap(version, _read_rows())
+    except Exception:
+        logger.exception("Rebuilding the word search index for version %s failed", version)
+    finally:
+        with _rebuild_lock:
+            _rebuild["thread"] = None
+
+
+def get_index():
+    """
+    The index for the live content version. When another writer moved the version, searches
+    keep using the current index while a background thread reads the words again and swaps in
+    a new index, rebuilt only if the word examples or vowels changed. Only the very first
+    build, with nothing to serve yet, happens in the request.
+    """
+    global _index
+    version = live_version()
+    index = _index
+    if index.version is None:
+        with _lock:
+            if _index.version is None:
+                _index = build_index(version)
+            index = _index
+    elif index.version != version:
+        with _rebuild_lock:
+            if _rebuild["thread"] is None:
+                thread = threading.Thread(target=_rebuild_in_background, name="word-search-rebuild", daemon=True,
+                                          args=(current_app._get_current_object(), version))
+                _rebuild["thread"] = thread
+                thread.start()
+    # The index read above, not the global: a rebuild that already finished must not show up in
+    # the very call that started it
+    return index
+
+
+def index_word_examples(release_version, example_ids):
+    """
+    Applies a local write to the index incrementally.
+
+    release_version is the content version the write created. If the index was exactly one
+    version behind, only the given word examples are (re)loaded; otherwise the next search
+    starts a background rebuild.
+    """
+    with _lock:
+        if _index.version != release_version - 1:
+            return False
+        rows = db.session.execute(
+            select(WordExample.id, WordExample.word, WordExample.ipa, WordExample.audio_url, WordExample.vowel_id)
+            .where(WordExample.id.in_(list(example_ids)))
+        )
+        for row in rows:
+            _index.add_word_example(*row)
+        _index.version = release_version
+        _index.digest = None    # no longer matches a full read
+    return True
+
+
+def search_words(query, limit=10):
+    index = get_index()
+    with _lock:
+        return index.search(query, limit=limit)
@@ -1,23 +1,135 @@
-import sys
-from pathlib import Path
+import os
+import tempfile
 
 import pytest
 
-from src.app import app as flask_app
-from src.models.phoneme import db
+# Config reads the environment once, at import: point everything at a scratch directory first
+_scratch = tempfile.mkdtemp(prefix="phonolab-tests-")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_scratch, 'default.db')}")
+os.environ.setdefault("G2P_INDEX", os.path.join(_scratch, "pronunciations.idx"))
+os.environ.setdefault("IRT_CHECKPOINT", os.path.join(_scratch, "irt_checkpoint.npz"))
+os.environ.setdefault("EXPORT_DIR", os.path.join(_scratch, "exports"))
+os.environ.setdefault("ATTEMPT_LOG_DIR", os.path.join(_scratch, "attempt_logs"))
+os.environ.setdefault("ATTEMPT_DEAD_LETTER_FILE", os.path.join(_scratch, "attempt_dead_letter.jsonl"))
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from src.app import create_app  # noqa: E402
+from src.db import db  # noqa: E402
+from src.services import (  # noqa: E402
+    admission,
+    attempt_ingest,
+    confusion,
+    content_cache,
+    grading,
+    idempotency,
+    progress,
+    quiz_generator,
+    review,
+    sessions,
+    word_search,
+)
 
 
-@pytest.fixture(scope="module")
-def app():
-    flask_app.config.update({
-        "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-        "SQLALCHEMY_TRACK_MODIFICATIONS": False,
-    })
+def reset_process_state():
+    """
+    Drops the in-process caches, which outlive an app and would carry one test's database
+    into the next.
+    """
+    writer = attempt_ingest.get_attempt_writer()
+    if writer:
+        writer.stop()
+    attempt_ingest._writer = None
+    admission._admission = None
+    idempotency._store = None
+    grading._key = grading.AnswerKey(None, {}, {}, {}, {})
+    content_cache._state.update(version=None, checked_at=0.0, snapshot=None)
+    quiz_generator._pools = None
+    confusion._totals["matrix"] = None
+    confusion._sessions.clear()
+    progress._cache.clear()
+    progress._computed_at.clear()
+    review._queues.clear()
+    sessions._known.clear()
+    word_search._index = word_search.WordSearchIndex()
 
-    with flask_app.app_context():
-        db.create_all()
-        yield flask_app
-        db.drop_all()
+
+@pytest.fixture
+def make_app(tmp_path):
+    """
+    Builds an app on a fresh database under tmp_path, with config overrides.
+    """
+    apps = []
+
+    def make(**config):
+        app = create_app({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'phonolab.db'}",
+            "ATTEMPT_WRITE_BEHIND": False,
+            "ATTEMPT_LOG_DIR": str(tmp_path / "attempt_logs"),
+            "ATTEMPT_DEAD_LETTER_FILE": str(tmp_path / "attempt_dead_letter.jsonl"),
+            "ADMISSION_CONTROL": False,
+            "ADMIN_TOKEN": "test-token",
+            **config,
+        })
+        apps.append(app)
+        return app
+
+    reset_process_state()
+    yield make
+    reset_process_state()
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def quiz(app):
+    """
+    A quiz with two correct options and one wrong one, as (quiz_id, correct ids, wrong ids).
+    """
+    from src.services.quiz import create_quiz
+
+    options = [
+        {"word": "bat", "ipa": "æ", "audio_url": "/audio/bat.mp3", "is_correct": True},
+        {"word": "hat", "ipa": "æ", "audio_url": "/audio/hat.mp3", "is_correct": True},
+        {"word": "cup", "ipa": "ʌ", "audio_url": "/audio/cup.mp3", "is_correct": False},
+    ]
+    item = create_quiz("cat", "æ", "/audio/cat.mp3", options)
+    correct = [option.id for option in item.options if option.is_correct]
+    wrong = [option.id for option in item.options if not option.is_correct]
+    quiz_id = item.id
+    db.session.remove()
+    return quiz_id, correct, wrong
+
+
+@pytest.fixture
+def word_examples(app):
+    """
+    Vowels ɪ, ɛ, æ and ʌ with a few word examples each, live as content version 1.
+    """
+    from src.models.phoneme import Vowel, WordExample
+    from src.services.content_cache import bump_content_version
+
+    words = {"v2": ("ɪ", ["bit", "sit"]), "v4": ("ɛ", ["bet", "set"]), "v5": ("æ", ["bat", "cat", "hat"]),
+             "v7": ("ʌ", ["but", "cup"])}
+    for vowel_id, (phoneme, examples) in words.items():
+        db.session.add(Vowel(id=vowel_id, phoneme=phoneme, name=phoneme, ipa_example=phoneme, color_code="#CCCCCC",
+                             audio_url=f"/audio/{vowel_id}.mp3", description=""))
+        db.session.add_all(WordExample(word=word, audio_url=f"/audio/{word}.mp3", vowel_id=vowel_id) for word in examples)
+    bump_content_version("test content")
+    db.session.commit()
+    db.session.remove()
+    return words
@@ -0,0 +1,36 @@
+from src.services.admission import AdmissionControl, TokenBucket
+
+
+def _score(client, session_id, quiz_id, answers):
+    return client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": answers})
+
+
+def test_token_bucket_refills_at_its_rate():
+    bucket = TokenBucket(rate=2, burst=2, now=0.0)
+    assert bucket.take(0.0) == bucket.take(0.0) == 0.0
+    assert bucket.take(0.0) == 0.5
+    assert bucket.take(0.5) == 0.0
+
+
+def test_each_session_has_its_own_bucket(make_app, quiz):
+    app = make_app(ADMISSION_CONTROL=True, ADMISSION_SESSION_RATE=0.001, ADMISSION_SESSION_BURST=2)
+    client = app.test_client()
+    quiz_id, correct, _ = quiz
+    assert [_score(client, "s1", quiz_id, correct).status_code for _ in range(3)] == [200, 200, 429]
+    response = _score(client, "s1", quiz_id, correct)
+    assert int(response.headers["Retry-After"]) >= 1
+    assert _score(client, "s2", quiz_id, correct).status_code == 200
+
+    stats = client.get("/admin/admission", headers={"X-Admin-Token": "test-token"}).json["data"]
+    assert stats["enabled"] is True
+    assert stats["limits"]["session_burst"] == 2
+    assert (stats["counters"]["admitted"], stats["counters"]["rejected_session"]) == (3, 2)
+
+
+def test_writes_beyond_the_concurrency_limit_are_turned_away(make_app):
+    admission = AdmissionControl({**make_app().config, "ADMISSION_MAX_CONCURRENT_WRITES": 1, "ADMISSION_WRITE_WAIT": 0.01})
+    assert admission.admit("s1", "10.0.0.1") is None
+    assert admission.admit("s2", "10.0.0.2")[0] == 503
+    admission.release()
+    assert admission.admit("s2", "10.0.0.2") is None
+    assert admission.stats()["writes_in_flight"] == 1
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from src.db import db
+from src.models.user import QuizLog
+from src.services.answer_analytics import item_statistics, load_answers
+
+
+def _submit(client, session_id, quiz_id, answers):
+    response = client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": answers})
+    assert response.status_code == 200, response.json
+
+
+def test_each_selected_option_is_logged(client, quiz):
+    quiz_id, correct, wrong = quiz
+    _submit(client, "s1", quiz_id, [correct[1], wrong[0]])
+
+    rows = db.session.scalars(select(QuizLog).order_by(QuizLog.question_index)).all()
+    assert [(row.selected_option, row.correct_option, row.is_correct) for row in rows] == [
+        (correct[1], correct[1], True), (wrong[0], min(correct), False),
+    ]
+    assert {row.question_text for row in rows} == {"cat"}
+
+
+def test_answers_load_as_columns_for_item_statistics(client, quiz):
+    pytest.importorskip("numpy")
+    quiz_id, correct, wrong = quiz
+    _submit(client, "s1", quiz_id, [correct[0]])
+    _submit(client, "s2", quiz_id, [wrong[0]])
+    _submit(client, "s2", quiz_id, [correct[0], correct[1]])
+
+    answers = load_answers(datetime.utcnow().date())
+    assert len(answers["quiz_id"]) == 4
+    assert list(answers["sessions"]) == ["s1", "s2"]
+    assert list(answers["session"]) == [0, 1, 1, 1]
+    assert item_statistics(answers) == {quiz_id: {"answers": 4, "p_value": 0.75}}
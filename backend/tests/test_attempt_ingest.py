@@ -0,0 +1,185 @@
+import fcntl
+import os
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from src.db import db
+from src.models.user import IngestCheckpoint, QuizAttempt
+from src.services import attempt_ingest
+from src.services.attempt_ingest import AttemptWriter, _encode
+
+
+def _record(seq, quiz_id, session_id="s1"):
+    return {"seq": seq, "session_id": session_id, "quiz_id": quiz_id, "score": 1, "total": 2,
+            "attempted_at": datetime(2026, 1, 1, 12, seq), "answers": [], "confusions": []}
+
+
+def _write_log(path, records):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(_encode(record) for record in records)
+
+
+def _attempt_count():
+    return db.session.scalar(select(func.count()).select_from(QuizAttempt))
+
+
+def test_creating_the_app_does_not_start_the_writer(make_app, quiz):
+    app = make_app(ATTEMPT_WRITE_BEHIND=True)
+    log_dir = app.config["ATTEMPT_LOG_DIR"]
+    orphan = os.path.join(log_dir, "attempts-dead-1-00000000.wal")
+    _write_log(orphan, [_record(1, quiz[0])])
+
+    # A script or `flask` command builds the app without serving: the log stays untouched
+    make_app(ATTEMPT_WRITE_BEHIND=True)
+    assert attempt_ingest.get_attempt_writer() is None
+    assert os.path.exists(orphan)
+
+    app.test_client().get("/quiz/")
+    writer = attempt_ingest.get_attempt_writer()
+    assert writer is not None
+    assert writer.path != orphan
+
+
+def test_orphaned_log_is_replayed_from_its_checkpoint_and_deleted(app, quiz):
+    quiz_id = quiz[0]
+    name = "attempts-dead-1-00000000.wal"
+    orphan = os.path.join(app.config["ATTEMPT_LOG_DIR"], name)
+    _write_log(orphan, [_record(seq, quiz_id) for seq in (1, 2, 3)])
+    db.session.add(IngestCheckpoint(name=name, seq=1))
+    db.session.commit()
+
+    writer = AttemptWriter(app)
+    assert writer.recover() == 2
+    assert _attempt_count() == 2
+    assert not os.path.exists(orphan)
+    assert db.session.get(IngestCheckpoint, name) is None
+
+
+def test_log_of_a_running_process_is_left_alone(app, quiz):
+    live = os.path.join(app.config["ATTEMPT_LOG_DIR"], "attempts-live-2-00000000.wal")
+    _write_log(live, [_record(1, quiz[0])])
+    with open(live, "a", encoding="utf-8") as held:
+        fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+        assert AttemptWriter(app).recover() == 0
+    assert os.path.exists(live)
+    assert _attempt_count() == 0
+
+
+def test_writers_use_their_own_logs_and_clean_up_on_stop(app, quiz):
+    first, second = AttemptWriter(app), AttemptWriter(app)
+    assert first.path != second.path
+    first.start()
+    second.start()
+    first.submit(_record(0, quiz[0]))
+    second.submit(_record(0, quiz[0], session_id="s2"))
+    assert first.flush(timeout=5) and second.flush(timeout=5)
+    first.stop()
+    second.stop()
+
+    assert _attempt_count() == 2
+    assert os.listdir(app.config["ATTEMPT_LOG_DIR"]) == []
+    assert db.session.scalar(select(func.count()).select_from(IngestCheckpoint)) == 0
+
+
+def test_poison_attempt_goes_to_the_dead_letter_file(make_app, quiz, monkeypatch):
+    app = make_app(ATTEMPT_MAX_RETRIES=2)
+    monkeypatch.setattr(attempt_ingest, "RETRY_DELAY", 0.01)
+    quiz_id = quiz[0]
+    writer = AttemptWriter(app)
+    writer.start()
+    writer.submit(_record(0, quiz_id))
+    writer.submit({**_record(0, quiz_id, session_id="s2"), "score": None})   # violates NOT NULL
+    writer.submit(_record(0, quiz_id, session_id="s3"))
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+    with app.app_context():
+        assert _attempt_count() == 2
+        with open(app.config["ATTEMPT_DEAD_LETTER_FILE"], encoding="utf-8") as f:
+            assert [attempt_ingest._decode(line)["session_id"] for line in f] == ["s2"]
+        # Everything in the log is accounted for: it is deleted with its checkpoint
+        assert os.listdir(app.config["ATTEMPT_LOG_DIR"]) == []
+        assert db.session.scalar(select(func.count()).select_from(IngestCheckpoint)) == 0
+
+
+def test_concurrent_submits_share_fsyncs(app, quiz, monkeypatch):
+    writer = AttemptWriter(app)
+    writer.start()
+    fsyncs = []
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.05)
+        real_fsync(fd)
+
+    monkeypatch.setattr(attempt_ingest.os, "fsync", slow_fsync)
+
+    threads = [threading.Thread(target=writer.submit, args=(_record(0, quiz[0], session_id=f"s{i}"),))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert writer.synced_seq == writer.seq == 20
+    # Submits that arrive during an fsync are covered by the next one
+    assert len(fsyncs) < 20
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+
+def _flaky_store(monkeypatch, errors):
+    # store_attempts raising the given errors, one per call, before storing for real
+    real_store, errors = attempt_ingest.store_attempts, list(errors)
+
+    def store(records, checkpoint=None):
+        if errors:
+            raise errors.pop(0)
+        return real_store(records, checkpoint)
+
+    monkeypatch.setattr(attempt_ingest, "store_attempts", store)
+    monkeypatch.setattr(attempt_ingest, "RETRY_DELAY", 0.01)
+    monkeypatch.setattr(attempt_ingest, "MAX_RETRY_DELAY", 0.02)
+
+
+def _locked():
+    return OperationalError("INSERT INTO quiz_attempts", {}, Exception("database is locked"))
+
+
+def test_database_outage_is_waited_out_without_dead_lettering(make_app, quiz, monkeypatch):
+    app = make_app(ATTEMPT_MAX_RETRIES=2)
+    _flaky_store(monkeypatch, [_locked() for _ in range(10)])
+    writer = AttemptWriter(app)
+    writer.start()
+    writer.submit(_record(0, quiz[0]))
+    writer.submit(_record(0, quiz[0], session_id="s2"))
+    assert writer.flush(timeout=5)
+    writer.stop()
+
+    with app.app_context():
+        assert _attempt_count() == 2
+    assert not os.path.exists(app.config["ATTEMPT_DEAD_LETTER_FILE"])
+
+
+def test_outage_while_dead_lettering_does_not_kill_the_writer(make_app, quiz, monkeypatch):
+    app = make_app(ATTEMPT_MAX_RETRIES=1)
+    # The batch fails on its own, then the database goes away while it is split up
+    _flaky_store(monkeypatch, [ValueError("bad batch"), _locked(), _locked()])
+    writer = AttemptWriter(app)
+    writer.start()
+    writer.submit({**_record(0, quiz[0], session_id="s2"), "score": None})   # violates NOT NULL
+    assert writer.flush(timeout=5)
+    writer.submit(_record(0, quiz[0]))
+    assert writer.flush(timeout=5)
+    assert writer._thread.is_alive()
+    writer.stop()
+
+    with app.app_context():
+        assert _attempt_count() == 1
+        with open(app.config["ATTEMPT_DEAD_LETTER_FILE"], encoding="utf-8") as f:
+            assert [attempt_ingest._decode(line)["session_id"] for line in f] == ["s2"]
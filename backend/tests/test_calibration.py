@@ -0,0 +1,47 @@
+import pytest
+
+from src.db import db
+from src.services.calibration import calibrate
+from src.services.quiz import create_quiz
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def quizzes(app):
+    """
+    Two quizzes with one correct and one wrong option each, as {prompt word: (quiz_id, correct id, wrong id)}.
+    """
+    created = {}
+    for word in ("cat", "cup"):
+        item = create_quiz(word, "æ", f"/audio/{word}.mp3", [
+            {"word": "bat", "ipa": "æ", "audio_url": "/audio/bat.mp3", "is_correct": True},
+            {"word": "but", "ipa": "ʌ", "audio_url": "/audio/but.mp3", "is_correct": False},
+        ])
+        correct, wrong = (next(option.id for option in item.options if option.is_correct is flag) for flag in (True, False))
+        created[word] = (item.id, correct, wrong)
+    db.session.remove()
+    return created
+
+
+def test_calibration_ranks_quizzes_by_difficulty(client, quizzes, tmp_path):
+    (easy, easy_right, _), (hard, hard_right, hard_wrong) = quizzes["cat"], quizzes["cup"]
+    for session_id in ("s1", "s2", "s3", "s4"):
+        for quiz_id, option_id in ((easy, easy_right), (hard, hard_right if session_id == "s1" else hard_wrong)):
+            response = client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id,
+                                                             "answers": [option_id]})
+            assert response.status_code == 200, response.json
+
+    checkpoint = str(tmp_path / "irt.npz")
+    summary = calibrate("1pl", checkpoint=checkpoint)
+    assert (summary["incremental"], summary["new_answers"], summary["quizzes"]) == (False, 8, 2)
+
+    difficulty = {quiz_id: client.get(f"/quiz/{quiz_id}").json["data"]["quiz"]["difficulty"] for quiz_id in (easy, hard)}
+    assert difficulty[hard] > difficulty[easy]
+    assert [quiz["id"] for quiz in client.get("/user/next-quizzes?session_id=s5").json["data"]["quizzes"]] == [easy, hard]
+
+    # A rerun only reads answers logged since, and with none there is nothing to fit
+    summary = calibrate("1pl", checkpoint=checkpoint)
+    assert (summary["incremental"], summary["new_answers"], summary["iterations"]) == (True, 0, 0)
+    with pytest.raises(ValueError):
+        calibrate("3pl", checkpoint=checkpoint)
@@ -0,0 +1,56 @@
+import time
+
+from src.services import cohorts
+
+
+def _wait_for_report(client, cohort_id):
+    for _ in range(100):
+        response = client.get(f"/cohorts/{cohort_id}/report")
+        if response.status_code == 200 and not response.json["data"]["refreshing"]:
+            return response.json["data"]
+        time.sleep(0.05)
+    raise AssertionError("the report was not built")
+
+
+def test_report_refresh_from_a_request_never_forks(make_app, monkeypatch):
+    client = make_app(COHORT_REPORT_WORKERS=4, COHORT_PARTITION_SIZE=1).test_client()
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a server process must not fork report workers")
+
+    monkeypatch.setattr(cohorts, "ProcessPoolExecutor", no_pool)
+    response = client.post("/cohorts/", json={"name": "class", "session_ids": ["s1", "s2", "s3"]})
+    cohort_id = response.json["data"]["cohort"]["id"]
+
+    assert client.get(f"/cohorts/{cohort_id}/report").status_code == 202
+    report = _wait_for_report(client, cohort_id)
+    assert [student["session_id"] for student in report["students"]] == ["s1", "s2", "s3"]
+
+
+def test_report_partitions_built_by_worker_processes_are_merged(make_app, quiz):
+    app = make_app(COHORT_PARTITION_SIZE=1)
+    client = app.test_client()
+    quiz_id, correct, wrong = quiz
+    for session_id, answers in (("s1", correct), ("s2", [wrong[0]])):
+        client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": answers})
+    cohort_id = client.post("/cohorts/", json={"name": "class", "session_ids": ["s1", "s2"]}).json["data"]["cohort"]["id"]
+    assert client.post(f"/cohorts/{cohort_id}/members", json={"session_ids": ["s2", "s3"]}).json["data"]["added"] == 1
+
+    with app.app_context():
+        cohorts.refresh_report(cohort_id, workers=2)
+    report = client.get(f"/cohorts/{cohort_id}/report").json["data"]
+    assert report["cohort"]["members"] == 3
+    assert [student["latest_accuracy"] for student in report["students"]] == [1.0, 0.0, None]
+    assert [(item["quiz_id"], item["students"], item["p_value"]) for item in report["items"]] == [(quiz_id, 2, 0.5)]
+
+    assert client.get("/cohorts/99/report").status_code == 404
+    assert client.post(f"/cohorts/{cohort_id}/members", json={"session_ids": []}).status_code == 400
+
+
+def test_cohort_writes_are_admission_controlled(make_app):
+    client = make_app(ADMISSION_CONTROL=True, ADMISSION_IP_RATE=0.001, ADMISSION_IP_BURST=1).test_client()
+    assert client.post("/cohorts/", json={"name": "a"}).status_code == 201
+
+    assert client.post("/cohorts/", json={"name": "b"}).status_code == 429
+    assert client.post("/cohorts/1/members", json={"session_ids": ["s1"]}).status_code == 429
+    assert client.post("/cohorts/1/report").status_code == 429
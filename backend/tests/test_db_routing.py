@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+from sqlalchemy import event, func, insert, select
+
+from src.db import READER, db, reading
+from src.models.phoneme import Vowel, WordExample
+from src.services.content_cache import bump_content_version
+from src.services.minimal_pairs import refresh_pairs
+
+
+def _vowel(vowel_id, phoneme):
+    return {"id": vowel_id, "phoneme": phoneme, "name": phoneme, "ipa_example": phoneme, "color_code": "#CCCCCC",
+            "audio_url": f"/audio/{vowel_id}.mp3", "description": ""}
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app(SQLITE_PROFILE="production")
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture
+def engines_used(app):
+    """
+    Bind keys of the engines each statement ran on (None is the writer).
+    """
+    used = []
+    for key, engine in db.engines.items():
+        event.listen(engine, "before_cursor_execute", lambda *args, key=key: used.append(key))
+    return used
+
+
+def test_production_profile_splits_reader_and_writer(app):
+    assert set(db.engines) == {None, READER}
+    with db.engines[None].connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+    with db.engines[READER].connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA query_only").scalar() == 1
+
+
+def test_default_profile_keeps_one_engine(make_app):
+    with make_app().app_context():
+        assert set(db.engines) == {None}
+
+
+def test_reads_in_get_requests_use_the_reader(app, engines_used):
+    with app.test_request_context("/", method="GET"):
+        db.session.scalar(select(func.count()).select_from(Vowel))
+        db.session.remove()
+    assert engines_used == [READER]
+
+
+def test_orm_bulk_insert_in_get_request_goes_to_the_writer(app, engines_used):
+    with app.test_request_context("/", method="GET"):
+        db.session.scalar(select(func.count()).select_from(Vowel))
+        db.session.execute(insert(Vowel), [_vowel("v2", "ɪ"), _vowel("v4", "ɛ")])
+        # Read-your-writes: the rest of the transaction stays on the writer
+        assert db.session.scalar(select(func.count()).select_from(Vowel)) == 2
+        db.session.commit()
+        db.session.remove()
+    assert engines_used[0] == READER
+    assert set(engines_used[1:]) == {None}
+
+    with reading():
+        assert db.session.scalar(select(func.count()).select_from(Vowel)) == 2
+
+
+def test_contrast_route_only_reads(app, client, engines_used):
+    db.session.execute(insert(Vowel), [_vowel("v2", "ɪ"), _vowel("v4", "ɛ")])
+    db.session.add_all([
+        WordExample(word="bit", audio_url="/audio/bit.mp3", vowel_id="v2"),
+        WordExample(word="bet", audio_url="/audio/bet.mp3", vowel_id="v4"),
+    ])
+    refresh_pairs(commit=False)
+    bump_content_version("test content")
+    db.session.commit()
+    db.session.remove()
+    engines_used.clear()
+
+    response = client.get("/vowels/v2/contrast/v4")
+    assert response.status_code == 200
+    assert [(pair["word_a"], pair["word_b"]) for pair in response.json["data"]["pairs"]] == [("bit", "bet")]
+    assert set(engines_used) == {READER}
+
+
+def test_write_behind_quiz_score_post_never_checks_out_the_writer(make_app, quiz):
+    app = make_app(SQLITE_PROFILE="production", ATTEMPT_WRITE_BEHIND=True)
+    client = app.test_client()
+    client.get("/quiz/")     # starts the attempt writer
+
+    request_thread, used = threading.get_ident(), []
+    with app.app_context():
+        for key, engine in db.engines.items():
+            event.listen(engine, "checkout", lambda *args, key=key: threading.get_ident() == request_thread
+                         and used.append(key))
+    quiz_id, correct, _ = quiz
+    response = client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id, "answers": correct},
+                           headers={"Idempotency-Key": "k1"})
+    assert response.status_code == 200
+    assert used and None not in used
@@ -0,0 +1,49 @@
+import csv
+import gzip
+import io
+from datetime import datetime
+
+from src.db import db
+from src.models.user import QuizAttempt
+from src.services.export import export_table
+
+
+def _attempts():
+    db.session.add_all(QuizAttempt(session_id="s1", quiz_id=1, score=score, total=2, attempted_at=datetime(2026, 1, day, 12))
+                       for day, score in ((1, 1), (1, 2), (2, 0)))
+    db.session.commit()
+
+
+def _read(path):
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_export_is_partitioned_by_day_and_replaces_days_it_covers(app, tmp_path):
+    _attempts()
+    assert export_table("quiz_attempts", str(tmp_path), chunk_size=1) == {"2026-01-01": 2, "2026-01-02": 1}
+    rows = _read(tmp_path / "quiz_attempts" / "date=2026-01-01" / "quiz_attempts.csv.gz")
+    assert rows[0] == ["id", "session_id", "quiz_id", "score", "total", "attempted_at"]
+    assert [row[3] for row in rows[1:]] == ["1", "2"]
+
+    assert export_table("quiz_attempts", str(tmp_path), start=datetime(2026, 1, 2).date()) == {"2026-01-02": 1}
+    assert len(_read(tmp_path / "quiz_attempts" / "date=2026-01-02" / "quiz_attempts.csv.gz")) == 2
+
+
+def test_export_route_streams_gzip_csv_to_admins(client):
+    _attempts()
+    path = "/admin/export/quiz_attempts?end=2026-01-02"
+    assert client.get(path).status_code == 401
+    response = client.get(path, headers={"X-Admin-Token": "test-token"})
+    assert response.status_code == 200
+    rows = list(csv.reader(io.StringIO(gzip.decompress(response.data).decode("utf-8"))))
+    assert len(rows) == 3
+
+    headers = {"X-Admin-Token": "test-token"}
+    assert client.get("/admin/export/users", headers=headers).status_code == 404
+    assert client.get("/admin/export/quiz_logs?start=yesterday", headers=headers).status_code == 400
+
+
+def test_admin_routes_are_disabled_without_a_token(make_app):
+    client = make_app(ADMIN_TOKEN=None).test_client()
+    assert client.get("/admin/export/quiz_logs", headers={"X-Admin-Token": ""}).status_code == 403
@@ -0,0 +1,49 @@
+from src.models.phoneme import WordExample
+from src.services.g2p import PronunciationDictionary, compile_dictionary, transcribe
+
+
+def test_compiled_index_looks_words_up(tmp_path):
+    source = tmp_path / "words.dict"
+    source.write_text(";;; comment\nBIT  B IH1 T\nBANANA  B AH0 N AE1 N AH0\nBANANA(2)  B AH0 N AA1 N AH0\n",
+                      encoding="utf-8")
+    assert compile_dictionary(source, tmp_path / "words.idx") == 2
+
+    dictionary = PronunciationDictionary(tmp_path / "words.idx")
+    try:
+        assert dictionary.lookup("Bit") == (["b", "ɪ", "t"], 1)
+        assert dictionary.lookup("banana") == (["b", "ə", "n", "æ", "n", "ə"], 3)
+        assert dictionary.lookup("bat") is None
+    finally:
+        dictionary.close()
+
+
+def test_transcribe_falls_back_to_spelling_rules(app):
+    cat = transcribe("cat")
+    assert (cat["ipa"], cat["vowel_id"], cat["source"]) == ("kæt", "v5", "dictionary")
+    assert transcribe("banana")["ipa"] == "bəˈnænə"
+
+    guess = transcribe("blick")
+    assert (guess["ipa"], guess["vowel_id"], guess["source"]) == ("blɪk", "v2", "rules")
+    assert transcribe("flake")["vowel"] == "e"
+
+
+def test_g2p_route(client):
+    response = client.post("/vowels/g2p", json={"words": ["bit", "cup"]})
+    assert response.status_code == 200
+    assert [word["vowel_id"] for word in response.json["data"]["words"]] == ["v2", "v7"]
+
+    assert client.post("/vowels/g2p", json={"words": []}).status_code == 400
+    assert client.post("/vowels/g2p", json={"words": ["bit", 3]}).status_code == 400
+
+
+def test_word_examples_without_a_vowel_get_one_from_their_word(client, word_examples):
+    response = client.post("/vowels/word-example/bulk", json={"atomic": False, "word_examples": [
+        {"word": "milk", "audio_url": "/audio/milk.mp3"},
+        {"word": "food", "audio_url": "/audio/food.mp3"},
+    ]})
+    assert response.status_code == 202
+    assert response.json["data"]["errors"] == {"1": "Vowel not found: v10"}
+    client.post("/content/publish", json={"note": "test"})
+
+    example = WordExample.query.filter_by(word="milk").one()
+    assert (example.vowel_id, example.ipa) == ("v2", "ɪ")
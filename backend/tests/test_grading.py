@@ -0,0 +1,52 @@
+import pytest
+
+from src.services.grading import AnswerKey, DuplicateOptions, UnknownOptions
+
+
+@pytest.fixture
+def key():
+    # Quiz 1: options 10 and 11 correct, 12 wrong. Quiz 2 has no correct option.
+    return AnswerKey(
+        1,
+        {1: frozenset({10, 11}), 2: frozenset()},
+        {1: frozenset({10, 11, 12}), 2: frozenset({20})},
+        {1: ("cat", None), 2: ("cup", None)},
+        {},
+    )
+
+
+def test_total_is_the_number_of_correct_options(key):
+    assert key.grade(1, [10, 11]) == (2, 2)
+    assert key.grade(1, [10]) == (1, 2)
+
+
+def test_wrong_selections_cancel_right_ones(key):
+    assert key.grade(1, [10, 11, 12]) == (1, 2)
+    assert key.grade(1, [10, 12]) == (0, 2)
+    assert key.grade(1, [12]) == (0, 2)
+
+
+def test_duplicate_ids_are_rejected(key):
+    with pytest.raises(DuplicateOptions):
+        key.grade(1, [10, 10])
+
+
+def test_ids_outside_the_quiz_are_rejected(key):
+    with pytest.raises(UnknownOptions):
+        key.grade(1, [10, 20])
+
+
+def test_quiz_without_correct_option_is_not_gradable(key):
+    assert 1 in key
+    assert 2 not in key
+
+
+def test_submitting_one_correct_id_twice_is_a_400(client, quiz):
+    quiz_id, correct, _ = quiz
+    response = client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id,
+                                                     "answers": [correct[0], correct[0]]})
+    assert response.status_code == 400
+
+    response = client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id, "answers": [correct[0]]})
+    assert response.status_code == 200
+    assert response.json["data"]["attempt"]["percentage"] == 50
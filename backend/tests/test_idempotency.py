@@ -0,0 +1,55 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from src.db import db
+from src.models.user import QuizAttempt
+from src.services import idempotency
+from src.services.attempt_ingest import store_attempts
+
+
+def _post(client, quiz_id, answers, key):
+    return client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id, "answers": answers},
+                       headers={"Idempotency-Key": key})
+
+
+def _attempt_count():
+    return db.session.scalar(select(func.count()).select_from(QuizAttempt))
+
+
+def test_retry_on_another_worker_is_replayed(client, quiz):
+    quiz_id, correct, _ = quiz
+    first = _post(client, quiz_id, correct, "k1")
+    assert first.status_code == 200
+
+    # Another worker: its in-memory store has never seen the key
+    idempotency._store = None
+    retry = _post(client, quiz_id, correct, "k1")
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json["data"] == first.json["data"]
+    assert _attempt_count() == 1
+
+
+def test_bloom_filter_is_off_by_default(app):
+    assert idempotency.get_idempotency_store().bloom is None
+
+
+def test_retry_stored_by_two_workers_is_stored_once(app, quiz):
+    quiz_id, correct, _ = quiz
+    record = {"session_id": "s1", "quiz_id": quiz_id, "score": 2, "total": 2, "attempted_at": datetime.utcnow(),
+              "answers": [], "confusions": [], "idempotency_key": "s1:k1", "fingerprint": "f"}
+    # Both workers acknowledged the key before either stored it: each batch reaches the writer
+    store_attempts([{**record, "seq": 1}], "attempts-a.wal")
+    store_attempts([{**record, "seq": 1}, {**record, "seq": 2, "idempotency_key": None}], "attempts-b.wal")
+    assert _attempt_count() == 2
+
+
+def test_key_with_other_answers_is_rejected_and_failures_release_the_key(client, quiz):
+    quiz_id, correct, wrong = quiz
+    # Rejected answers log nothing: the key stays free for the corrected retry
+    assert _post(client, quiz_id, [wrong[0], wrong[0]], "k1").status_code == 400
+    assert _post(client, quiz_id, [wrong[0]], "k1").status_code == 200
+    assert _post(client, quiz_id, correct, "k1").status_code == 422
+    assert _post(client, quiz_id, correct, "x" * 256).status_code == 400
+    assert _attempt_count() == 1
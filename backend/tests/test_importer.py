@@ -0,0 +1,29 @@
+from sqlalchemy import select
+
+from src.db import db
+from src.models.quiz import QuizOption
+from src.services.importer import LIST_SEPARATOR, import_rows
+
+
+def _quiz_row(correct, wrong):
+    return {"prompt_word": "cat", "prompt_ipa": "æ", "prompt_audio_url": "/audio/cat.mp3",
+            "correct_options": LIST_SEPARATOR.join(correct), "wrong_option": wrong}
+
+
+def _options():
+    return {option.audio_url: (option.id, option.is_correct)
+            for option in db.session.scalars(select(QuizOption).order_by(QuizOption.id))}
+
+
+def test_reimported_quiz_keeps_its_option_ids(word_examples):
+    report = import_rows("quizzes", [(2, _quiz_row(["/audio/bat.mp3", "/audio/hat.mp3"], "/audio/cup.mp3"))])
+    assert report["errors"] == []
+    before = _options()
+
+    report = import_rows("quizzes", [(2, _quiz_row(["/audio/hat.mp3"], "/audio/bat.mp3"))])
+    assert report["errors"] == []
+    after = _options()
+
+    # Options are updated in place, so attempts and answer keys still point at the same rows
+    assert after == {"/audio/bat.mp3": (before["/audio/bat.mp3"][0], False),
+                     "/audio/hat.mp3": (before["/audio/hat.mp3"][0], True)}
@@ -0,0 +1,25 @@
+from sqlalchemy import func, select
+
+from src.db import db
+from src.models.phoneme import ComparisonPair
+from src.services.publishing import publish, stage_word_examples
+
+
+def _pair_count():
+    return db.session.scalar(select(func.count()).select_from(ComparisonPair))
+
+
+def test_contrast_reads_the_pairs_built_at_publish(client, word_examples):
+    # The fixture wrote word examples behind publish's back: the read endpoint does not catch up
+    response = client.get("/vowels/v2/contrast/v4")
+    assert response.status_code == 200
+    assert response.json["data"]["pairs"] == []
+    assert _pair_count() == 0
+
+    draft, errors = stage_word_examples([{"word": "pet", "audio_url": "/audio/pet.mp3", "vowel_id": "v4"}])
+    assert draft and not errors
+    publish()
+
+    pairs = client.get("/vowels/v2/contrast/v4").json["data"]["pairs"]
+    assert ("bit", "bet") in {(pair["word_a"], pair["word_b"]) for pair in pairs}
+    assert all(pair["word_a"] in {"bit", "sit"} for pair in pairs)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from src.db import db
+from src.models.user import CompletedLesson, QuizAttempt, UserSession
+
+
+def test_dashboard_sees_writes_made_by_another_worker(client):
+    db.session.add(UserSession(session_id="s1"))
+    db.session.commit()
+    assert client.get("/user/progress?session_id=s1").json["data"]["quiz_attempts"] == 0
+
+    # Stored behind this process's back: nothing here invalidates its cached dashboard
+    db.session.add(QuizAttempt(session_id="s1", quiz_id=1, score=1, total=1, attempted_at=datetime.utcnow()))
+    db.session.commit()
+    assert client.get("/user/progress?session_id=s1").json["data"]["quiz_attempts"] == 1
+
+    db.session.add(CompletedLesson(session_id="s1", lesson_id=3))
+    db.session.commit()
+    progress = client.get("/user/progress?session_id=s1").json["data"]
+    assert [lesson["lesson_id"] for lesson in progress["completed_lessons"]] == [3]
+
+
+def test_completed_lessons_are_recorded_once(client, word_examples):
+    client.post("/lessons/", json={"vowel_id": "v2", "instructions": ["Listen"]})
+    client.post("/content/publish", json={"note": "test"})
+    lesson_id = client.get("/lessons/").json["data"]["lessons"][0]["id"]
+
+    def complete(lesson):
+        return client.post("/user/lesson-complete", json={"session_id": "s1", "lesson_id": lesson}).status_code
+
+    assert complete(lesson_id) == 201
+    assert client.get("/user/progress?session_id=s1").json["data"]["completed_lessons"][0]["lesson_id"] == lesson_id
+    assert complete(lesson_id) == 200
+    assert complete(lesson_id + 1) == 404
+    assert complete(str(lesson_id)) == 400
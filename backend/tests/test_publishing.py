@@ -0,0 +1,108 @@
+VOWEL = {"id": "v5", "phoneme": "æ", "name": "ash", "ipa_example": "cat", "color_code": "#CCCCCC",
+         "audio_url": "/audio/v5.mp3", "description": ""}
+QUIZ = {"prompt_word": "cat", "prompt_ipa": "æ", "prompt_audio_url": "/audio/cat.mp3",
+        "correct_options": ["/audio/bat.mp3"], "wrong_option": "/audio/cup.mp3", "vowel_id": "v5"}
+
+
+def _version(client):
+    return client.get("/content/version").json["data"]["version"]
+
+
+def _publish(client):
+    response = client.post("/content/publish", json={"note": "test"})
+    assert response.status_code == 200, response.json
+    return response.json["data"]
+
+
+def test_edits_stay_staged_until_published_as_one_version(client):
+    version = _version(client)
+    assert client.post("/vowels/", json=VOWEL).status_code == 202
+    # New content may use a vowel that is only staged
+    assert client.post("/quiz/", json=QUIZ).status_code == 202
+    assert client.post("/lessons/", json={"vowel_id": "v5", "instructions": ["Listen"]}).status_code == 202
+    response = client.post("/vowels/word-example/bulk", json={"word_examples": [
+        {"word": "bat", "audio_url": "/audio/bat.mp3", "vowel_id": "v5"},
+        {"word": "hat", "audio_url": "/audio/hat.mp3", "vowel_id": "v5"},
+    ]})
+    assert response.status_code == 202
+
+    assert client.get("/quiz/").json["data"]["quizzes"] == []
+    assert client.get("/lessons/").json["data"]["lessons"] == []
+    assert _version(client) == version
+
+    result = _publish(client)
+    assert [draft["kind"] for draft in result["applied"]] == ["vowel", "new_quiz", "new_lesson", "word_examples"]
+    assert result["skipped"] == []
+    assert result["version"] == _version(client) == (version or 0) + 1
+    assert [quiz["prompt_word"] for quiz in client.get("/quiz/").json["data"]["quizzes"]] == ["cat"]
+    assert client.get("/lessons/vowel/v5").status_code == 200
+    words = client.get("/vowels/word-example/search?q=hat").json["data"]
+    assert "hat" in str(words)
+
+
+def test_publish_returns_the_ids_of_bulk_created_rows(client, word_examples):
+    quizzes = [{**QUIZ, "prompt_word": word} for word in ("cat", "hat")]
+    staged = client.post("/quiz/bulk", json={"quizzes": quizzes}).json["data"]["staged"]
+    response = client.post("/vowels/word-example/bulk", json={"word_examples": [
+        {"word": "sat", "audio_url": "/audio/sat.mp3", "vowel_id": "v5"},
+        {"word": "mat", "audio_url": "/audio/mat.mp3", "vowel_id": "v5"},
+    ]})
+    examples_draft = response.json["data"]["draft"]
+
+    applied = {draft["id"]: draft for draft in _publish(client)["applied"]}
+    quiz_ids = [applied[entry["draft"]["id"]]["created_ids"][0] for entry in staged]
+    assert [client.get(f"/quiz/{quiz_id}").json["data"]["quiz"]["prompt_word"] for quiz_id in quiz_ids] == ["cat", "hat"]
+
+    example_ids = applied[examples_draft["id"]]["created_ids"]
+    assert [client.get(f"/vowels/word-example/{example_id}").json["data"]["example"]["word"]
+            for example_id in example_ids] == ["sat", "mat"]
+
+
+def test_published_option_edits_keep_option_ids(client, quiz):
+    quiz_id, correct, wrong = quiz
+    options = {option["audio_url"]: option["id"] for option in client.get(f"/quiz/{quiz_id}").json["data"]["quiz"]["options"]}
+    response = client.put(f"/quiz/{quiz_id}", json={"options": [
+        {"word": "bat", "ipa": "æ", "audio_url": "/audio/bat.mp3", "is_correct": True},
+        {"word": "cup", "ipa": "ʌ", "audio_url": "/audio/cup.mp3", "is_correct": False},
+        {"word": "bet", "ipa": "ɛ", "audio_url": "/audio/bet.mp3", "is_correct": False},
+    ]})
+    assert response.status_code == 202
+    _publish(client)
+
+    published = {option["audio_url"]: option["id"] for option in client.get(f"/quiz/{quiz_id}").json["data"]["quiz"]["options"]}
+    assert set(published) == {"/audio/bat.mp3", "/audio/cup.mp3", "/audio/bet.mp3"}
+    assert published["/audio/bat.mp3"] == options["/audio/bat.mp3"]
+    assert published["/audio/cup.mp3"] == options["/audio/cup.mp3"]
+    assert published["/audio/bet.mp3"] not in options.values()
+
+    # Answers still grade against the kept ids
+    response = client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id,
+                                                     "answers": [options["/audio/bat.mp3"]]})
+    assert response.json["data"]["attempt"]["score"] == response.json["data"]["attempt"]["total"] == 1
+
+
+def test_deletions_are_staged(client, quiz):
+    quiz_id = quiz[0]
+    assert client.delete(f"/quiz/{quiz_id}").status_code == 202
+    assert client.get(f"/quiz/{quiz_id}").status_code == 200
+
+    _publish(client)
+    assert client.get(f"/quiz/{quiz_id}").status_code == 404
+    assert client.delete(f"/quiz/{quiz_id}").status_code == 404
+
+
+def test_bulk_create_rejects_invalid_batch_without_staging(client):
+    response = client.post("/quiz/bulk", json={"quizzes": [QUIZ, {"prompt_word": "cup"}]})
+    assert response.status_code == 400
+    assert client.get("/content/drafts").json["data"]["drafts"] == []
+
+
+def test_generated_quizzes_are_staged_and_not_generated_twice(client, word_examples):
+    response = client.post("/quiz/generate", json={"vowel_ids": ["v2"]})
+    assert response.status_code == 202
+    staged = response.json["data"]["staged"]
+    assert staged and all(draft["kind"] == "new_quiz" for draft in staged)
+    assert client.post("/quiz/generate", json={"vowel_ids": ["v2"]}).json["data"]["staged"] == []
+
+    _publish(client)
+    assert len(client.get("/quiz/").json["data"]["quizzes"]) == len(staged)
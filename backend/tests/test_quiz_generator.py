@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+
+from src.db import db
+from src.models.phoneme import WordExample
+from src.models.quiz import QuizItem
+from src.services.content_cache import live_version
+
+
+def test_session_quiz_hides_answers_and_writes_nothing(client, word_examples):
+    version = live_version()
+    response = client.get("/quiz/generate?session_id=s1&vowel_id=v5&seed=7")
+    assert response.status_code == 200
+    quiz = response.json["data"]["quiz"]
+    assert quiz["vowel_id"] == "v5"
+    assert all("is_correct" not in option for option in quiz["options"])
+
+    # Same seed, same quiz, and the catalog and content version are untouched
+    assert client.get("/quiz/generate?session_id=s1&vowel_id=v5&seed=7").json["data"]["quiz"] == quiz
+    assert db.session.scalar(select(func.count()).select_from(QuizItem)) == 0
+    assert live_version() == version
+
+
+def test_session_quiz_is_graded_from_its_token(client, word_examples):
+    quiz = client.get("/quiz/generate?session_id=s1&vowel_id=v5&seed=7").json["data"]["quiz"]
+    vowels = dict(db.session.execute(select(WordExample.id, WordExample.vowel_id)).all())
+    correct = [option["id"] for option in quiz["options"] if vowels[option["id"]] == "v5"]
+    wrong = [option["id"] for option in quiz["options"] if vowels[option["id"]] != "v5"]
+    assert correct and wrong
+
+    response = client.post("/quiz/generate/score", json={"session_id": "s1", "token": quiz["token"],
+                                                         "answers": correct})
+    assert response.status_code == 200
+    assert response.json["data"]["score"] == response.json["data"]["total"] == len(correct)
+
+    response = client.post("/quiz/generate/score", json={"session_id": "s1", "token": quiz["token"],
+                                                         "answers": wrong[:1]})
+    assert response.json["data"]["score"] == 0
+
+    # Tokens are bound to their session and cannot be edited
+    assert client.post("/quiz/generate/score", json={"session_id": "s2", "token": quiz["token"],
+                                                     "answers": correct}).status_code == 400
+    assert client.post("/quiz/generate/score", json={"session_id": "s1", "token": quiz["token"] + "x",
+                                                     "answers": correct}).status_code == 400
@@ -0,0 +1,83 @@
+from src.db import db
+from src.models.phoneme import Vowel
+from src.services import attempt_ingest, confusion, review
+from src.services.attempt_ingest import IngestQueueFull
+from src.services.quiz import create_quiz
+
+
+def _post(client, quiz_id, answers, session_id="s1", **headers):
+    return client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": answers},
+                       headers=headers)
+
+
+def test_rejected_attempt_leaves_in_memory_state_alone(make_app, monkeypatch):
+    app = make_app(ATTEMPT_WRITE_BEHIND=True)
+    client = app.test_client()
+    with app.app_context():
+        db.session.add_all([Vowel(id=vowel_id, phoneme=phoneme, name=phoneme, ipa_example=phoneme, color_code="#CCCCCC",
+                                  audio_url=f"/audio/{vowel_id}.mp3", description="")
+                            for vowel_id, phoneme in (("v5", "æ"), ("v7", "ʌ"))])
+        item = create_quiz("cat", "æ", "/audio/cat.mp3", [
+            {"word": "bat", "ipa": "æ", "audio_url": "/audio/bat.mp3", "is_correct": True},
+            {"word": "cup", "ipa": "ʌ", "audio_url": "/audio/cup.mp3", "is_correct": False},
+        ], vowel_id="v5")
+        quiz_id, wrong = item.id, [option.id for option in item.options if not option.is_correct]
+    client.get("/quiz/")
+    writer = attempt_ingest.get_attempt_writer()
+
+    def full(record):
+        raise IngestQueueFull("Too many quiz attempts waiting to be stored")
+
+    monkeypatch.setattr(writer, "submit", full)
+    response = _post(client, quiz_id, [wrong[0]])
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    with app.app_context():
+        assert quiz_id not in review.get_queue("s1")
+        assert sum(confusion.get_matrix("s1").counts) == 0
+
+    monkeypatch.undo()
+    assert _post(client, quiz_id, [wrong[0]]).status_code == 200
+    with app.app_context():
+        assert quiz_id in review.get_queue("s1")
+        assert sum(confusion.get_matrix("s1").counts) == 1
+
+
+def test_wrong_answer_counts_as_a_confusion_with_the_options_vowel(client, word_examples):
+    # Shaped like POST /quiz/: every option carries the prompt's word and IPA
+    quiz = {"prompt_word": "cat", "prompt_ipa": "æ", "prompt_audio_url": "/audio/cat.mp3",
+            "correct_options": ["/audio/bat.mp3"], "wrong_option": "/audio/cup.mp3", "vowel_id": "v5"}
+    assert client.post("/quiz/", json=quiz).status_code == 202
+    assert client.post("/content/publish", json={}).status_code == 200
+    quiz_id, options = next((q["id"], q["options"]) for q in client.get("/quiz/").json["data"]["quizzes"])
+    cup = next(option["id"] for option in options if option["audio_url"] == "/audio/cup.mp3")
+
+    assert _post(client, quiz_id, [cup]).status_code == 200
+    matrix = client.get("/user/confusion?session_id=s1").json["data"]
+    vowels = matrix["vowels"]
+    counts = {(vowels[i], vowels[j]): count for i, row in enumerate(matrix["matrix"])
+              for j, count in enumerate(row) if count}
+    assert counts == {("v5", "v7"): 1}
+    assert matrix["most_confused"][0]["selected_vowel"] == "v7"
+
+
+def test_recommendation_follows_the_most_confused_vowel(client, word_examples):
+    for vowel_id in ("v2", "v5"):
+        assert client.post("/lessons/", json={"vowel_id": vowel_id, "instructions": ["Listen"]}).status_code == 202
+    quiz = {"prompt_word": "cat", "prompt_ipa": "æ", "prompt_audio_url": "/audio/cat.mp3",
+            "correct_options": ["/audio/bat.mp3"], "wrong_option": "/audio/cup.mp3", "vowel_id": "v5"}
+    assert client.post("/quiz/", json=quiz).status_code == 202
+    assert client.post("/content/publish", json={}).status_code == 200
+    quiz_id, options = next((q["id"], q["options"]) for q in client.get("/quiz/").json["data"]["quizzes"])
+    cup = next(option["id"] for option in options if option["audio_url"] == "/audio/cup.mp3")
+
+    # Nothing confused yet: the first lesson not completed
+    data = client.get("/user/recommendation?session_id=s1").json["data"]
+    assert (data["lesson"]["vowel"]["id"], data["reason"]["source"]) == ("v2", "not_completed")
+
+    assert _post(client, quiz_id, [cup]).status_code == 200
+    data = client.get("/user/recommendation?session_id=s1").json["data"]
+    assert (data["lesson"]["vowel"]["id"], data["reason"]["source"]) == ("v5", "session")
+    # Another session falls back to the confusions over all sessions
+    assert client.get("/user/recommendation?session_id=s2").json["data"]["reason"]["source"] == "all_sessions"
+    assert client.get("/user/recommendation").status_code == 400
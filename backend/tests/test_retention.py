@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from src.db import db
+from src.models.user import CohortMember, DailyQuizStat, QuizAttempt, QuizLog, ReviewState, UserSession
+from src.services.cohorts import create_cohort
+from src.services.retention import apply_retention
+
+
+def test_sessions_active_only_in_reviews_or_answers_are_kept(app):
+    now = datetime.utcnow()
+    long_ago, recently = now - timedelta(days=400), now - timedelta(days=1)
+    db.session.add_all([UserSession(session_id=session_id, started_at=long_ago)
+                        for session_id in ("idle", "reviewed", "review_due", "answered")])
+    db.session.add_all([
+        ReviewState(session_id="idle", quiz_id=1, due_at=long_ago, reviewed_at=long_ago),
+        ReviewState(session_id="reviewed", quiz_id=1, due_at=long_ago, reviewed_at=recently),
+        ReviewState(session_id="review_due", quiz_id=1, due_at=now + timedelta(days=30), reviewed_at=long_ago),
+        QuizLog(session_id="answered", quiz_id=1, question_index=0, answered_at=recently),
+    ])
+    db.session.commit()
+
+    summary = apply_retention(retention_days=90, session_ttl_days=180, now=now)
+    assert summary["sessions_deleted"] == 1
+    assert db.session.scalars(select(UserSession.session_id).order_by(UserSession.session_id)).all() == [
+        "answered", "review_due", "reviewed",
+    ]
+
+
+def test_old_attempts_are_rolled_up_by_day_and_old_answers_deleted(app):
+    now = datetime.utcnow()
+    old, recent = now - timedelta(days=100), now - timedelta(days=1)
+    db.session.add_all([UserSession(session_id=session_id, started_at=old) for session_id in ("s1", "student")])
+    db.session.add_all([QuizAttempt(session_id="s1", quiz_id=7, score=score, total=2, attempted_at=attempted_at)
+                        for score, attempted_at in ((1, old), (2, old), (0, recent))])
+    db.session.add_all([QuizLog(session_id="s1", quiz_id=7, question_index=0, answered_at=answered_at)
+                        for answered_at in (old, recent)])
+    db.session.commit()
+    create_cohort("class", ["student"])
+
+    summary = apply_retention(retention_days=90, session_ttl_days=30, batch_size=1, now=now)
+    assert (summary["attempts_rolled_up"], summary["answers_deleted"], summary["sessions_deleted"]) == (2, 1, 0)
+    [daily] = db.session.scalars(select(DailyQuizStat)).all()
+    assert (daily.day, daily.quiz_id, daily.attempts, daily.score, daily.total) == (old.date(), 7, 2, 3, 4)
+    assert db.session.scalars(select(QuizAttempt.score)).all() == [0]
+    assert db.session.scalars(select(QuizLog.answered_at)).all() == [recent]
+    # Idle, but kept for its cohort
+    assert db.session.scalars(select(CohortMember.session_id)).all() == ["student"]
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+from src.services.review import ReviewQueue, next_quizzes, sm2
+
+NOW = datetime(2026, 1, 1)
+
+
+def test_sm2_spaces_passed_reviews_and_relearns_failed_ones():
+    state = sm2(0, 2.5, 0.0, 5, NOW)
+    assert state == (1, 2.6, 1.0, NOW + timedelta(days=1))
+    state = sm2(*state[:3], 4, NOW)
+    assert (state[0], state[2]) == (2, 6.0)
+    ease = state[1]
+    state = sm2(*state[:3], 4, NOW)
+    assert (state[0], state[2]) == (3, 6.0 * ease)
+
+    repetitions, ease, interval, due_at = sm2(*state[:3], 1, NOW)
+    assert repetitions == 0 and due_at == NOW + timedelta(minutes=10)
+    assert ease < state[1]
+
+
+def test_queue_drops_rescheduled_entries_lazily():
+    queue = ReviewQueue([(1, 1, 2.5, 1.0, NOW), (2, 1, 2.5, 1.0, NOW + timedelta(hours=1))])
+    queue.schedule(1, (2, 2.5, 6.0, NOW + timedelta(days=6)))
+
+    assert queue.due(NOW + timedelta(hours=2), limit=10) == [2]
+    assert queue.next_due_at() == NOW + timedelta(hours=1)
+
+
+def test_next_quizzes_puts_due_reviews_before_new_quizzes(client, quiz):
+    quiz_id, _, wrong = quiz
+    assert client.get("/user/next-quizzes?session_id=s1").json["data"]["quizzes"][0]["id"] == quiz_id
+
+    response = client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id,
+                                                     "answers": [wrong[0]]})
+    assert response.status_code == 200
+    # Failed: back in ten minutes, not before
+    data = client.get("/user/next-quizzes?session_id=s1").json["data"]
+    assert data["quizzes"] == [] and data["next_review_at"]
+
+    assert next_quizzes("s1", [quiz_id, 99], now=datetime.utcnow() + timedelta(minutes=11)) == (
+        [quiz_id, 99], datetime.fromisoformat(data["next_review_at"])
+    )
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from src.db import db
+from src.models.user import LatestQuizScore
+from src.services.attempt_ingest import store_attempts
+from src.services.scores import get_latest_score, rebuild_latest_scores
+
+
+def _record(quiz_id, score, minute, session_id="s1"):
+    return {"session_id": session_id, "quiz_id": quiz_id, "score": score, "total": 2,
+            "attempted_at": datetime(2026, 1, 1, 12, minute), "answers": [], "confusions": []}
+
+
+def _scores():
+    return [(row.session_id, row.quiz_id, row.score, row.best_score, row.attempts)
+            for row in db.session.scalars(select(LatestQuizScore).order_by(LatestQuizScore.session_id))]
+
+
+def test_older_attempts_never_replace_the_latest_score(app, quiz):
+    quiz_id = quiz[0]
+    store_attempts([_record(quiz_id, 1, 5), _record(quiz_id, 2, 3), _record(quiz_id, 0, 4, session_id="s2")])
+    # Replayed late: older than the stored latest score
+    store_attempts([_record(quiz_id, 0, 1)])
+
+    latest = get_latest_score("s1", quiz_id)
+    assert (latest.score, latest.attempted_at.minute) == (1, 5)
+    assert (latest.best_score, latest.best_at.minute) == (2, 3)
+    assert latest.attempts == 3
+
+    folded = _scores()
+    assert rebuild_latest_scores() == 2
+    db.session.expire_all()
+    assert _scores() == folded
+
+
+def test_score_routes_read_latest_and_best(client, quiz):
+    quiz_id, correct, wrong = quiz
+    for answers in ([correct[0], correct[1]], [wrong[0]]):
+        client.post("/user/quiz-score", json={"session_id": "s1", "quiz_id": quiz_id, "answers": answers})
+
+    score = client.get(f"/user/quiz-score?session_id=s1&quiz_id={quiz_id}").json["data"]
+    assert (score["score"], score["best"]["score"], score["attempts"]) == (0, 2, 2)
+    [scores] = client.get("/user/quiz-scores?session_id=s1").json["data"]["scores"]
+    assert scores["quiz_id"] == quiz_id
+    assert client.get(f"/user/quiz-score?session_id=s2&quiz_id={quiz_id}").status_code == 404
+    assert client.get("/user/quiz-scores").status_code == 400
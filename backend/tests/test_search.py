@@ -0,0 +1,45 @@
+import pytest
+
+VOWEL = {"id": "v5", "phoneme": "æ", "name": "ash", "ipa_example": "cat", "color_code": "#CCCCCC",
+         "audio_url": "/audio/v5.mp3", "description": "Open front vowel, as in cat"}
+
+
+@pytest.fixture
+def content(client):
+    client.post("/vowels/", json=VOWEL)
+    client.post("/lessons/", json={"vowel_id": "v5", "instructions": ["Listen to the vowel", "Repeat after the speaker"]})
+    assert client.post("/content/publish", json={"note": "test"}).status_code == 200
+    return client
+
+
+def _search(client, query, **params):
+    response = client.get("/search/", query_string={"q": query, **params})
+    assert response.status_code == 200, response.json
+    return response.json["data"]
+
+
+def test_search_matches_every_word_and_a_trailing_prefix(content):
+    data = _search(content, "repeat spea")
+    assert data["total"] == 1
+    [hit] = data["results"]
+    assert (hit["type"], hit["vowel_id"]) == ("lesson", "v5")
+    assert "<mark>Repeat</mark>" in hit["snippet"]
+
+    assert _search(content, '"front vowel"')["results"][0]["type"] == "vowel"
+    assert _search(content, '"vowel front"')["total"] == 0
+    assert [hit["type"] for hit in _search(content, "vowel", type="vowel")["results"]] == ["vowel"]
+    assert _search(content, "vowel")["total"] == 2
+
+
+def test_search_follows_published_edits(content):
+    lesson_id = content.get("/lessons/vowel/v5").json["data"]["lesson"]["id"]
+    content.put(f"/lessons/{lesson_id}", json={"instructions": ["Say it slowly"]})
+    content.post("/content/publish", json={"note": "test"})
+
+    assert _search(content, "repeat")["total"] == 0
+    assert _search(content, "slowly")["total"] == 1
+
+
+def test_search_rejects_bad_parameters(client):
+    assert client.get("/search/").status_code == 400
+    assert client.get("/search/?q=cat&type=quiz").status_code == 400
@@ -0,0 +1,38 @@
+from sqlalchemy import delete, func, select
+
+from src.db import db
+from src.models.user import UserSession
+from src.services.sessions import ensure_sessions
+
+
+def _retention_deletes(session_id):
+    # The retention job runs in another process: this one's cache never hears of it
+    with db.engine.begin() as connection:
+        connection.execute(delete(UserSession).where(UserSession.session_id == session_id))
+
+
+def _register(session_id):
+    unknown = ensure_sessions([session_id])
+    db.session.commit()
+    return unknown
+
+
+def test_known_sessions_skip_the_database_until_their_entry_expires(make_app):
+    with make_app().app_context():
+        assert _register("s1") == ["s1"]
+        assert _register("s1") == []
+
+
+def test_session_deleted_by_retention_is_registered_again(make_app):
+    with make_app(SESSION_CACHE_TTL=0).app_context():
+        assert _register("s1") == ["s1"]
+        _retention_deletes("s1")
+        assert _register("s1") == ["s1"]
+        assert db.session.scalar(select(func.count()).select_from(UserSession)) == 1
+
+
+def test_quiz_attempts_register_their_session_once(client, quiz):
+    quiz_id, correct, _ = quiz
+    for session_id in ("s1", "s1", "s2"):
+        client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": [correct[0]]})
+    assert db.session.scalars(select(UserSession.session_id).order_by(UserSession.session_id)).all() == ["s1", "s2"]
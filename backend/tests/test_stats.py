@@ -0,0 +1,43 @@
+import pytest
+
+from src.db import db
+
+
+@pytest.fixture
+def vowel_quiz(word_examples):
+    """
+    A quiz for the vowel æ, with one correct option and one wrong one, as (quiz_id, correct id, wrong id).
+    """
+    from src.services.quiz import create_quiz
+
+    item = create_quiz("cat", "æ", "/audio/cat.mp3", [
+        {"word": "bat", "ipa": "æ", "audio_url": "/audio/bat.mp3", "is_correct": True},
+        {"word": "cup", "ipa": "ʌ", "audio_url": "/audio/cup.mp3", "is_correct": False},
+    ], vowel_id="v5")
+    correct, wrong = (next(option.id for option in item.options if option.is_correct is flag) for flag in (True, False))
+    quiz_id = item.id
+    db.session.remove()
+    return quiz_id, correct, wrong
+
+
+def _submit(client, session_id, quiz_id, answers):
+    response = client.post("/user/quiz-score", json={"session_id": session_id, "quiz_id": quiz_id, "answers": answers})
+    assert response.status_code == 200, response.json
+
+
+def test_answers_add_up_per_vowel_and_word(client, vowel_quiz):
+    quiz_id, correct, wrong = vowel_quiz
+    _submit(client, "s1", quiz_id, [correct])
+    _submit(client, "s1", quiz_id, [correct, wrong])
+    _submit(client, "s2", quiz_id, [wrong])
+
+    vowels = client.get("/user/accuracy?session_id=s1").json["data"]["vowels"]
+    assert vowels == [{"vowel_id": "v5", "correct": 2, "incorrect": 1, "accuracy": 0.6667}]
+    words = client.get("/user/accuracy/words?session_id=s2&vowel_id=v5").json["data"]["words"]
+    assert words == [{"word": "cat", "vowel_id": "v5", "correct": 0, "incorrect": 1, "accuracy": 0.0}]
+    assert client.get("/user/accuracy/words?session_id=s2&vowel_id=v2").json["data"]["words"] == []
+
+
+def test_accuracy_requires_a_session(client):
+    assert client.get("/user/accuracy").status_code == 400
+    assert client.get("/user/accuracy/words").status_code == 400
@@ -0,0 +1,54 @@
+import json
+
+from sqlalchemy import select
+
+from src.db import db
+from src.models.lesson import LessonInstruction
+from src.models.phoneme import Vowel, WordExample
+from src.services.content import sync_content
+
+
+def _catalog(tmp_path, description="short a", instructions=("Listen",)):
+    content_file = tmp_path / "content.json"
+    content_file.write_text(json.dumps({
+        "vowels": [{"id": "v5", "phoneme": "æ", "name": "ash", "ipa_example": "æ", "audio_file": "5-æ.mp3",
+                    "description": description}],
+        "lessons": [{"vowel_id": "v5", "instructions": list(instructions)}],
+    }), encoding="utf-8")
+    audio_dir = tmp_path / "word_examples"
+    audio_dir.mkdir(exist_ok=True)
+    for filename in ("13_æ_ref_cat.mp3", "14_æ_ref_bat.mp3", "notes.txt"):
+        (audio_dir / filename).touch()
+    return str(content_file), str(audio_dir)
+
+
+def test_sync_writes_only_what_changed(app, tmp_path):
+    content_file, audio_dir = _catalog(tmp_path)
+    report = sync_content(content_file, audio_dir)
+    assert report["changed"]
+    assert report["changes"]["word_examples"]["insert"]["count"] == 2
+    assert sorted(db.session.scalars(select(WordExample.word))) == ["bat", "cat"]
+
+    assert not sync_content(content_file, audio_dir)["changed"]
+
+    content_file, audio_dir = _catalog(tmp_path, description="the vowel in cat", instructions=("Listen", "Repeat"))
+    report = sync_content(content_file, audio_dir, dry_run=True)
+    assert report["changes"]["vowels"]["update"]["count"] == report["changes"]["lessons"]["update"]["count"] == 1
+    assert db.session.get(Vowel, "v5").description == "short a"
+
+    sync_content(content_file, audio_dir)
+    db.session.expire_all()
+    assert db.session.get(Vowel, "v5").description == "the vowel in cat"
+    assert [row.text for row in db.session.scalars(select(LessonInstruction).order_by(LessonInstruction.id))] == [
+        "Listen", "Repeat",
+    ]
+
+
+def test_sync_prunes_rows_missing_from_the_catalog(app, tmp_path):
+    content_file, audio_dir = _catalog(tmp_path)
+    sync_content(content_file, audio_dir)
+    (tmp_path / "word_examples" / "14_æ_ref_bat.mp3").unlink()
+
+    assert sync_content(content_file, audio_dir, prune=False)["changes"]["word_examples"]["delete"]["count"] == 0
+    assert sync_content(content_file, audio_dir)["changes"]["word_examples"]["delete"]["count"] == 1
+    assert list(db.session.scalars(select(WordExample.word))) == ["cat"]
@@ -0,0 +1,43 @@
+from sqlalchemy import insert
+
+from src.db import db
+from src.models.content import ContentRelease
+from src.models.phoneme import WordExample
+from src.services import word_search
+from src.services.content_cache import bump_content_version
+
+
+def _search(word):
+    return [result["word"] for result in word_search.search_words(word) if result.get("word")]
+
+
+def _wait_for_rebuild():
+    thread = word_search._rebuild["thread"]
+    if thread:
+        thread.join(timeout=10)
+
+
+def test_new_version_without_word_changes_keeps_the_index(make_app, word_examples):
+    with make_app(CONTENT_VERSION_CHECK_INTERVAL=0).app_context():
+        index = word_search.get_index()
+        bump_content_version("quiz created")
+        db.session.commit()
+
+        assert word_search.get_index() is index
+        _wait_for_rebuild()
+        assert word_search.get_index() is index
+        assert index.version == 2
+
+
+def test_words_added_by_another_process_are_swapped_in_without_blocking(make_app, word_examples):
+    with make_app(CONTENT_VERSION_CHECK_INTERVAL=0).app_context():
+        assert "bat" in _search("bat")
+        # Another process publishes a word: this one only sees the version move
+        with db.engine.begin() as connection:
+            connection.execute(insert(WordExample).values(word="lamb", audio_url="/audio/lamb.mp3", vowel_id="v5"))
+            connection.execute(insert(ContentRelease).values(note="word examples", change_count=1))
+
+        assert "lamb" not in _search("lamb")      # served from the old index meanwhile
+        _wait_for_rebuild()
+        assert "lamb" in _search("lamb")
+        assert word_search.get_index().version == 2